@@ -0,0 +1,83 @@
+# encoding=utf-8
+
+r"""
+
+Benchmarks the CPU time spent decoding a page of 100 animals.
+
+Before the decoding changes, the pagination loops of :code:`animals()` and :code:`organizations()` called
+:code:`r.json()` four times per page. Every response is now decoded once through the :code:`json_decoder` of the
+:code:`Petfinder` instance, which can also be set to a faster JSON library.
+
+Usage::
+
+    python benchmarks/bench_decode.py
+
+"""
+
+
+import json
+import os
+import sys
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import animals_page_bytes, best_of
+
+
+def response(body: bytes) -> requests.Response:
+    r = requests.Response()
+    r.status_code = 200
+    r._content = body
+    r.encoding = 'utf-8'
+
+    return r
+
+
+def decode_four_times(r):
+    animals = []
+    if isinstance(r.json(), dict):
+        if 'animals' in r.json().keys():
+            for i in r.json()['animals']:
+                animals.append(i)
+    max_pages = r.json()['pagination']['total_pages']
+
+    return animals, max_pages
+
+
+def decode_once(r, decoder=json.loads):
+    data = decoder(r.content)
+    animals = list(data['animals'])
+    max_pages = data['pagination']['total_pages']
+
+    return animals, max_pages
+
+
+def main():
+    body = animals_page_bytes(100)
+    r = response(body)
+
+    results = [
+        ('r.json() x4 (previous)', best_of(lambda: decode_four_times(r))),
+        ('json.loads x1', best_of(lambda: decode_once(r)))
+    ]
+
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    if orjson is not None:
+        results.append(('orjson.loads x1', best_of(lambda: decode_once(r, decoder=orjson.loads))))
+
+    baseline = results[0][1]
+
+    print('Decoding a 100 animal page ({:,} bytes)'.format(len(body)))
+    print('{:<26}{:>14}{:>14}'.format('method', 'CPU us/page', 'saved us'))
+    for name, seconds in results:
+        print('{:<26}{:>14.1f}{:>14.1f}'.format(name, seconds * 1e6, (baseline - seconds) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
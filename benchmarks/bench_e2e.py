@@ -0,0 +1,85 @@
+# encoding=utf-8
+
+r"""
+
+Benchmarks :code:`animals(pages=None)` end to end against :code:`petpy.testing.PetfinderServer`, a local stand-in
+for the Petfinder API, so the whole client is measured without an API key or spending the daily request limit.
+
+The server runs in a separate process so its allocations and CPU time are not counted. Each search is run once
+plain and once with :code:`return_df=True`, reporting the pages fetched per second, the 50th and 99th percentile
+request latencies recorded by a :code:`RequestStats` hook, and the peak memory of a second, traced run.
+
+Usage::
+
+    python benchmarks/bench_e2e.py [--animals 10000] [--latency 0.02] [--max-workers 8]
+
+"""
+
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from petpy import Petfinder
+from petpy.hooks import RequestStats
+
+
+def start_server(animals, latency):
+    server = subprocess.Popen([sys.executable, '-m', 'petpy.testing', '--animals', str(animals),
+                               '--latency', str(latency)],
+                              stdout=subprocess.PIPE, universal_newlines=True,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    return server, server.stdout.readline().strip()
+
+
+def search(url, max_workers, return_df, stats=None):
+    # The rate limit is raised so the benchmark measures the client rather than the 50 requests per second default.
+    with Petfinder(key='key', secret='secret', host=url, rate_limit=10000, hooks=stats) as pf:
+        return pf.animals(results_per_page=100, pages=None, max_workers=max_workers, return_df=return_df)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--animals', type=int, default=10000)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--max-workers', type=int, default=8)
+    args = parser.parse_args()
+
+    server, url = start_server(args.animals, args.latency)
+
+    try:
+        print('{} animals, {:.0f} ms server latency, max_workers={}'.format(args.animals, args.latency * 1e3,
+                                                                              args.max_workers))
+        print('{:<14}{:>8}{:>12}{:>12}{:>10}{:>10}{:>16}'.format('mode', 'pages', 'seconds', 'pages/sec', 'p50 ms',
+                                                               'p99 ms', 'peak memory MB'))
+
+        for mode, return_df in (('plain', False), ('return_df', True)):
+            stats = RequestStats()
+
+            start = time.perf_counter()
+            search(url, args.max_workers, return_df, stats)
+            seconds = time.perf_counter() - start
+
+            tracemalloc.start()
+            search(url, args.max_workers, return_df)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            animals = stats.summary()['animals']
+
+            print('{:<14}{:>8}{:>12.2f}{:>12.1f}{:>10.1f}{:>10.1f}{:>16.2f}'.format(
+                mode, animals['requests'], seconds, animals['requests'] / seconds, animals['latency_p50'] * 1e3,
+                animals['latency_p99'] * 1e3, peak / 2 ** 20))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# encoding=utf-8
+
+r"""
+
+Benchmarks the CPU time spent coercing animals and organizations into a DataFrame with :code:`return_df=True`.
+
+Before the flattener, :code:`_coerce_to_dataframe` ran :code:`pandas.json_normalize` over the whole record list
+and then made a :code:`.str.replace` pass over each :code:`_links` column. :code:`RecordFlattener` writes each
+page of records directly into its columns and strips the link prefixes as the values are written. The second
+table shows the time and peak memory of flattening every field compared with the ten fields given to
+:code:`fields=`.
+
+Usage::
+
+    python benchmarks/bench_flatten.py
+
+"""
+
+
+import os
+import sys
+import tracemalloc
+
+import pandas as pd
+from pandas import json_normalize
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import animal_record, organization_record, best_of
+from petpy.flatten import RecordFlattener
+
+
+def json_normalize_records(key, records):
+    results_df = json_normalize(records)
+
+    if key == 'animals':
+        results_df['_links.organization.href'] = results_df['_links.organization.href']\
+            .str.replace('/v2/organizations/', '')
+        results_df['_links.self.href'] = results_df['_links.self.href'].str.replace('/v2/animals/', '')
+        results_df['_links.type.href'] = results_df['_links.type.href'].str.replace('/v2/types/', '')
+
+        results_df.rename(columns={'_links.organization.href': 'organization_id',
+                                   '_links.self.href': 'animal_id',
+                                   '_links.type.href': 'animal_type'}, inplace=True)
+
+    if key == 'organizations':
+        del results_df['_links.animals.href']
+        results_df['_links.self.href'] = results_df['_links.self.href'].str.replace('/v2/organizations/', '')
+
+        results_df.rename(columns={'_links.self.href': 'organization_id'}, inplace=True)
+
+    return results_df
+
+
+FIELDS = ['id', 'type', 'age', 'gender', 'size', 'name', 'status', 'published_at', 'breeds.primary',
+          'contact.address.state']
+
+
+def flatten_pages(key, records, page_size=100, fields=None):
+    flattener = RecordFlattener(key, fields=fields)
+
+    for i in range(0, len(records), page_size):
+        flattener.add(records[i:i + page_size])
+
+    return flattener.to_frame()
+
+
+def main():
+    print('{:<16}{:>10}{:>20}{:>20}{:>10}'.format('records', 'count', 'json_normalize ms', 'RecordFlattener ms',
+                                                   'speedup'))
+
+    for key, factory in (('animals', animal_record), ('organizations', organization_record)):
+        for n in (100, 1000, 10000):
+            records = [factory(i) for i in range(n)]
+
+            pd.testing.assert_frame_equal(json_normalize_records(key, records), flatten_pages(key, records))
+
+            number = max(1, 2000 // n)
+            previous = best_of(lambda: json_normalize_records(key, records), repeat=3, number=number)
+            current = best_of(lambda: flatten_pages(key, records), repeat=3, number=number)
+
+            print('{:<16}{:>10,}{:>20.2f}{:>20.2f}{:>9.1f}x'.format(key, n, previous * 1e3, current * 1e3,
+                                                                    previous / current))
+
+    records = [animal_record(i) for i in range(10000)]
+
+    print()
+    print('{:<16}{:>10}{:>12}{:>16}'.format('animals fields', 'columns', 'CPU ms', 'peak memory MB'))
+
+    for name, fields in (('all', None), ('10 fields', FIELDS)):
+        seconds = best_of(lambda: flatten_pages('animals', records, fields=fields), repeat=3, number=1)
+
+        tracemalloc.start()
+        columns = flatten_pages('animals', records, fields=fields).shape[1]
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print('{:<16}{:>10}{:>12.2f}{:>16.2f}'.format(name, columns, seconds * 1e3, peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
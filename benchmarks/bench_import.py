@@ -0,0 +1,59 @@
+# encoding=utf-8
+
+r"""
+
+Benchmarks the time taken by :code:`import petpy` in a fresh interpreter, as paid on every cold start of a short-lived
+job.
+
+pandas, asyncio and the DataFrame code are only imported once they are used, so the import is compared with the
+time taken by the same import followed by :code:`import pandas`, the cost the DataFrame path pays on first use. Each
+import runs in its own interpreter, and the median time is shown along with whether pandas was loaded.
+
+Usage::
+
+    python benchmarks/bench_import.py [--runs 10]
+
+"""
+
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_time(statement):
+    r"""
+    Returns the seconds taken by :code:`statement` in a fresh interpreter, and whether pandas was imported.
+
+    """
+    code = ("import sys, time; start = time.perf_counter(); {}; "
+            "print(time.perf_counter() - start, 'pandas' in sys.modules)").format(statement)
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, stdout=subprocess.PIPE,
+                            universal_newlines=True, check=True)
+    seconds, pandas_loaded = result.stdout.split()
+
+    return float(seconds), pandas_loaded == 'True'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    print('{:<50}{:>12}{:>16}'.format('statement', 'median ms', 'pandas loaded'))
+
+    for statement in ('import petpy', 'import petpy; from petpy import AsyncPetfinder',
+                      'import petpy; import pandas'):
+        runs = [import_time(statement) for _ in range(args.runs)]
+        median = statistics.median(seconds for seconds, _ in runs)
+
+        print('{:<50}{:>12.1f}{:>16}'.format(statement, median * 1e3, str(runs[0][1])))
+
+
+if __name__ == '__main__':
+    main()
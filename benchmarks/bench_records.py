@@ -0,0 +1,73 @@
+# encoding=utf-8
+
+r"""
+
+Benchmarks the memory kept per record by the dictionaries returned by default and by the :code:`Animal` and
+:code:`Organization` objects returned with :code:`typed_records=True`, and the CPU time of building them from decoded
+pages.
+
+Typed records keep their hot fields as slotted attributes and their nested blocks as one compact JSON string that is
+decoded on first access. The last column shows the memory per record once the nested blocks of every record have
+been accessed.
+
+Usage::
+
+    python benchmarks/bench_records.py
+
+"""
+
+
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import animal_record, organization_record, best_of
+from petpy.records import RECORD_TYPES
+
+
+def retained(build):
+    r"""
+    Returns the records built by :code:`build` and the bytes of memory they retain.
+
+    """
+    tracemalloc.start()
+    records = build()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return records, current
+
+
+def main():
+    n = 50000
+
+    print('{:<16}{:>10}{:>16}{:>16}{:>10}{:>16}{:>16}'.format('records', 'count', 'dict bytes', 'typed bytes',
+                                                               'ratio', 'typed CPU ms', 'accessed bytes'))
+
+    for key, factory in (('animals', animal_record), ('organizations', organization_record)):
+        record_type = RECORD_TYPES[key]
+        # Records are decoded from JSON, as they are from the Petfinder API, so no strings are shared between them.
+        body = json.dumps([factory(i) for i in range(n)])
+        pages = json.loads(body)
+
+        _, dict_bytes = retained(lambda: json.loads(body))
+        typed, typed_bytes = retained(lambda: [record_type(record) for record in json.loads(body)])
+        seconds = best_of(lambda: [record_type(record) for record in pages], repeat=3, number=1)
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for record in typed:
+            record.get('_links')
+        accessed_bytes = typed_bytes + tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+        print('{:<16}{:>10,}{:>16,.0f}{:>16,.0f}{:>9.1f}x{:>16.1f}{:>16,.0f}'.format(
+            key, n, dict_bytes / n, typed_bytes / n, dict_bytes / typed_bytes, seconds * 1e3, accessed_bytes / n))
+
+
+if __name__ == '__main__':
+    main()
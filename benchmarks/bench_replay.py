@@ -0,0 +1,72 @@
+# encoding=utf-8
+
+r"""
+
+Benchmarks the CPU time and peak memory of :code:`animals(pages=None)` with no network involved, by replaying an
+archive recorded with :code:`petpy.transport.RecordTransport`.
+
+The search is recorded once against :code:`petpy.testing.PetfinderServer`, unless the archive already exists, and
+then replayed through :code:`ReplayTransport`, plain and with :code:`return_df=True`. Run the benchmark on two builds
+of :code:`petpy` with the same archive to compare them on identical responses.
+
+Usage::
+
+    python benchmarks/bench_replay.py [--archive animals.ndjson.gz] [--animals 10000]
+
+"""
+
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import best_of
+from petpy import Petfinder
+from petpy.testing import PetfinderServer
+from petpy.transport import RecordTransport, ReplayTransport
+
+
+def record(path, animals):
+    with PetfinderServer(animals=animals) as server:
+        with Petfinder(key='key', secret='secret', host=server.url, rate_limit=10000,
+                       transport=RecordTransport(path)) as pf:
+            pf.animals(results_per_page=100, pages=None)
+
+
+def replay(path, return_df):
+    # The rate limit is raised so replayed requests are not spaced out to 50 per second.
+    with Petfinder(key='key', secret='secret', rate_limit=10000, transport=ReplayTransport(path)) as pf:
+        return pf.animals(results_per_page=100, pages=None, return_df=return_df)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--archive', default='animals.ndjson.gz')
+    parser.add_argument('--animals', type=int, default=10000)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.archive):
+        start = time.perf_counter()
+        record(args.archive, args.animals)
+        print('recorded {} in {:.2f} s'.format(args.archive, time.perf_counter() - start))
+
+    print('{:<14}{:>12}{:>16}'.format('mode', 'CPU ms', 'peak memory MB'))
+
+    for mode, return_df in (('plain', False), ('return_df', True)):
+        seconds = best_of(lambda: replay(args.archive, return_df), repeat=3, number=1)
+
+        tracemalloc.start()
+        replay(args.archive, return_df)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print('{:<14}{:>12.2f}{:>16.2f}'.format(mode, seconds * 1e3, peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
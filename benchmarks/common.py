@@ -0,0 +1,50 @@
+# encoding=utf-8
+
+r"""
+
+Shared helpers for the :code:`petpy` benchmarks. The record factories of :code:`petpy.testing` build animals and
+organizations with the same fields and nesting as those returned by the Petfinder API v2.
+
+"""
+
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from petpy.testing import animal_record, organization_record
+
+
+def page(key: str, records: list, current_page: int = 1, total_pages: int = 1) -> dict:
+    return {
+        key: records,
+        'pagination': {
+            'count_per_page': len(records),
+            'total_count': len(records) * total_pages,
+            'current_page': current_page,
+            'total_pages': total_pages
+        }
+    }
+
+
+def animals_page_bytes(n: int = 100) -> bytes:
+    return json.dumps(page('animals', [animal_record(i) for i in range(n)])).encode('utf-8')
+
+
+def best_of(func, repeat: int = 5, number: int = 20) -> float:
+    r"""
+    Returns the lowest mean CPU time in seconds of :code:`number` calls to :code:`func` over :code:`repeat` runs.
+
+    """
+    times = []
+
+    for _ in range(repeat):
+        start = time.process_time()
+        for _ in range(number):
+            func()
+        times.append((time.process_time() - start) / number)
+
+    return min(times)
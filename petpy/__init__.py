@@ -5,3 +5,13 @@ Petpy Petfinder API library
 """
 
 from petpy.api import Petfinder
+
+
+def __getattr__(name):
+    # AsyncPetfinder is imported on first use, so importing petpy does not load asyncio.
+    if name == 'AsyncPetfinder':
+        from petpy.async_api import AsyncPetfinder
+
+        return AsyncPetfinder
+
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
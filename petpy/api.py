@@ -10,23 +10,37 @@ https://www.petfinder.com/developers/
 """
 
 
+from concurrent.futures import ThreadPoolExecutor
 import datetime
+import json
+import threading
+import time
+from typing import Iterator, Union
 from urllib.parse import urljoin
 
-import pandas as pd
-from ratelimit import limits, RateLimitException
-from backoff import on_exception, expo
-from pandas import json_normalize
 import requests
-
+from requests.adapters import HTTPAdapter
+
+from petpy.cache import SingleFlight, TTLCache, ValidationCache
+from petpy.flatten import RecordFlattener, compile_fields, flatten_records, project_record
+from petpy.hooks import RequestEvent, call_hooks
+from petpy.limiter import TokenBucket
+from petpy.parameters import format_dates, search_parameters
+from petpy.quota import QuotaBudget
+from petpy.records import RECORD_TYPES
+from petpy.retry import CircuitBreaker, RetryPolicy
+from petpy.sinks import Sink, open_sink
+from petpy.sync import SyncState, advance, default_sync_key, epoch_seconds, is_changed, is_new, parse_timestamp
 from petpy.petpy_types import (
     AnimalTypes,
     AnimalFeatures,
     Animals,
     Date,
+    Fields,
     PetfinderID
 )
 from petpy.exceptions import (
+    PetfinderError,
     PetfinderInvalidCredentials,
     PetfinderInsufficientAccess,
     PetfinderResourceNotFound,
@@ -52,23 +66,82 @@ class Petfinder(object):
         The key from the Petfinder API passed when the :code:`Petfinder` class is initialized.
     secret : str
         The secret key obtained from the Petfinder API passed when the :code:`Petfinder` class is initialized.
+    rate_limiter : TokenBucket
+        Token bucket that every HTTP request sent by the instance waits on.
+    rate_limit_wait : float
+        Number of seconds a request sent now would wait on the rate limiter.
+    reference_cache : TTLCache
+        Cache of the reference data returned by :code:`animal_types()` and :code:`breeds()`. Call
+        :code:`reference_cache.invalidate()` to clear it. :code:`None` if caching is disabled.
+    http_cache : ValidationCache
+        Cache of search result pages revalidated with conditional requests. :code:`None` unless
+        :code:`http_cache_path` is given.
+    json_decoder : callable
+        Function used to decode the JSON body of every response.
+    single_flight : SingleFlight
+        Single-flight layer shared by identical concurrent requests, with :code:`hits` and :code:`misses` counters.
+        :code:`None` if :code:`single_flight=False`.
+    quota : QuotaBudget
+        Daily request budget every request is taken from. :code:`None` unless :code:`quota` is given.
+    retry_policy : RetryPolicy
+        Policy deciding when and after how long failed requests are retried.
+    circuit_breaker : CircuitBreaker
+        Circuit breaker that fails requests fast while the Petfinder API is failing. :code:`None` unless
+        :code:`circuit_breaker` is given.
+    hooks : list
+        Callables called with a :code:`RequestEvent` for every HTTP request sent. Hooks can be added to or removed
+        from the list at any time.
 
     Methods
     -------
-    animal_types(types, return_df=False)
+    animal_types(types=None, use_cache=True)
         Returns data on an animal type, or types, available from the Petfinder API.
-    breeds(types=None, return_df=False, raw_results=False)
+    breeds(types=None, return_df=False, raw_results=False, use_cache=True)
         Returns available breeds of specified animal type(s) from the Petfinder API.
     animals(animal_id=None, animal_type=None, breed=None, size=None, gender=None, age=None, color=None,
-            coat=None, status=None, name=None, organization_id=None, location=None, distance=None,
-            sort=None, pages=None, results_per_page=20, return_df=False)
+            coat=None, status=None, name=None, organization_id=None, location=None, distance=None, ...,
+            before_date=None, after_date=None, sort=None, pages=1, results_per_page=20, return_df=False,
+            max_workers=None, fields=None, sink=None, typed_records=False)
         Finds adoptable animals based on given criteria.
     organizations(organization_id=None, name=None, location=None, distance=None, state=None, country=None,
-                  query=None, sort=None, results_per_page=20, pages=None, return_df=False)
+                  query=None, sort=None, results_per_page=20, pages=1, return_df=False, max_workers=None, fields=None,
+                  sink=None, typed_records=False)
         Finds animal organizations based on specified criteria in the Petfinder API database.
+    lookup_animals(animal_ids, max_workers=8, return_df=False)
+        Returns the animals with the given IDs along with the IDs that were missing or failed.
+    iter_animals(animal_type=None, ..., sort=None, pages=None, results_per_page=100, by_page=False)
+        Yields adoptable animals matching the given criteria as each page of results is returned.
+    iter_organizations(name=None, ..., sort=None, pages=None, results_per_page=100, by_page=False)
+        Yields animal welfare organizations matching the given criteria as each page of results is returned.
+    sync_animals(state, animal_type=None, ..., start_date=None, sync_key=None, results_per_page=100)
+        Returns the animals matching a search that were published since the previous sync.
+    crawl_animals(animal_type=None, ..., window_size=1000, results_per_page=100, max_workers=8)
+        Returns every animal matching a search by splitting it into publish date windows requested in parallel.
+    estimate(key='animals', pages=None, results_per_page=100, max_workers=None, **search)
+        Estimates the number of requests and the time a search would take from its first page.
+    close()
+        Closes the pooled HTTP session used for all requests to the Petfinder API.
 
     """
-    def __init__(self, key: str, secret: str):
+    def __init__(self, key: str, secret: str,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 pool_block: bool = False,
+                 keep_alive: bool = True,
+                 rate_limit: float = 50,
+                 rate_limit_burst: int = None,
+                 token_refresh_margin: float = 60,
+                 cache_ttl: float = 86400,
+                 cache_path: str = None,
+                 http_cache_path: str = None,
+                 json_decoder=None,
+                 single_flight: bool = True,
+                 quota: QuotaBudget = None,
+                 retry_policy: RetryPolicy = None,
+                 circuit_breaker: Union[CircuitBreaker, bool] = None,
+                 hooks=None,
+                 host: str = 'https://api.petfinder.com/v2/',
+                 transport: HTTPAdapter = None):
         r"""
         Initialization method of the :code:`Petfinder` class.
 
@@ -79,13 +152,160 @@ class Petfinder(object):
         secret : str
             Secret API key given in addition to general API key. The secret key is required as of V2 of
             the PetFinder API and is obtained from the Petfinder website at the same time as the access key.
+        pool_connections : int, default 10
+            Number of connection pools to cache in the underlying :code:`requests.Session`.
+        pool_maxsize : int, default 10
+            Maximum number of connections to keep open to a single host. Should be at least as large as the number
+            of threads making requests with the same :code:`Petfinder` instance.
+        pool_block : boolean, default False
+            If :code:`True`, a request waits for a free connection when the pool for a host is exhausted instead
+            of opening a new, unpooled connection.
+        keep_alive : boolean, default True
+            If :code:`True`, connections are kept alive and reused between requests, avoiding a new TCP and TLS
+            handshake for every call to the Petfinder API.
+        rate_limit : float, default 50
+            Maximum number of requests per second sent to the Petfinder API. The limit applies to every HTTP request,
+            including each page of a paginated search, and is shared by all methods and threads using the same
+            :code:`Petfinder` instance.
+        rate_limit_burst : int, optional
+            Maximum number of requests that can be sent at once before the :code:`rate_limit` applies. Defaults to
+            :code:`rate_limit`.
+        token_refresh_margin : float, default 60
+            Number of seconds before the access token expires at which it is refreshed. The token is refreshed by
+            the first request made inside the margin, so requests in flight during a long crawl do not fail on an
+            expired token.
+        cache_ttl : float, default 86400
+            Number of seconds the reference data returned by :code:`animal_types()` and :code:`breeds()` is cached
+            for. Defaults to one day. If :code:`None` or 0, the reference data is not cached.
+        cache_path : str, optional
+            Path of a JSON file the reference data cache is persisted to, so it can be shared between Python
+            sessions. If not given, the cache is kept in memory.
+        http_cache_path : str, optional
+            Directory to store the pages of :code:`animals()` and :code:`organizations()` search results in. If
+            given, a repeated search sends the validators of the stored pages with each request and pages that have
+            not changed are answered from the stored copy instead of being downloaded again. Only the download is
+            saved: stored pages are decoded with :code:`json_decoder`, and flattened if :code:`return_df=True`, on
+            every search, so each search returns its own copy of the records, which can be modified freely.
+        json_decoder : callable, optional
+            Function used to decode the JSON body of every response, called with the body as :code:`bytes`. Defaults
+            to :code:`json.loads`. A faster JSON library, such as :code:`orjson.loads`, can be used for large
+            crawls.
+        single_flight : boolean, default True
+            If :code:`True`, identical requests made at the same time from different threads, such as the same
+            :code:`animals()` search or :code:`breeds()` call, share one request to the Petfinder API. The first call
+            sends the request and the others wait for its response, which each call decodes separately. The number
+            of shared and sent requests is counted in :code:`single_flight.hits` and :code:`single_flight.misses`.
+        quota : QuotaBudget, optional
+            A :code:`QuotaBudget` from :code:`petpy.quota` that every request to a Petfinder API endpoint is taken
+            from before it is sent. Once the day's budget, or the allowance of the active job, is spent, a
+            :code:`PetfinderQuotaExhausted` error is raised instead of sending the request. The budget can be shared
+            by several :code:`Petfinder` instances using the same API key.
+        retry_policy : RetryPolicy, optional
+            A :code:`RetryPolicy` from :code:`petpy.retry` deciding how requests that fail with a server error or a
+            connection error are retried. Defaults to :code:`RetryPolicy()`, which retries up to 3 times with a
+            jittered exponential backoff and honors :code:`Retry-After` headers.
+        circuit_breaker : CircuitBreaker or boolean, optional
+            A :code:`CircuitBreaker` from :code:`petpy.retry` that fails requests fast, with a
+            :code:`PetfinderCircuitOpen` error, while the Petfinder API is failing. If :code:`True`, a
+            :code:`CircuitBreaker()` is used. If not given or :code:`False`, requests are always sent.
+        hooks : callable or list of callables, optional
+            Called with a :code:`RequestEvent` from :code:`petpy.hooks` after every HTTP request sent to the
+            Petfinder API, including each retry and each access token request. The event has the endpoint, query
+            parameters, status code, latency, response size, attempt number, time waited on the rate limiter and
+            whether the request was a token refresh. :code:`petpy.hooks.RequestStats` aggregates the events into
+            per-endpoint totals and latency percentiles. Exceptions raised by a hook are reported as warnings.
+        host : str, default 'https://api.petfinder.com/v2/'
+            Base URL of the Petfinder API. Set to the :code:`url` of a :code:`petpy.testing.PetfinderServer` to send
+            requests to a local stand-in for the Petfinder API instead.
+        transport : HTTPAdapter, optional
+            Transport adapter every request is sent through, in place of the pooled connection adapter. Pass a
+            :code:`RecordTransport` from :code:`petpy.transport` to record every response of the Petfinder API to an
+            archive, and a :code:`ReplayTransport` to answer requests from a recorded archive without a network
+            connection.
 
         """
         self.key = key
         self.secret = secret
-        self._host = 'https://api.petfinder.com/v2/'
+        self._host = host.rstrip('/') + '/'
+        self._session = _create_session(pool_connections=pool_connections,
+                                        pool_maxsize=pool_maxsize,
+                                        pool_block=pool_block,
+                                        keep_alive=keep_alive,
+                                        adapter=transport)
+        self.rate_limiter = TokenBucket(rate=rate_limit, capacity=rate_limit_burst)
+        self.reference_cache = TTLCache(ttl=cache_ttl, path=cache_path) if cache_ttl else None
+        self.http_cache = ValidationCache(http_cache_path) if http_cache_path else None
+        self.json_decoder = json_decoder or json.loads
+        self.single_flight = SingleFlight() if single_flight else None
+        self.quota = quota
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = _circuit_breaker(circuit_breaker)
+        self.hooks = _hooks(hooks)
+        self._token_refresh_margin = token_refresh_margin
+        self._token_lock = threading.Lock()
+        self._token_expires_at = None
         self._access_token = self._authenticate()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        r"""
+        Closes the pooled HTTP session and any open connections to the Petfinder API, and writes the counts of the
+        :code:`quota` to disk.
+
+        """
+        self._session.close()
+
+        if self.quota is not None:
+            self.quota.flush()
+
+    @property
+    def rate_limit_wait(self) -> float:
+        r"""
+        Number of seconds a request sent now would wait on the rate limiter.
+
+        """
+        return self.rate_limiter.wait_time
+
+    @property
+    def _access_token(self) -> str:
+        return self._token
+
+    @_access_token.setter
+    def _access_token(self, token: str):
+        self._token = token
+        self._auth_headers = {'Authorization': 'Bearer ' + token}
+
+    def _refresh_token(self, stale_headers: dict = None):
+        r"""
+        Internal method for refreshing the access token before it expires or after it has been rejected.
+
+        The token is refreshed under a lock. Threads waiting on the lock check again once they acquire it, so when
+        many requests find the token expiring or rejected at the same time, only one of them authenticates again.
+
+        Parameters
+        ----------
+        stale_headers : dict, optional
+            The authorization headers that were rejected by the Petfinder API. If given, the token is refreshed
+            only if it has not already been replaced by another thread.
+
+        """
+        with self._token_lock:
+            if stale_headers is not None:
+                if self._auth_headers is not stale_headers:
+                    return
+            elif not self._token_expiring():
+                return
+
+            self._access_token = self._authenticate()
+
+    def _token_expiring(self) -> bool:
+        return time.monotonic() >= self._token_expires_at - self._token_refresh_margin
+
     def _authenticate(self) -> str:
         r"""
         Internal function for authenticating users to the Petfinder API.
@@ -99,8 +319,8 @@ class Petfinder(object):
         Returns
         -------
         str
-            Access token granted by the Petfinder API. The access token stays live for 3600 seconds, or one hour,
-            at which point the user must reauthenticate.
+            Access token granted by the Petfinder API. The access token stays live for 3600 seconds, or one hour.
+            The time the token expires is recorded so it can be refreshed before it does.
 
         See Also
         --------
@@ -116,28 +336,26 @@ class Petfinder(object):
             'client_id': self.key,
             'client_secret': self.secret
         }
-        try:
-            r = requests.post(url, data=data)
-            if r.status_code == 401:
-                raise PetfinderInvalidCredentials(
-                    message="Client authentication failed.",
-                    err=("Invalid credentials", 401)
-                )
-            return r.json()['access_token']
-        except PetfinderUnexpectedError:
-            try_count = 1
-            while try_count <= 3:
-                print(f'Petfinder API encountered an unexpected error during authentication. '
-                      f'Re-trying 3 times. Attempt {try_count}')
-                self._authenticate()
-                try_count += 1
-            raise PetfinderUnexpectedError(message="Couldn't authenticate after three tries.",
-                                           err=("Petfinder API encountered an unexpected error.", 500)
-                                           )
-
-    @on_exception(expo, RateLimitException, max_tries=10)
-    @limits(calls=50, period=1)
-    def animal_types(self, types: AnimalTypes = None) -> dict:
+
+        r = self._send('post', url, count=False, data=data)
+
+        if r.status_code == 401:
+            raise PetfinderInvalidCredentials(
+                message="Client authentication failed.",
+                err=("Invalid credentials", 401)
+            )
+        elif self.retry_policy.retries(r.status_code) and r.status_code != 429:
+            raise PetfinderUnexpectedError(message="Couldn't authenticate after maximum retries.",
+                                           err=(r.reason, r.status_code))
+        elif r.status_code != 200:
+            _raise_for_status(r.status_code, r.reason, lambda: self._decode(r))
+
+        token = self._decode(r)
+        self._token_expires_at = time.monotonic() + token.get('expires_in', 3600)
+
+        return token['access_token']
+
+    def animal_types(self, types: AnimalTypes = None, use_cache: bool = True) -> dict:
         r"""
         Returns data on an animal type, or types available from the Petfinder API. This data includes the
         available type's coat names and colors, gender and other specific information relevant to the
@@ -150,6 +368,9 @@ class Petfinder(object):
             Specifies the animal type or types to return. Can be a string representing a single animal type, or a
             tuple or list of animal types if more than one type is desired. If not specified, all animal types are
             returned.
+        use_cache : boolean, default True
+            If :code:`True`, animal type data cached by a previous call is returned without a request to the
+            Petfinder API. If :code:`False`, the data is requested again and the cache is updated.
 
         Raises
         ------
@@ -176,35 +397,17 @@ class Petfinder(object):
         >>> cat_dog_rabbit_types = pf.animal_types(['cat', 'dog', 'rabbit'])
 
         """
-        if types is not None:
-            type_check = types
-            if isinstance(types, str):
-                type_check = [types]
-            diff = set(type_check).difference(('dog', 'cat', 'rabbit', 'small-furry', 'horse', 'bird',
-                                               'scales-fins-other', 'barnyard'))
-            if len(diff) > 0:
-                raise ValueError("animal types must be of the following 'dog', 'cat', 'rabbit', "
-                                 "'small-furry', 'horse', 'bird', 'scales-fins-other', 'barnyard'")
+        _check_animal_types(types)
 
         if types is None:
             url = urljoin(self._host, 'types')
 
-            r = self._get_result(url,
-                                 headers={
-                                     'Authorization': 'Bearer ' + self._access_token
-                                 })
-
-            result = r.json()
+            result = self._get_reference(url, use_cache=use_cache)
 
         elif isinstance(types, str):
             url = urljoin(self._host, 'types/{type}'.format(type=types))
 
-            r = self._get_result(url,
-                                 headers={
-                                     'Authorization': 'Bearer ' + self._access_token
-                                 })
-
-            result = r.json()
+            result = self._get_reference(url, use_cache=use_cache)
 
         elif isinstance(types, (tuple, list)):
             types_collection = []
@@ -212,12 +415,7 @@ class Petfinder(object):
             for t in types:
                 url = urljoin(self._host, 'types/{type}'.format(type=t))
 
-                r = self._get_result(url,
-                                     headers={
-                                         'Authorization': 'Bearer ' + self._access_token
-                                     })
-
-                types_collection.append(r.json()['type'])
+                types_collection.append(self._get_reference(url, use_cache=use_cache)['type'])
 
             result = {'types': types_collection}
 
@@ -226,10 +424,8 @@ class Petfinder(object):
 
         return result
 
-    @on_exception(expo, RateLimitException, max_tries=10)
-    @limits(calls=50, period=1)
     def breeds(self, types: AnimalTypes = None,
-               return_df: bool = False, raw_results: bool = False) -> dict:
+               return_df: bool = False, raw_results: bool = False, use_cache: bool = True) -> dict:
         r"""
         Returns breed names of specified animal type, or types.
 
@@ -250,6 +446,9 @@ class Petfinder(object):
             :code:`True` for those interested in retrieving the entire result set. If the parameter :code:`return_df`
             is set to :code:`True`, a pandas :code:`DataFrame` will be returned regardless of the value specified for
             the :code:`raw_result` parameter.
+        use_cache : boolean, default True
+            If :code:`True`, breeds cached by a previous call are returned without a request to the Petfinder API.
+            If :code:`False`, the breeds are requested again and the cache is updated.
 
         Raises
         ------
@@ -283,15 +482,7 @@ class Petfinder(object):
         >>> all_breeds_df = pf.breeds(return_df = True)
 
         """
-        if types is not None:
-            type_check = types
-            if isinstance(types, str):
-                type_check = [types]
-            diff = set(type_check).difference(('dog', 'cat', 'rabbit', 'small-furry', 'horse', 'bird',
-                                               'scales-fins-other', 'barnyard'))
-            if len(diff) > 0:
-                raise ValueError("animal types must be of the following 'dog', 'cat', 'rabbit', "
-                                 "'small-furry', 'horse', 'bird', 'scales-fins-other', 'barnyard'")
+        _check_animal_types(types)
 
         if types is None or isinstance(types, (list, tuple)):
             breeds = []
@@ -303,66 +494,20 @@ class Petfinder(object):
             for t in types:
                 url = urljoin(self._host, 'types/{type}/breeds'.format(type=t))
 
-                r = self._get_result(url,
-                                     headers={
-                                         'Authorization': 'Bearer ' + self._access_token
-                                     })
-                breeds.append({t: r.json()})
+                breeds.append({t: self._get_reference(url, use_cache=use_cache)})
 
             result = {'breeds': breeds}
 
         elif isinstance(types, str):
             url = urljoin(self._host, 'types/{type}/breeds'.format(type=types))
 
-            r = self._get_result(url,
-                                 headers={
-                                     'Authorization': 'Bearer ' + self._access_token
-                                 })
-            result = r.json()
+            result = self._get_reference(url, use_cache=use_cache)
 
         else:
             raise TypeError('types parameter must be either None, str, list or tuple')
 
-        if return_df:
-            raw_results = True
-            df_results = []
-            if isinstance(types, (tuple, list)):
-                for t in range(0, len(types)):
-                    df_results.append(json_normalize(result['breeds'][t][types[t]]['breeds']))
-            else:
-                df_results.append(json_normalize(result['breeds']))
-            df_results = pd.concat(df_results)
-            df_results.rename(columns={'_links.type.href': 'breed'}, inplace=True)
-            df_results['breed'] = df_results['breed'].str.replace('/v2/types/', '').str.capitalize()
-
-            result = df_results
-
-        if not raw_results:
-            json_result = {
-                'breeds': {
-
-                }
-            }
-
-            if isinstance(types, (tuple, list)):
-                for t in range(0, len(types)):
-                    json_result['breeds'][types[t]] = []
-
-                    for breed in result['breeds'][t][types[t]]['breeds']:
-                        json_result['breeds'][types[t]].append(breed['name'])
+        return _format_breeds(result, types=types, return_df=return_df, raw_results=raw_results)
 
-            else:
-                json_result['breeds'][types] = []
-
-                for breed in result['breeds']:
-                    json_result['breeds'][types].append(breed['name'])
-
-            result = json_result
-
-        return result
-
-    @on_exception(expo, RateLimitException, max_tries=10)
-    @limits(calls=50, period=1)
     def animals(self, animal_id: PetfinderID = None,
                 animal_type: str = None,
                 breed: AnimalFeatures = None,
@@ -387,7 +532,11 @@ class Petfinder(object):
                 sort: str = None,
                 pages: int = 1,
                 results_per_page: int = 20,
-                return_df: bool = False) -> Animals:
+                return_df: bool = False,
+                max_workers: int = None,
+                fields: Fields = None,
+                sink: Union[Sink, str] = None,
+                typed_records: bool = False) -> Animals:
         r"""
         Returns adoptable animal data from Petfinder based on specified criteria.
 
@@ -452,18 +601,41 @@ class Petfinder(object):
             Sorts by specified attribute. Leading dashes represents a reverse-order sort. Must be one of 'recent',
             '-recent', 'distance', or '-distance'.
         pages : int, default 1
-            Specifies which page of results to return. Defaults to the first page of results. If set to :code:`None`,
-            all results will be returned.
+            Specifies which page of results to return. Defaults to the first page of results. If set to :code:`None`
+            or 0, all results will be returned.
         results_per_page : int, default 20
             Number of results to return per page. Defaults to 20 results and cannot exceed 100 results per page.
         return_df : boolean, default False
             If :code:`True`, the results will be coerced into a pandas DataFrame.
+        max_workers : int, optional
+            If greater than 1, the remaining pages of results are requested concurrently with up to
+            :code:`max_workers` threads once the total number of pages is known from the first page. A list or
+            tuple of :code:`animal_id` is also requested concurrently. Results are still returned in page or
+            :code:`animal_id` order and every request waits on the shared rate limiter. Values larger than
+            the :code:`pool_maxsize` given to :code:`Petfinder` will open connections that are not reused. If not
+            specified, pages are requested one at a time.
+        fields : str, list or tuple of str, optional
+            Dotted paths of the fields to return, such as :code:`['id', 'name', 'breeds.primary', 'contact.address']`.
+            A path to a nested field returns every field below it. Other fields are dropped from each page as it is
+            parsed, so a DataFrame returned with :code:`return_df=True` only has the requested columns. If not
+            specified, every field is returned.
+        sink : Sink or str, optional
+            A :code:`NDJSONSink`, :code:`CSVSink` or :code:`ParquetSink` from :code:`petpy.sinks` that each page of
+            search results is written to as it is returned, instead of collecting the results in memory. The sink is
+            returned, with the number of records written in :code:`sink.rows`, and is left open so further searches
+            can be written to it. If a path is given, a sink is chosen by the file extension (.parquet, .csv,
+            .ndjson, .jsonl or .json) and closed once the search is written. Can only be used with searches.
+        typed_records : boolean, default False
+            If :code:`True`, the records of a search are returned as compact :code:`Animal` or :code:`Organization`
+            objects from :code:`petpy.records` instead of dictionaries. Their nested blocks, such as
+            :code:`contact` and :code:`_links`, are kept encoded until accessed, so large searches use several times
+            less memory. Can only be used with searches, and not with :code:`return_df` or :code:`sink`.
 
         Returns
         -------
-        dict or pandas DataFrame
+        dict, pandas DataFrame or Sink
             Dictionary object representing the returned JSON object from the Petfinder API. If :code:`return_df=True`,
-            the results are returned as a pandas DataFrame.
+            the results are returned as a pandas DataFrame. If a :code:`sink` is given, the sink is returned.
 
         Examples
         --------
@@ -480,52 +652,33 @@ class Petfinder(object):
         >>> animals = pf.animals(results_per_page=50, pages=3, return_df=True)
 
         """
-        if before_date:
-            if isinstance(before_date, str):
-                try:
-                    before_date = datetime.datetime.strptime(before_date, '%Y-%m-%d %H:%M:%S')
-                except ValueError:
-                    before_date = datetime.datetime.strptime(before_date, '%Y-%m-%d')
-            before_date = before_date.astimezone().replace(microsecond=0).isoformat()
-
-        if after_date:
-            if isinstance(after_date, str):
-                try:
-                    after_date = datetime.datetime.strptime(after_date, '%Y-%m-%d %H:%M:%S')
-                except ValueError:
-                    after_date = datetime.datetime.strptime(after_date, '%Y-%m-%d')
-            after_date = after_date.astimezone().replace(microsecond=0).isoformat()
+        before_date, after_date = format_dates(before_date, after_date)
+        spec = compile_fields(fields) if fields is not None else None
 
-        if after_date is not None and before_date is not None:
-            if before_date < after_date:
-                raise ValueError('before_date parameter must be more recent than after_date parameter.')
+        if animal_id is not None and sink is not None:
+            raise ValueError('sink can only be used with searches, not with animal_id.')
+        if animal_id is not None and typed_records:
+            raise ValueError('typed_records can only be used with searches, not with animal_id.')
 
         if animal_id is not None:
             url = urljoin(self._host, 'animals/{id}')
             if isinstance(animal_id, (tuple, list)):
                 animals = []
-                for ani_id in animal_id:
-                    try:
-                        r = self._get_result(url.format(id=ani_id),
-                                             headers={
-                                                 'Authorization': 'Bearer ' + self._access_token
-                                             })
-
-                        animal_data = r.json()['animal']
-                        animal_data['response'] = 200
-                    except PetfinderResourceNotFound:
+                results = self._get_records(url, record_ids=animal_id, key='animal', max_workers=max_workers)
+                for ani_id, animal_data in zip(animal_id, results):
+                    if isinstance(animal_data, PetfinderResourceNotFound):
                         animal_data = {
                             'id': ani_id,
                             'response': 404
                         }
+                    elif isinstance(animal_data, Exception):
+                        raise animal_data
+                    else:
+                        animal_data = dict(_project(animal_data, spec), response=200)
                     animals.append(animal_data)
             else:
                 try:
-                    r = self._get_result(url.format(id=animal_id),
-                                         headers={
-                                             'Authorization': 'Bearer ' + self._access_token
-                                         })
-                    animals = r.json()['animal']
+                    animals = _project(self._get_json(url.format(id=animal_id))['animal'], spec)
                     animals['response'] = 200
                 except PetfinderResourceNotFound:
                     animals = {
@@ -539,83 +692,31 @@ class Petfinder(object):
             if animal_type:  # Petfinder API does not return correct results for animal_type otherwise
                 url += '?type={}'.format(animal_type)
 
-            params = _parameters(animal_type=animal_type,
-                                 breed=breed,
-                                 size=size,
-                                 gender=gender,
-                                 age=age,
-                                 color=color,
-                                 coat=coat,
-                                 status=status,
-                                 name=name,
-                                 organization_id=organization_id,
-                                 location=location,
-                                 distance=distance,
-                                 sort=sort,
-                                 results_per_page=results_per_page,
-                                 before_date=before_date,
-                                 after_date=after_date,
-                                 good_with_cats=good_with_cats,
-                                 good_with_children=good_with_children,
-                                 good_with_dogs=good_with_dogs,
-                                 house_trained=house_trained,
-                                 declawed=declawed,
-                                 special_needs=special_needs)
-
-            if not pages:
-                params['limit'] = 100
-                params['page'] = 1
-
-                r = self._get_result(url,
-                                     headers={
-                                         'Authorization': 'Bearer ' + self._access_token
-                                     },
-                                     params=params)
-
-                animals = r.json()['animals']
-                max_pages = r.json()['pagination']['total_pages']
-
-                for page in range(2, max_pages + 1):
-                    params['page'] = page
-                    r = self._get_result(url,
-                                         headers={
-                                             'Authorization': 'Bearer ' + self._access_token
-                                         },
-                                         params=params)
-
-                    if isinstance(r.json(), dict):
-                        if 'animals' in r.json().keys():
-                            for i in r.json()['animals']:
-                                animals.append(i)
-
-            else:
-                pages += 1
-                params['page'] = 1
-
-                r = self._get_result(url,
-                                     headers={
-                                         'Authorization': 'Bearer ' + self._access_token
-                                     },
-                                     params=params)
-
-                animals = r.json()['animals']
-                max_pages = r.json()['pagination']['total_pages']
-
-                if pages > int(max_pages):
-                    pages = max_pages
-
-                for page in range(2, pages):
-                    params['page'] = page
-                    r = self._get_result(url,
-                                         headers={
-                                             'Authorization': 'Bearer ' + self._access_token
-                                         },
-                                         params=params)
-
-                    if isinstance(r.json(), dict):
-                        if 'animals' in r.json().keys():
-                            for i in r.json()['animals']:
-                                animals.append(i)
+            params = search_parameters(animal_type=animal_type,
+                                       breed=breed,
+                                       size=size,
+                                       gender=gender,
+                                       age=age,
+                                       color=color,
+                                       coat=coat,
+                                       status=status,
+                                       name=name,
+                                       organization_id=organization_id,
+                                       location=location,
+                                       distance=distance,
+                                       sort=sort,
+                                       results_per_page=results_per_page,
+                                       before_date=before_date,
+                                       after_date=after_date,
+                                       good_with_cats=good_with_cats,
+                                       good_with_children=good_with_children,
+                                       good_with_dogs=good_with_dogs,
+                                       house_trained=house_trained,
+                                       declawed=declawed,
+                                       special_needs=special_needs)
+
+            return self._search(url, params=params, key='animals', pages=pages or None, max_workers=max_workers,
+                                return_df=return_df, fields=fields, sink=sink, typed_records=typed_records)
 
         animals = {
             'animals': animals
@@ -626,8 +727,6 @@ class Petfinder(object):
 
         return animals
 
-    @on_exception(expo, RateLimitException, max_tries=10)
-    @limits(calls=50, period=1)
     def organizations(self,
                       organization_id: PetfinderID = None,
                       name: str = None,
@@ -639,7 +738,11 @@ class Petfinder(object):
                       sort: str = None,
                       results_per_page: int = 20,
                       pages: int = 1,
-                      return_df: bool = False):
+                      return_df: bool = False,
+                      max_workers: int = None,
+                      fields: Fields = None,
+                      sink: Union[Sink, str] = None,
+                      typed_records: bool = False):
         r"""
         Returns data on an animal welfare organization, or organizations, based on specified criteria.
 
@@ -647,7 +750,9 @@ class Petfinder(object):
         ----------
         organization_id : str, tuple or list of str, optional
             Returns results for specified :code:`organization_id`. Can be a str or a tuple or list of str
-            representing multiple organizations.
+            representing multiple organizations. When a tuple or list is given, each distinct ID is requested once,
+            and an ID that cannot be retrieved is returned with the status code of the failed request under
+            :code:`response` and the reason under :code:`error` instead of raising an exception.
         name : str, optional
             Returns results matching or partially matching organization name.
         location : str, optional
@@ -668,18 +773,41 @@ class Petfinder(object):
             Sorts by specified attribute. Leading dashes represents a reverse-order sort. Must be one of 'recent',
             '-recent', 'distance', or '-distance'.
         pages : int, default 1
-            Specifies which page of results to return. Defaults to the first page of results. If set to :code:`None`,
-            all results will be returned.
+            Specifies which page of results to return. Defaults to the first page of results. If set to :code:`None`
+            or 0, all results will be returned.
         results_per_page : int, default 20
             Number of results to return per page. Defaults to 20 results and cannot exceed 100 results per page.
         return_df : boolean, default False
             If :code:`True`, the results will be coerced into a pandas DataFrame.
+        max_workers : int, optional
+            If greater than 1, the remaining pages of results are requested concurrently with up to
+            :code:`max_workers` threads once the total number of pages is known from the first page. A list or
+            tuple of :code:`organization_id` is also requested concurrently. Results are still returned in page or
+            :code:`organization_id` order and every request waits on the shared rate limiter. Values larger than
+            the :code:`pool_maxsize` given to :code:`Petfinder` will open connections that are not reused. If not
+            specified, pages are requested one at a time.
+        fields : str, list or tuple of str, optional
+            Dotted paths of the fields to return, such as :code:`['id', 'name', 'breeds.primary', 'contact.address']`.
+            A path to a nested field returns every field below it. Other fields are dropped from each page as it is
+            parsed, so a DataFrame returned with :code:`return_df=True` only has the requested columns. If not
+            specified, every field is returned.
+        sink : Sink or str, optional
+            A :code:`NDJSONSink`, :code:`CSVSink` or :code:`ParquetSink` from :code:`petpy.sinks` that each page of
+            search results is written to as it is returned, instead of collecting the results in memory. The sink is
+            returned, with the number of records written in :code:`sink.rows`, and is left open so further searches
+            can be written to it. If a path is given, a sink is chosen by the file extension (.parquet, .csv,
+            .ndjson, .jsonl or .json) and closed once the search is written. Can only be used with searches.
+        typed_records : boolean, default False
+            If :code:`True`, the records of a search are returned as compact :code:`Animal` or :code:`Organization`
+            objects from :code:`petpy.records` instead of dictionaries. Their nested blocks, such as
+            :code:`contact` and :code:`_links`, are kept encoded until accessed, so large searches use several times
+            less memory. Can only be used with searches, and not with :code:`return_df` or :code:`sink`.
 
         Returns
         -------
-        dict or pandas DataFrame
+        dict, pandas DataFrame or Sink
             Dictionary object representing the returned JSON object from the Petfinder API. If :code:`return_df=True`,
-            the results are returned as a pandas DataFrame.
+            the results are returned as a pandas DataFrame. If a :code:`sink` is given, the sink is returned.
 
         Examples
         --------
@@ -691,66 +819,44 @@ class Petfinder(object):
         >>> wa_organizations = pf.organizations(state='WA')
 
         """
+        spec = compile_fields(fields) if fields is not None else None
+
+        if organization_id is not None and sink is not None:
+            raise ValueError('sink can only be used with searches, not with organization_id.')
+        if organization_id is not None and typed_records:
+            raise ValueError('typed_records can only be used with searches, not with organization_id.')
+
         if organization_id is not None:
             url = urljoin(self._host, 'organizations/{id}')
             if isinstance(organization_id, (tuple, list)):
                 organizations = []
-                for org_id in organization_id:
-                    org = self._get_org(url=url, org_id=org_id)
+                results = self._get_records(url, record_ids=organization_id, key='organization',
+                                            max_workers=max_workers)
+                for org_id, org in zip(organization_id, results):
+                    if isinstance(org, PetfinderResourceNotFound):
+                        org = {
+                            'id': org_id,
+                            'response': 404
+                        }
+                    elif isinstance(org, Exception):
+                        err = getattr(org, 'err', None)
+                        org = {
+                            'id': org_id,
+                            'response': err[1] if isinstance(err, tuple) else None,
+                            'error': getattr(org, 'message', str(org))
+                        }
+                    else:
+                        org = dict(_project(org, spec), response=200)
                     organizations.append(org)
             else:
-                organizations = self._get_org(url=url, org_id=organization_id)
+                organizations = self._get_org(url=url, org_id=organization_id, spec=spec)
         else:
             url = urljoin(self._host, 'organizations/')
-            params = _parameters(name=name, location=location, distance=distance,
-                                 state=state, country=country, query=query, sort=sort,
-                                 results_per_page=results_per_page)
-            if pages is None:
-                params['limit'] = 100
-                params['page'] = 1
-                r = self._get_result(url,
-                                     headers={
-                                         'Authorization': 'Bearer ' + self._access_token
-                                     },
-                                     params=params)
-                organizations = r.json()['organizations']
-                max_pages = r.json()['pagination']['total_pages']
-                for page in range(2, max_pages + 1):
-                    params['page'] = page
-                    r = self._get_result(url,
-                                         headers={
-                                             'Authorization': 'Bearer ' + self._access_token
-                                         },
-                                         params=params)
-                    if isinstance(r.json(), dict):
-                        if 'organizations' in r.json().keys():
-                            for i in r.json()['organizations']:
-                                organizations.append(i)
-            else:
-                pages += 1
-                params['page'] = 1
-                r = self._get_result(url,
-                                     headers={
-                                         'Authorization': 'Bearer ' + self._access_token
-                                     },
-                                     params=params)
-                organizations = r.json()['organizations']
-                max_pages = r.json()['pagination']['total_pages']
-
-                if pages > int(max_pages):
-                    pages = max_pages
-
-                for page in range(2, pages):
-                    params['page'] = page
-                    r = self._get_result(url,
-                                         headers={
-                                             'Authorization': 'Bearer ' + self._access_token
-                                         },
-                                         params=params)
-                    if isinstance(r.json(), dict):
-                        if 'organizations' in r.json().keys():
-                            for i in r.json()['organizations']:
-                                organizations.append(i)
+            params = search_parameters(name=name, location=location, distance=distance,
+                                       state=state, country=country, query=query, sort=sort,
+                                       results_per_page=results_per_page)
+            return self._search(url, params=params, key='organizations', pages=pages or None, max_workers=max_workers,
+                                return_df=return_df, fields=fields, sink=sink, typed_records=typed_records)
 
         organizations = {
             'organizations': organizations
@@ -761,14 +867,864 @@ class Petfinder(object):
 
         return organizations
 
-    def _get_org(self, url, org_id):
-        try:
-            r = self._get_result(url.format(id=org_id),
-                                 headers={
-                                     'Authorization': 'Bearer ' + self._access_token
-                                 })
+    def lookup_animals(self, animal_ids: PetfinderID, max_workers: int = 8, return_df: bool = False) -> dict:
+        r"""
+        Returns the animals with the given IDs, along with a report of the IDs that could not be found or could not be
+        retrieved. IDs are requested concurrently and every request waits on the shared rate limiter.
+
+        Parameters
+        ----------
+        animal_ids : int, tuple or list of int
+            Animal IDs obtained from Petfinder.
+        max_workers : int, default 8
+            Maximum number of animal IDs requested at once.
+        return_df : boolean, default False
+            If :code:`True`, the found animals are returned as a pandas DataFrame.
+
+        Returns
+        -------
+        dict
+            Dictionary with the keys :code:`animals`, a list of the found animals in the order of
+            :code:`animal_ids`, or a pandas DataFrame if :code:`return_df=True`; :code:`missing`, a list of the IDs
+            the Petfinder API could not find; and :code:`failed`, a list of dictionaries with the :code:`id`,
+            :code:`error`, :code:`message` and :code:`status` of each ID whose request failed for any other reason.
+
+        Examples
+        --------
+        # Create an authenticated connection to the Petfinder API.
+        >>> pf = Petfinder(key=key, secret=secret)
+        # Refresh the status of tracked animals and find those no longer listed.
+        >>> lookup = pf.lookup_animals(tracked_ids, max_workers=16)
+        >>> statuses = {animal['id']: animal['status'] for animal in lookup['animals']}
+        >>> delisted = lookup['missing']
+
+        """
+        if not isinstance(animal_ids, (tuple, list)):
+            animal_ids = [animal_ids]
+
+        url = urljoin(self._host, 'animals/{id}')
+        results = self._get_records(url, record_ids=animal_ids, key='animal', max_workers=max_workers)
+
+        return _lookup_report(animal_ids, results, key='animals', return_df=return_df)
+
+    def iter_animals(self,
+                     animal_type: str = None,
+                     breed: AnimalFeatures = None,
+                     size: AnimalFeatures = None,
+                     gender: AnimalFeatures = None,
+                     age: AnimalFeatures = None,
+                     color: str = None,
+                     coat: AnimalFeatures = None,
+                     status: str = None,
+                     name: str = None,
+                     organization_id: AnimalFeatures = None,
+                     location: str = None,
+                     distance: int = None,
+                     good_with_children: bool = None,
+                     good_with_dogs: bool = None,
+                     good_with_cats: bool = None,
+                     house_trained: bool = None,
+                     declawed: bool = None,
+                     special_needs: bool = None,
+                     before_date: Date = None,
+                     after_date: Date = None,
+                     sort: str = None,
+                     pages: int = None,
+                     results_per_page: int = 100,
+                     by_page: bool = False) -> Iterator:
+        r"""
+        Generator version of :code:`animals()` that yields animal records as each page of results is returned from
+        the Petfinder API. Only one page of results is held in memory at a time and pages are only requested as the
+        generator is consumed, so stopping iteration early avoids requesting the remaining pages.
+
+        Parameters
+        ----------
+        animal_type, breed, size, gender, age, color, coat, status, name, organization_id, location, distance,
+        good_with_children, good_with_dogs, good_with_cats, house_trained, declawed, special_needs, before_date,
+        after_date, sort
+            Search criteria. See :code:`animals()` for the accepted values of each parameter.
+        pages : int, optional
+            Number of pages of results to iterate over. If not specified, all available pages are returned.
+        results_per_page : int, default 100
+            Number of results to request per page. Cannot exceed 100 results per page.
+        by_page : boolean, default False
+            If :code:`True`, each page of results is yielded as a list of animal records instead of yielding the
+            records one at a time.
+
+        Yields
+        ------
+        dict or list
+            Animal record, or a list of the animal records on a page if :code:`by_page=True`.
+
+        Examples
+        --------
+        # Create an authenticated connection to the Petfinder API.
+        >>> pf = Petfinder(key=key, secret=secret)
+        # Process every adoptable cat without holding all of the results in memory.
+        >>> for animal in pf.iter_animals(animal_type='cat', status='adoptable'):
+        >>>     print(animal['id'], animal['name'])
+
+        """
+        before_date, after_date = format_dates(before_date, after_date)
+
+        url = urljoin(self._host, 'animals/')
+
+        if animal_type:  # Petfinder API does not return correct results for animal_type otherwise
+            url += '?type={}'.format(animal_type)
+
+        params = search_parameters(animal_type=animal_type,
+                                   breed=breed,
+                                   size=size,
+                                   gender=gender,
+                                   age=age,
+                                   color=color,
+                                   coat=coat,
+                                   status=status,
+                                   name=name,
+                                   organization_id=organization_id,
+                                   location=location,
+                                   distance=distance,
+                                   sort=sort,
+                                   results_per_page=results_per_page,
+                                   before_date=before_date,
+                                   after_date=after_date,
+                                   good_with_cats=good_with_cats,
+                                   good_with_children=good_with_children,
+                                   good_with_dogs=good_with_dogs,
+                                   house_trained=house_trained,
+                                   declawed=declawed,
+                                   special_needs=special_needs)
+
+        return self._iter_pages(url, params=params, key='animals', pages=pages, by_page=by_page)
+
+    def iter_organizations(self,
+                           name: str = None,
+                           location: str = None,
+                           distance: int = None,
+                           state: str = None,
+                           country: str = None,
+                           query: str = None,
+                           sort: str = None,
+                           pages: int = None,
+                           results_per_page: int = 100,
+                           by_page: bool = False) -> Iterator:
+        r"""
+        Generator version of :code:`organizations()` that yields organization records as each page of results is
+        returned from the Petfinder API. Only one page of results is held in memory at a time and pages are only
+        requested as the generator is consumed.
+
+        Parameters
+        ----------
+        name, location, distance, state, country, query, sort
+            Search criteria. See :code:`organizations()` for the accepted values of each parameter.
+        pages : int, optional
+            Number of pages of results to iterate over. If not specified, all available pages are returned.
+        results_per_page : int, default 100
+            Number of results to request per page. Cannot exceed 100 results per page.
+        by_page : boolean, default False
+            If :code:`True`, each page of results is yielded as a list of organization records instead of yielding
+            the records one at a time.
+
+        Yields
+        ------
+        dict or list
+            Organization record, or a list of the organization records on a page if :code:`by_page=True`.
+
+        Examples
+        --------
+        # Create an authenticated connection to the Petfinder API.
+        >>> pf = Petfinder(key=key, secret=secret)
+        # Find the first organization in Washington with 'cat' in its name.
+        >>> org = next(o for o in pf.iter_organizations(state='WA') if 'cat' in o['name'].lower())
+
+        """
+        url = urljoin(self._host, 'organizations/')
+        params = search_parameters(name=name, location=location, distance=distance,
+                                   state=state, country=country, query=query, sort=sort,
+                                   results_per_page=results_per_page)
+
+        return self._iter_pages(url, params=params, key='organizations', pages=pages, by_page=by_page)
+
+    def sync_animals(self,
+                     state: Union[SyncState, str],
+                     animal_type: str = None,
+                     breed: AnimalFeatures = None,
+                     size: AnimalFeatures = None,
+                     gender: AnimalFeatures = None,
+                     age: AnimalFeatures = None,
+                     color: str = None,
+                     coat: AnimalFeatures = None,
+                     status: str = None,
+                     name: str = None,
+                     organization_id: AnimalFeatures = None,
+                     location: str = None,
+                     distance: int = None,
+                     good_with_children: bool = None,
+                     good_with_dogs: bool = None,
+                     good_with_cats: bool = None,
+                     house_trained: bool = None,
+                     declawed: bool = None,
+                     special_needs: bool = None,
+                     start_date: Date = None,
+                     sync_key: str = None,
+                     change_window: int = 86400,
+                     results_per_page: int = 100,
+                     return_df: bool = False,
+                     fields: Fields = None) -> Animals:
+        r"""
+        Returns the animals matching a search that were published or changed since the previous sync of the same
+        search.
+
+        The latest :code:`published_at` timestamp returned by each sync is saved to :code:`state` as a watermark,
+        along with the latest :code:`status_changed_at` of the animals it has seen. The next sync requests only
+        animals published after the watermark, sorted with the most recent first using :code:`sort='recent'`, and
+        stops requesting pages as soon as it reaches an animal that has already been returned. Animals on the
+        requested pages whose :code:`status_changed_at` is later than the previous sync's are returned as well. The
+        watermark is only advanced once every new animal has been returned, so a sync that fails is repeated from the
+        previous watermark on the next run.
+
+        The Petfinder API only filters and sorts searches by :code:`published_at`, so a status change is only
+        detected for an animal on the requested pages. A change to an animal published well before the watermark
+        is not returned by a sync.
+
+        Parameters
+        ----------
+        state : SyncState or str
+            The :code:`SyncState` from :code:`petpy.sync` the watermarks are stored in, or the path of the JSON file
+            to store them in.
+        animal_type, breed, size, gender, age, color, coat, status, name, organization_id, location, distance,
+        good_with_children, good_with_dogs, good_with_cats, house_trained, declawed, special_needs
+            Search criteria. See :code:`animals()` for the accepted values of each parameter.
+        start_date : str, datetime, optional
+            Date to sync from when there is no watermark for the search yet. Must be a string in the form of
+            'YYYY-MM-DD' or 'YYYY-MM-DD H:M:S' or a datetime object. If not given, the first sync returns every
+            animal matching the search.
+        sync_key : str, optional
+            Key the watermark is stored under. Defaults to a key built from the search criteria, so each search has
+            its own watermark.
+        change_window : int, default 86400
+            Number of seconds before the watermark that are searched again, so animals that were already returned and
+            whose status changed since the previous sync are returned again. The Petfinder API cannot search by
+            :code:`status_changed_at`, so status changes of animals published before the window are not returned.
+            Set to 0 to only return new animals.
+        results_per_page : int, default 100
+            Number of results to request per page. Cannot exceed 100 results per page.
+        return_df : boolean, default False
+            If :code:`True`, the new animals are returned as a pandas DataFrame.
+        fields : str, list or tuple of str, optional
+            Dotted paths of the fields to return. See :code:`animals()`.
+
+        Returns
+        -------
+        dict or pandas DataFrame
+            The new and changed animals under the key :code:`animals`, most recently published first, or a pandas
+            DataFrame if :code:`return_df=True`.
+
+        Examples
+        --------
+        # Create an authenticated connection to the Petfinder API.
+        >>> pf = Petfinder(key=key, secret=secret)
+        # The first run returns the cats published since May 1st, later runs the cats published or changed since.
+        >>> new_cats = pf.sync_animals('petpy_sync.json', animal_type='cat', location='Seattle, WA',
+        >>>                            start_date='2024-05-01')
+
+        """
+        if isinstance(state, str):
+            state = SyncState(state)
+
+        url = urljoin(self._host, 'animals/')
+
+        if animal_type:  # Petfinder API does not return correct results for animal_type otherwise
+            url += '?type={}'.format(animal_type)
+
+        params = search_parameters(animal_type=animal_type,
+                                   breed=breed,
+                                   size=size,
+                                   gender=gender,
+                                   age=age,
+                                   color=color,
+                                   coat=coat,
+                                   status=status,
+                                   name=name,
+                                   organization_id=organization_id,
+                                   location=location,
+                                   distance=distance,
+                                   sort='recent',
+                                   results_per_page=results_per_page,
+                                   good_with_cats=good_with_cats,
+                                   good_with_children=good_with_children,
+                                   good_with_dogs=good_with_dogs,
+                                   house_trained=house_trained,
+                                   declawed=declawed,
+                                   special_needs=special_needs)
+
+        sync_key = sync_key or default_sync_key('animals', params)
+        entry = state.get(sync_key)
+
+        # The search starts before the watermark, so the animals already returned in the window are checked for a
+        # status change.
+        if entry is not None:
+            after_date = parse_timestamp(entry['watermark']) - datetime.timedelta(seconds=change_window)
+        else:
+            after_date = start_date
+
+        _, after_date = format_dates(after_date=after_date)
+
+        if after_date:
+            params['after'] = after_date
+
+        animals, seen = [], []
+
+        for page in self._iter_pages(url, params=params, key='animals', by_page=True):
+            animals.extend(animal for animal in page if is_new(animal, entry) or is_changed(animal, entry))
+            seen.extend(page)
+
+        watermark = advance(entry, seen)
+
+        if watermark is not None and watermark != entry:
+            state.set(sync_key, watermark)
+
+        if return_df:
+            return flatten_records('animals', animals, fields=fields)
+
+        if fields is not None:
+            spec = compile_fields(fields)
+            animals = [project_record(animal, spec) for animal in animals]
+
+        return {
+            'animals': animals
+        }
+
+    def crawl_animals(self,
+                      animal_type: str = None,
+                      breed: AnimalFeatures = None,
+                      size: AnimalFeatures = None,
+                      gender: AnimalFeatures = None,
+                      age: AnimalFeatures = None,
+                      color: str = None,
+                      coat: AnimalFeatures = None,
+                      status: str = None,
+                      name: str = None,
+                      organization_id: AnimalFeatures = None,
+                      location: str = None,
+                      distance: int = None,
+                      good_with_children: bool = None,
+                      good_with_dogs: bool = None,
+                      good_with_cats: bool = None,
+                      house_trained: bool = None,
+                      declawed: bool = None,
+                      special_needs: bool = None,
+                      before_date: Date = None,
+                      after_date: Date = None,
+                      sort: str = None,
+                      window_size: int = 1000,
+                      results_per_page: int = 100,
+                      max_workers: int = 8,
+                      return_df: bool = False,
+                      fields: Fields = None,
+                      sink: Union[Sink, str] = None,
+                      typed_records: bool = False) -> Animals:
+        r"""
+        Returns every animal matching a search by splitting it into publish date windows that are requested in
+        parallel, instead of following one long chain of pages.
+
+        The first page of the search is requested to find its :code:`total_count`. If more than :code:`window_size`
+        animals match, the range of publish dates is split into :code:`after_date` and :code:`before_date` windows
+        sized from the count, and each window is probed in the same way until every window holds at most
+        :code:`window_size` animals or cannot be split further. The first page of each probe is kept as the first
+        page of its window, and the remaining pages of every window are then requested concurrently. The Petfinder
+        API excludes both :code:`after` and :code:`before`, so each window is requested with :code:`before` one
+        second after its end, which makes the windows contiguous and half-open: an animal published on a boundary
+        falls in exactly one window. The results are merged in window order and deduplicated by animal ID.
+
+        Parameters
+        ----------
+        animal_type, breed, size, gender, age, color, coat, status, name, organization_id, location, distance,
+        good_with_children, good_with_dogs, good_with_cats, house_trained, declawed, special_needs, before_date,
+        after_date, sort
+            Search criteria. See :code:`animals()` for the accepted values of each parameter. If
+            :code:`after_date` is not given, the publish date of the oldest matching animal is requested as the
+            start of the first window.
+        window_size : int, default 1000
+            Maximum number of animals in a window, which limits how deep any chain of pages goes.
+        results_per_page : int, default 100
+            Number of results to request per page. Cannot exceed 100 results per page.
+        max_workers : int, default 8
+            Maximum number of windows probed, or pages requested, at once. Every request waits on the shared rate
+            limiter.
+        return_df : boolean, default False
+            If :code:`True`, the animals are returned as a pandas DataFrame.
+        fields : str, list or tuple of str, optional
+            Dotted paths of the fields to return. See :code:`animals()`.
+        sink : Sink or str, optional
+            A sink from :code:`petpy.sinks`, or the path of a file, that the animals are written to instead of
+            being collected in memory. See :code:`animals()`.
+        typed_records : boolean, default False
+            If :code:`True`, the animals are returned as compact :code:`Animal` objects from :code:`petpy.records`.
+            See :code:`animals()`.
+
+        Returns
+        -------
+        dict, pandas DataFrame or Sink
+            The animals under the key :code:`animals`, with the most recently published windows first unless
+            :code:`sort='-recent'`. A pandas DataFrame if :code:`return_df=True`, or the sink if :code:`sink` is
+            given.
+
+        Examples
+        --------
+        # Create an authenticated connection to the Petfinder API.
+        >>> pf = Petfinder(key=key, secret=secret)
+        # Every adoptable dog in the United States, in windows of at most 2,000 animals.
+        >>> dogs = pf.crawl_animals(animal_type='dog', status='adoptable', window_size=2000, max_workers=16)
+
+        """
+        before_date, after_date = format_dates(before_date, after_date)
+
+        url = urljoin(self._host, 'animals/')
+
+        if animal_type:  # Petfinder API does not return correct results for animal_type otherwise
+            url += '?type={}'.format(animal_type)
+
+        params = search_parameters(animal_type=animal_type,
+                                   breed=breed,
+                                   size=size,
+                                   gender=gender,
+                                   age=age,
+                                   color=color,
+                                   coat=coat,
+                                   status=status,
+                                   name=name,
+                                   organization_id=organization_id,
+                                   location=location,
+                                   distance=distance,
+                                   sort=sort,
+                                   results_per_page=results_per_page,
+                                   before_date=before_date,
+                                   after_date=after_date,
+                                   good_with_cats=good_with_cats,
+                                   good_with_children=good_with_children,
+                                   good_with_dogs=good_with_dogs,
+                                   house_trained=house_trained,
+                                   declawed=declawed,
+                                   special_needs=special_needs)
+
+        def get_pages(url, params, key, pages=None, max_workers=None, collect=None, spec=None):
+            return self._crawl_pages(url, params=params, key=key, window_size=window_size,
+                                     max_workers=max_workers, collect=collect, spec=spec)
+
+        return self._search(url, params=params, key='animals', max_workers=max_workers, return_df=return_df,
+                            fields=fields, sink=sink, get_pages=get_pages, typed_records=typed_records)
+
+    def estimate(self, key: str = 'animals', pages: int = None, results_per_page: int = 100, max_workers: int = None,
+                 **search) -> dict:
+        r"""
+        Estimates the number of requests and the time an :code:`animals()` or :code:`organizations()` search would
+        take, by requesting only its first page.
+
+        The first page gives the :code:`total_count` and :code:`total_pages` of the search, and the time it took is
+        used as the latency of every page. The estimated time is the longer of the time the pages take to return,
+        :code:`max_workers` at a time, and the time the rate limiter spaces them over. The first page is taken from
+        the :code:`quota`, if one is given, like any other request.
+
+        Parameters
+        ----------
+        key : {'animals', 'organizations'}, default 'animals'
+            The type of search to estimate.
+        pages : int, optional
+            Number of pages the search would request. If not given, every page is counted.
+        results_per_page : int, default 100
+            Number of results per page. Every page is requested with 100 results when :code:`pages` is not given,
+            as it is by :code:`animals()` and :code:`organizations()`.
+        max_workers : int, optional
+            Number of pages the search would request at once. See :code:`animals()`.
+        **search
+            Search criteria of :code:`animals()` or :code:`organizations()`, such as :code:`animal_type`,
+            :code:`location` or :code:`after_date`.
+
+        Returns
+        -------
+        dict
+            The :code:`total_count` and :code:`total_pages` of the search; the number of :code:`requests` the search
+            would send; the :code:`latency` of the first page in seconds; the estimated :code:`seconds` the search
+            would take; the :code:`quota_remaining` after the first page, or :code:`None` without a :code:`quota`;
+            and :code:`within_quota`, whether the search fits in the remaining quota.
+
+        Examples
+        --------
+        # Create an authenticated connection to the Petfinder API.
+        >>> pf = Petfinder(key=key, secret=secret, quota=QuotaBudget(path='petpy_quota.json'))
+        >>> cost = pf.estimate(location='WA', animal_type='dog', max_workers=4)
+        >>> if cost['within_quota']:
+        >>>     dogs = pf.animals(location='WA', animal_type='dog', pages=None, max_workers=4)
+
+        """
+        if key not in ('animals', 'organizations'):
+            raise ValueError("key must be one of 'animals' or 'organizations'.")
+
+        pages = pages or None
+        before_date, after_date = format_dates(search.pop('before_date', None), search.pop('after_date', None))
+
+        url = urljoin(self._host, key + '/')
+
+        if key == 'animals' and search.get('animal_type'):
+            url += '?type={}'.format(search['animal_type'])
+
+        params = search_parameters(results_per_page=100 if pages is None else results_per_page, before_date=before_date,
+                                   after_date=after_date, **search)
+
+        started = time.perf_counter()
+        first_page = self._get_page(url, params=params, page=1)
+        latency = time.perf_counter() - started
+
+        pagination = first_page['pagination']
+        request_count = pagination['total_pages'] if pages is None else min(pages, pagination['total_pages'])
+
+        workers = max_workers if max_workers is not None and max_workers > 1 else 1
+        seconds = max(latency * (1 + -(-(request_count - 1) // workers)), (request_count - 1) / self.rate_limiter.rate)
+        remaining = self.quota.remaining if self.quota is not None else None
+
+        return {
+            'total_count': pagination['total_count'],
+            'total_pages': pagination['total_pages'],
+            'requests': request_count,
+            'latency': latency,
+            'seconds': seconds,
+            'quota_remaining': remaining,
+            'within_quota': remaining is None or request_count <= remaining
+        }
+
+    def _iter_pages(self, url, params, key, pages=None, by_page=False):
+        r"""
+        Internal generator that requests the pages of a Petfinder API search one at a time and yields the records of
+        each page as it is returned.
+
+        """
+        page = 1
+        max_pages = 1
+
+        while page <= max_pages:
+            page_result = self._get_page(url, params=params, page=page)
+
+            if page == 1:
+                max_pages = page_result['pagination']['total_pages']
+
+                if pages is not None and pages < max_pages:
+                    max_pages = pages
+
+            records = page_result.get(key, []) if isinstance(page_result, dict) else []
+
+            if by_page:
+                yield records
+            else:
+                yield from records
+
+            page += 1
+
+    def _get_reference(self, url, use_cache=True):
+        r"""
+        Internal method for requesting reference data, such as animal types and breeds, through the reference data
+        cache.
+
+        """
+        if use_cache and self.reference_cache is not None:
+            result = self.reference_cache.get(url)
+
+            if result is not None:
+                return result
+
+        result = self._get_json(url)
+
+        if self.reference_cache is not None:
+            self.reference_cache.set(url, result)
+
+        return result
+
+    def _search(self, url, params, key, pages=None, max_workers=None, return_df=False, fields=None, sink=None,
+                get_pages=None, typed_records=False):
+        r"""
+        Internal method for running a paginated Petfinder API search. The records are returned as a dictionary or a
+        pandas DataFrame, or written to :code:`sink` a page at a time. The pages are requested with
+        :code:`get_pages`, which takes the arguments of :code:`_get_pages` and defaults to it. If
+        :code:`typed_records` is :code:`True`, each record is converted to its :code:`petpy.records` type as its page
+        is returned.
+
+        """
+        get_pages = get_pages or self._get_pages
+
+        if typed_records and (return_df or sink is not None):
+            raise ValueError('typed_records cannot be used with return_df or sink.')
+
+        if sink is not None:
+            close = isinstance(sink, str)
+            if close:
+                sink = open_sink(sink)
+
+            try:
+                sink.open(key, fields)
+                get_pages(url, params=params, key=key, pages=pages, max_workers=max_workers, collect=sink.write)
+            finally:
+                if close:
+                    sink.close()
+
+            return sink
+
+        if return_df:
+            flattener = RecordFlattener(key, fields=fields)
+            get_pages(url, params=params, key=key, pages=pages, max_workers=max_workers, collect=flattener.add)
+
+            return flattener.to_frame()
+
+        spec = compile_fields(fields) if fields is not None else None
+
+        if typed_records:
+            record_type = RECORD_TYPES[key]
+            records = []
+
+            def collect(page):
+                records.extend(record_type(record if spec is None else project_record(record, spec))
+                               for record in page)
+
+            get_pages(url, params=params, key=key, pages=pages, max_workers=max_workers, collect=collect)
+
+            return {key: records}
+
+        return {
+            key: get_pages(url, params=params, key=key, pages=pages, max_workers=max_workers, spec=spec)
+        }
+
+    def _get_pages(self, url, params, key, pages=None, max_workers=None, collect=None, spec=None):
+        r"""
+        Internal method for collecting the records of a paginated Petfinder API search.
 
-            org = r.json()['organization']
+        Parameters
+        ----------
+        url : str
+            The search endpoint to request.
+        params : dict
+            Search parameters as returned by :code:`_parameters`.
+        key : {'animals', 'organizations'}
+            Key of the records in the returned JSON.
+        pages : int, optional
+            Number of pages to return. If :code:`None`, all available pages are returned with 100 results per page.
+        max_workers : int, optional
+            If greater than 1, pages after the first are requested concurrently using a thread pool of the given
+            size.
+        collect : callable, optional
+            If given, called with the records of each page, in page order, as the page is returned instead of
+            collecting the records into a list. Used to add pages to a :code:`RecordFlattener` or write them to a
+            sink.
+        spec : dict, optional
+            Fields to keep from each record collected into the list, as returned by :code:`compile_fields`. If not
+            given, records are collected whole.
+
+        Returns
+        -------
+        list
+            Records from each page, in page order. Empty if :code:`collect` is given.
+
+        """
+        if pages is None:
+            params['limit'] = 100
+
+        results = []
+
+        if collect is None and spec is not None:
+            def collect(records):
+                results.extend(project_record(record, spec) for record in records)
+        elif collect is None:
+            collect = results.extend
+
+        first_page = self._get_page(url, params=params, page=1)
+
+        collect(first_page[key])
+        max_pages = first_page['pagination']['total_pages']
+
+        if pages is not None and pages < max_pages:
+            max_pages = pages
+
+        remaining_pages = range(2, max_pages + 1)
+
+        if max_workers is not None and max_workers > 1 and len(remaining_pages) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                page_results = executor.map(lambda page: self._get_page(url, params=params, page=page),
+                                            remaining_pages)
+
+                for page_result in page_results:
+                    if isinstance(page_result, dict) and key in page_result:
+                        collect(page_result[key])
+        else:
+            for page in remaining_pages:
+                page_result = self._get_page(url, params=params, page=page)
+
+                if isinstance(page_result, dict) and key in page_result:
+                    collect(page_result[key])
+
+        return results
+
+    def _crawl_pages(self, url, params, key, window_size, max_workers=None, collect=None, spec=None):
+        r"""
+        Internal method for collecting the records of a search split into publish date windows of at most
+        :code:`window_size` records.
+
+        Windows are probed breadth first, :code:`max_workers` at a time, by requesting their first page, and a
+        window holding more than :code:`window_size` records is split into as many equal spans of publish dates as
+        it would need windows if its records were published evenly.
+        The remaining pages of every window are then requested concurrently. Records are collected in window order,
+        newest window first unless the search is sorted by :code:`-recent`, and records already collected from a
+        neighbouring window are skipped. Takes the same arguments as :code:`_get_pages`.
+
+        """
+        params = dict(params)
+        start = epoch_seconds(params.pop('after', None))
+        end = epoch_seconds(params.pop('before', None))
+
+        results = []
+
+        if collect is None:
+            collect = results.extend
+
+        seen = set()
+
+        def collect_new(records):
+            new_records = []
+
+            for record in records:
+                if record.get('id') not in seen:
+                    seen.add(record.get('id'))
+                    new_records.append(record if spec is None else project_record(record, spec))
+
+            collect(new_records)
+
+        workers = max(max_workers or 1, 1)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            def probe(window):
+                return self._get_page(url, params=_window_params(params, window, end), page=1)
+
+            root = (start, end)
+            first_page = probe(root)
+            windows = [(root, first_page)]
+
+            if first_page['pagination']['total_count'] > window_size:
+                if start is None:
+                    # The oldest animal is the first result when sorted by -recent.
+                    oldest = self._get_page(url, params=_window_params(dict(params, sort='-recent', limit=1),
+                                                                       root, end), page=1)
+                    if oldest.get(key):
+                        start = epoch_seconds(oldest[key][0]['published_at']) - 1
+
+                if end is None:
+                    end = int(time.time()) + 1
+
+                windows = []
+                pending = [((start, end), first_page)] if start is not None else []
+
+                while pending:
+                    split = []
+
+                    for (after, before), page in pending:
+                        total_count = page['pagination']['total_count']
+
+                        if total_count > window_size and before - after > 1:
+                            parts = min(-(-total_count // window_size), before - after)
+                            bounds = [after + (before - after) * part // parts for part in range(parts + 1)]
+                            split.extend(zip(bounds[:-1], bounds[1:]))
+                        else:
+                            windows.append(((after, before), page))
+
+                    pending = list(zip(split, executor.map(probe, split)))
+
+                if not windows:
+                    windows = [(root, first_page)]
+
+            windows.sort(key=lambda window: window[0][0] or 0, reverse=params.get('sort') != '-recent')
+
+            def get_page(request):
+                window, page = request
+                return self._get_page(url, params=_window_params(params, window, end), page=page)
+
+            remaining_pages = [(window, page) for window, first_page in windows
+                               for page in range(2, first_page['pagination']['total_pages'] + 1)]
+            page_results = executor.map(get_page, remaining_pages)
+
+            for window, first_page in windows:
+                collect_new(first_page.get(key, []))
+
+                for _ in range(2, first_page['pagination']['total_pages'] + 1):
+                    page_result = next(page_results)
+
+                    if isinstance(page_result, dict) and key in page_result:
+                        collect_new(page_result[key])
+
+        return results
+
+    def _get_page(self, url, params, page):
+        page_params = dict(params, page=page)
+
+        if self.http_cache is not None:
+            return self._get_validated(url, params=page_params)
+
+        return self._get_json(url, params=page_params)
+
+    def _get_validated(self, url, params=None):
+        r"""
+        Internal method for requesting a page of results through the conditional request cache. The validators of
+        the cached page are sent with the request and a :code:`304 Not Modified` response is answered from the
+        cache.
+
+        """
+        key = self.http_cache.key(url, params)
+        entry = self.http_cache.get(key)
+
+        r = self._get_result(url, params=params, headers=self.http_cache.conditional_headers(entry))
+
+        if r.status_code == 304 and entry is not None:
+            return self.http_cache.revalidated(key, entry, decoder=self.json_decoder)
+
+        return self.http_cache.update(key, entry, r.headers, r.content, decoder=self.json_decoder)
+
+    def _get_records(self, url, record_ids, key, max_workers=None):
+        r"""
+        Internal method for requesting animals or organizations by ID, concurrently if :code:`max_workers` is greater
+        than 1.
+
+        Parameters
+        ----------
+        url : str
+            The endpoint to request, with an :code:`{id}` placeholder for the ID.
+        record_ids : list or tuple
+            IDs to request.
+        key : {'animal', 'organization'}
+            Key of the record in the returned JSON.
+        max_workers : int, optional
+            Maximum number of IDs requested at once.
+
+        Returns
+        -------
+        list
+            The record, or the exception raised while requesting it, for each ID in the order of :code:`record_ids`.
+            IDs that appear more than once are only requested once and share the same result.
+
+        """
+        def get_record(record_id):
+            try:
+                return self._get_json(url.format(id=record_id))[key]
+            except (PetfinderError, requests.RequestException) as e:
+                return e
+
+        unique_ids = list(dict.fromkeys(record_ids))
+
+        if max_workers is not None and max_workers > 1 and len(unique_ids) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = dict(zip(unique_ids, executor.map(get_record, unique_ids)))
+        else:
+            results = {record_id: get_record(record_id) for record_id in unique_ids}
+
+        return [results[record_id] for record_id in record_ids]
+
+    def _get_org(self, url, org_id, spec=None):
+        try:
+            org = _project(self._get_json(url.format(id=org_id))['organization'], spec)
             org['response'] = 200
         except PetfinderResourceNotFound:
             org = {
@@ -777,66 +1733,141 @@ class Petfinder(object):
             }
         return org
 
-    import requests
+    def _get_json(self, url, params=None):
+        r"""
+        Internal method for requesting an endpoint of the Petfinder API and decoding the body of the response.
 
-    def _get_result(self, url, headers, params=None, max_retries=3):
-        def handle_response(r):
-            if r.status_code == 200:
-                return r
-            elif r.status_code == 400:
-                raise PetfinderInvalidParameters(
-                    message='There are invalid parameters in the API query.',
-                    err=r.json().get('invalid-params')
-                )
-            elif r.status_code == 401:
-                if r.json().get('detail') == 'Access token invalid or expired':
-                    self._access_token = self._authenticate()
-                    return self._get_result(url, headers, params)
-                else:
-                    raise PetfinderInvalidCredentials(
-                        message='Invalid Credentials',
-                        err=(r.reason, r.status_code)
-                    )
-            elif r.status_code == 403:
-                raise PetfinderInsufficientAccess(
-                    message='Insufficient Access',
-                    err=(r.reason, r.status_code)
-                )
-            elif r.status_code == 404:
-                raise PetfinderResourceNotFound(
-                    message='Requested Resource not Found',
-                    err=(r.reason, r.status_code)
-                )
-            elif r.status_code == 429:
-                raise PetfinderRateLimitExceeded(
-                    message='Daily Rate Limit Exceeded. Resets at 12:00am UTC',
-                    err=(r.reason, r.status_code)
-                )
-            elif r.status_code == 500:
-                return None
-            else:
+        """
+        return self._decode(self._get_result(url, params=params))
+
+    def _decode(self, response):
+        r"""
+        Internal method for decoding the JSON body of a response with the instance's :code:`json_decoder`. Every
+        response body is decoded through this method exactly once.
+
+        """
+        return self.json_decoder(response.content)
+
+    def _get_result(self, url, params=None, headers=None):
+        r"""
+        Internal method for requesting an endpoint of the Petfinder API. Identical requests made at the same time
+        share one request through the :code:`single_flight` layer and receive the same response.
+
+        """
+        if self.single_flight is None:
+            return self._request(url, params=params, headers=headers)
+
+        return self.single_flight.do(self.single_flight.key(url, params, headers),
+                                     lambda: self._request(url, params=params, headers=headers))
+
+    def _request(self, url, params=None, headers=None):
+        token_refreshed = False
+
+        while True:
+            if self._token_expiring():
+                self._refresh_token()
+
+            auth_headers = self._auth_headers
+            request_headers = dict(auth_headers, **headers) if headers else auth_headers
+
+            response = self._send('get', url, headers=request_headers, params=params)
+
+            if response.status_code == 200 or (response.status_code == 304 and headers):
+                return response
+            elif response.status_code == 401 and not token_refreshed and _token_expired(self._decode(response)):
+                self._refresh_token(stale_headers=auth_headers)
+                token_refreshed = True
+            elif self.retry_policy.retries(response.status_code) and response.status_code >= 500:
                 raise PetfinderUnexpectedError(
-                    message='The Petfinder API encountered an unexpected error.',
-                    err=(r.reason, r.status_code)
+                    message='The Petfinder API encountered an unexpected error after maximum retries.',
+                    err=(response.reason, response.status_code)
                 )
-        response = None
-        for attempt in range(1, max_retries + 1):
-            response = requests.get(url, headers=headers, params=params)
-            result = handle_response(response)
+            else:
+                if response.status_code == 429 and self.quota is not None:
+                    self.quota.exhaust()
 
-            if result:
-                return result
-            elif response.status_code == 500:
-                print(f'Attempt {attempt} of {max_retries} failed with status 500. Retrying...')
-                if attempt == max_retries:
-                    raise PetfinderUnexpectedError(
-                        message='The Petfinder API encountered an unexpected error after maximum retries.',
-                        err=(response.reason, response.status_code)
-                    )
+                _raise_for_status(response.status_code, response.reason, lambda: self._decode(response))
+
+    def _send(self, method, url, count=True, **kwargs):
+        r"""
+        Internal method for sending a request through the circuit breaker, the quota and the rate limiter, retrying
+        it as the :code:`retry_policy` allows if it fails with a retried status code or a connection error.
+
+        Parameters
+        ----------
+        method : {'get', 'post'}
+            HTTP method of the request.
+        url : str
+            URL of the request.
+        count : boolean, default True
+            If :code:`True`, each attempt is taken from the :code:`quota`.
+        **kwargs
+            Passed to the :code:`requests.Session` method.
+
+        Returns
+        -------
+        requests.Response
+            The first response that is not retried, or the last response once the retries are exhausted.
+
+        Raises
+        ------
+        PetfinderCircuitOpen
+            Raised without sending the request if the circuit breaker is open.
+        requests.ConnectionError, requests.Timeout
+            Raised if the last attempt fails with a connection error.
+
+        """
+        attempt = 0
+
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request()
+
+            if count and self.quota is not None:
+                self.quota.spend()
+
+            wait = self.rate_limiter.acquire()
+            started = time.perf_counter()
+
+            try:
+                response = getattr(self._session, method)(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._emit(method, url, kwargs, None, started, wait, attempt, error=e)
+                attempt += 1
+                self._record(failed=True)
+                delay = self.retry_policy.delay(attempt)
+
+                if delay is None:
+                    raise
             else:
-                break
+                self._emit(method, url, kwargs, response, started, wait, attempt)
+                failed = response.status_code >= 500
+                self._record(failed=failed)
+
+                if not self.retry_policy.retries(response.status_code):
+                    return response
+
+                attempt += 1
+                delay = self.retry_policy.delay(attempt, response.status_code, response.headers.get('Retry-After'))
+
+                if delay is None:
+                    return response
+
+            time.sleep(delay)
 
-        return response
+    def _record(self, failed):
+        if self.circuit_breaker is None:
+            return
+
+        if failed:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    def _emit(self, method, url, kwargs, response, started, wait, attempt, error=None):
+        if self.hooks:
+            call_hooks(self.hooks, _request_event(self._host, method, url, kwargs.get('params'), response, started,
+                                                  wait, attempt, error))
 
 
 #################################################################################################################
@@ -846,358 +1877,348 @@ class Petfinder(object):
 #################################################################################################################
 
 
-def _parameters(breed: AnimalFeatures = None,
-                size: AnimalFeatures = None,
-                gender: AnimalFeatures = None,
-                color: str = None,
-                coat: AnimalFeatures = None,
-                animal_type: str = None, 
-                location: int = None,
-                distance: int = None,
-                state: str = None,
-                country: str = None,
-                query: str = None,
-                sort: str = None,
-                name: str = None,
-                age: str = None,
-                good_with_children: bool = None,
-                good_with_dogs: bool = None,
-                good_with_cats: bool = None,
-                declawed: bool = None,
-                house_trained: bool = None,
-                special_needs: bool = None,
-                before_date: Date = None,
-                after_date: Date = None,
-                animal_id: PetfinderID = None,
-                organization_id: PetfinderID = None,
-                status: str = None,
-                results_per_page: int = None,
-                page: int = None):
+def _circuit_breaker(circuit_breaker):
     r"""
-    Internal function for determining which parameters have been passed and aligning them to their respective
-    Petfinder API parameters.
+    Internal function for resolving the :code:`circuit_breaker` parameter of :code:`Petfinder` and
+    :code:`AsyncPetfinder` into a :code:`CircuitBreaker` or :code:`None`.
+
+    """
+    if circuit_breaker is True:
+        return CircuitBreaker()
+    if circuit_breaker is None or circuit_breaker is False:
+        return None
+
+    return circuit_breaker
+
+
+def _hooks(hooks):
+    r"""
+    Internal function for resolving the :code:`hooks` parameter of :code:`Petfinder` and :code:`AsyncPetfinder` into a
+    list of callables.
+
+    """
+    if hooks is None:
+        return []
+    if callable(hooks):
+        return [hooks]
+
+    return list(hooks)
+
+
+def _request_event(host, method, url, params, response, started, wait, attempt, error=None):
+    r"""
+    Internal function for building the :code:`RequestEvent` of a request sent with :code:`requests` or
+    :code:`httpx`. :code:`started` is the :code:`time.perf_counter()` reading taken when the request was sent.
+
+    """
+    latency = time.perf_counter() - started
+    url = url.split('?', 1)[0]
+    endpoint = url[len(host):] if url.startswith(host) else url
+
+    return RequestEvent(method=method.upper(),
+                        url=url,
+                        endpoint=endpoint,
+                        params=dict(params or {}),
+                        status=response.status_code if response is not None else None,
+                        latency=latency,
+                        bytes=len(response.content) if response is not None else 0,
+                        attempt=attempt,
+                        rate_limit_wait=wait,
+                        token_refresh=endpoint == 'oauth2/token',
+                        error=error,
+                        started=time.time() - latency)
+
+
+def _create_session(pool_connections: int = 10,
+                    pool_maxsize: int = 10,
+                    pool_block: bool = False,
+                    keep_alive: bool = True,
+                    adapter: HTTPAdapter = None) -> requests.Session:
+    r"""
+    Internal function for creating the pooled :code:`requests.Session` shared by all requests of a
+    :code:`Petfinder` instance.
 
     Parameters
     ----------
-    breed: str, tuple or list of str, optional
-        String or tuple or list of strings of desired animal type breed to search.
-    size: {'small', 'medium', 'large', 'xlarge'}, str, tuple or list of str, optional
-        String or tuple or list of strings of desired animal sizes to return. The specified size(s) must be one
-        of 'small', 'medium', 'large', or 'xlarge'.
-    gender: {'male', 'female', 'unknown'} str, tuple or list of str, optional
-        String or tuple or list of strings representing animal genders to return. Must be of 'male', 'female',
-        or 'unknown'.
-    color : str, optional
-        String representing specified animal 'color' to search. Colors for each available animal type in the
-        Petfinder database can be found using the :code:`animal_types()` method.
-    coat : {'short', 'medium', 'long', 'wire', 'hairless', 'curly'}, str, tuple or list of str, optional
-        Desired coat(s) to return. Must be of 'short', 'medium', 'long', 'wire', 'hairless', or 'curly'.
-    animal_type : {'dog', 'cat', 'rabbit', 'small-furry', 'horse', 'bird', 'scales-fins-other', 'barnyard'}, str, optional
-        String representing desired animal type to search. Must be one of 'dog', 'cat', 'rabbit', 'small-furry',
-        'horse', 'bird', 'scales-fins-other', or 'barnyard'.
-    location : str, optional
-        Returns results by specified location. Must be in the format 'city, state' for city-level results,
-        'latitude, longitude' for lat-long results, or 'postal code'.
-    distance : int, optional
-        Returns results within the distance of the specified location. If not given, defaults to 100 miles.
-        Maximum distance range is 500 miles.
-    state : str, optional
-        Filters the results by the selected state. Must be a two-letter state code abbreviation of the state
-        name, such as 'WA' for Washington or 'NY' for New York.
-    country : {'US', 'CA'}, str, optional
-        Filters results to specified country. Must be a two-letter abbreviation of the country and is limited
-        to the United States and Canada.
-    query : str, optional
-        Search matching and partially matching name, city or state.
-    sort : {'recent', '-recent', 'distance', '-distance'}, str, optional
-            Sorts by specified attribute. Leading dashes represents a reverse-order sort. Must be one of 'recent',
-            '-recent', 'distance', or '-distance'.
-    name : str, optional
-        Name of animal or organization to search.
-    age : {'baby', 'young', 'adult', 'senior'} str, tuple or list of str, optional
-        String or tuple or list of strings specifying animal age(s) to return from search. Must be of 'baby',
-        'young', 'adult', 'senior'.
-    good_with_cats: bool, optional
-        Filters returned animal results to animals that are designated as good with cats. Must be a boolean value
-        (True, False) or a value that can be coerced to a boolean (1, 0).
-    good_with_children: bool, optional
-        Filters returned animal results to animals that are designated as good with children. Must be a boolean value
-        (True, False) or a value that can be coerced to a boolean (1, 0).
-    good_with_dogs: bool, optional
-        Filters returned animal results to animals that are designated as good with dogs. Must be a boolean value
-        (True, False) or a value that can be coerced to a boolean (1, 0).
-    before_date: str, datetime, optional
-        Returns results with a `published_at` datetime before the specified time. Must be a string in the form of
-        'YYYY-MM-DD' or 'YYYY-MM-DD H:M:S' or a datetime object.
-    after_date: str, datetime, optional
-        Returns results with a `published_at` datetime after the specified time. Must be a string in the form of
-        'YYYY-MM-DD' or 'YYYY-MM-DD H:M:S' or a datetime object.
-    animal_id : int, tuple or list of int, optional
-        Integer or list or tuple of integers representing animal IDs obtained from Petfinder.
-    organization_id : str, tuple or list of str, optional
-        Returns animals associated with given :code:`organization_id`. Can be a str or a tuple or list of str
-        representing multiple organizations.
-    status : {'adoptable', 'adopted', 'found'} str, optional
-        Animal status to filter search results. Must be one of 'adoptable', 'adopted', or 'found'.
-    results_per_page : int, default 20
-        Number of results to return per page. Defaults to 20 results and cannot exceed 100 results per page.
-    page : int, default 1
-        Specifies which page of results to return. Defaults to the first page of results. If set to :code:`None`,
-        all results will be returned.
+    pool_connections : int, default 10
+        Number of connection pools to cache.
+    pool_maxsize : int, default 10
+        Maximum number of connections to keep open to a single host.
+    pool_block : boolean, default False
+        Whether the connection pool should block for a free connection when it is exhausted.
+    keep_alive : boolean, default True
+        Whether connections are kept alive and reused between requests.
+    adapter : HTTPAdapter, optional
+        Adapter to mount instead of a pooled :code:`HTTPAdapter`, such as a :code:`RecordTransport` or
+        :code:`ReplayTransport`. The pool parameters are ignored if given.
+
+    Returns
+    -------
+    requests.Session
+        Session with an :code:`HTTPAdapter` mounted for both http and https connections.
+
+    """
+    session = requests.Session()
+
+    if adapter is None:
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              pool_block=pool_block)
+
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+
+    return session
+
+
+def _lookup_report(record_ids, results, key, return_df=False):
+    r"""
+    Internal function for splitting the results of requesting animals or organizations by ID into the found records,
+    the IDs that were not found and the IDs whose request failed.
+
+    Parameters
+    ----------
+    record_ids : list or tuple
+        The requested IDs.
+    results : list
+        The record, or the exception raised while requesting it, for each ID as returned by :code:`_get_records`.
+    key : {'animals', 'organizations'}
+        Key to store the found records under.
+    return_df : boolean, default False
+        If :code:`True`, the found records are coerced into a pandas DataFrame.
 
     Returns
     -------
     dict
-        Dictionary representing aligned parameters and headers for ingestion into the Petfinder API.
+        Dictionary with the found records under :code:`key`, and the :code:`missing` and :code:`failed` IDs.
 
     """
-    if isinstance(age, (list, tuple)):
-        age = ','.join(age).replace(' ', '')
-    if isinstance(gender, (list, tuple)):
-        gender = ','.join(gender).replace(' ', '')
-    if isinstance(status, (list, tuple)):
-        status = ','.join(status).replace(' ', '')
-    if isinstance(animal_type, (list, tuple)):
-        animal_type = ','.join(animal_type).replace(' ', '')
-    if isinstance(size, (list, tuple)):
-        size = ','.join(size).replace(' ', '')
-    if isinstance(coat, (list, tuple)):
-        coat = ','.join(coat).replace(' ', '')
-
-    if good_with_cats is not None:
-        good_with_cats = int(good_with_cats)
-    if good_with_children is not None:
-        good_with_children = int(good_with_children)
-    if good_with_dogs is not None:
-        good_with_dogs = int(good_with_dogs)
-    if declawed is not None:
-        declawed = int(declawed)
-    if house_trained is not None:
-        house_trained = int(house_trained)
-    if special_needs is not None:
-        special_needs = int(special_needs)
-
-    _check_parameters(
-        animal_types=animal_type,
-        size=size,
-        gender=gender,
-        age=age,
-        coat=coat,
-        status=status,
-        distance=distance,
-        sort=sort,
-        limit=results_per_page,
-        good_with_cats=good_with_cats,
-        good_with_children=good_with_children,
-        good_with_dogs=good_with_dogs,
-        declawed=declawed,
-        house_trained=house_trained,
-        special_needs=special_needs
-    )
-
-    args = {
-        'breed': breed,
-        'size': size,
-        'gender': gender,
-        'age': age,
-        'color': color,
-        'coat': coat,
-        'animal_type': animal_type,
-        'location': location,
-        'distance': distance,
-        'state': state,
-        'country': country,
-        'query': query,
-        'sort': sort,
-        'name': name,
-        'animal_id': animal_id,
-        'organization': organization_id,
-        'good_with_cats': good_with_cats,
-        'good_with_children': good_with_children,
-        'good_with_dogs': good_with_dogs,
-        'house_trained': house_trained,
-        'special_needs': special_needs,
-        'declawed': declawed,
-        'before': before_date,
-        'after': after_date,
-        'status': status,
-        'limit': results_per_page,
-        'page': page
+    found, missing, failed = [], [], []
+
+    for record_id, result in zip(record_ids, results):
+        if isinstance(result, PetfinderResourceNotFound):
+            missing.append(record_id)
+        elif isinstance(result, Exception):
+            err = getattr(result, 'err', None)
+            failed.append({
+                'id': record_id,
+                'error': type(result).__name__,
+                'message': getattr(result, 'message', str(result)),
+                'status': err[1] if isinstance(err, tuple) else None
+            })
+        else:
+            found.append(result)
+
+    if return_df:
+        import pandas as pd
+
+        found = _coerce_to_dataframe({key: found}) if found else pd.DataFrame()
+
+    return {
+        key: found,
+        'missing': missing,
+        'failed': failed
     }
 
-    args = {key: val for key, val in args.items() if val is not None}
-
-    return args
-
-
-def _check_parameters(
-        animal_types: str = None,
-        size: AnimalFeatures = None,
-        gender: AnimalFeatures = None,
-        age: AnimalFeatures = None,
-        coat: AnimalFeatures = None,
-        status: str = None,
-        distance: int = None,
-        good_with_children: bool = None,
-        good_with_dogs: bool = None,
-        good_with_cats: bool = None,
-        declawed: bool = None,
-        house_trained: bool = None,
-        special_needs: bool = None,
-        sort: str = None,
-        limit: int = None):
+
+def _token_expired(content: dict) -> bool:
     r"""
-    Internal function for checking the passed parameters against valid options available in the Petfinder API.
+    Internal function for checking if a 401 response from the Petfinder API was caused by an expired access token
+    rather than invalid credentials.
+
+    """
+    return content.get('detail') == 'Access token invalid or expired'
+
+
+def _raise_for_status(status_code: int, reason: str, json):
+    r"""
+    Internal function for raising the :code:`petpy` exception matching an unsuccessful Petfinder API response.
 
     Parameters
     ----------
-    animal_type : {'dog', 'cat', 'rabbit', 'small-furry', 'horse', 'bird', 'scales-fins-other', 'barnyard'}, str, optional
-        String representing desired animal type to search. Must be one of 'dog', 'cat', 'rabbit', 'small-furry',
-        'horse', 'bird', 'scales-fins-other', or 'barnyard'.
-    size: {'small', 'medium', 'large', 'xlarge'}, str, tuple or list of str, optional
-        String or tuple or list of strings of desired animal sizes to return. The specified size(s) must be one
-        of 'small', 'medium', 'large', or 'xlarge'.
-    gender: {'male', 'female', 'unknown'} str, tuple or list of str, optional
-        String or tuple or list of strings representing animal genders to return. Must be of 'male', 'female',
-        or 'unknown'.
-    age : {'baby', 'young', 'adult', 'senior'} str, tuple or list of str, optional
-        String or tuple or list of strings specifying animal age(s) to return from search. Must be of 'baby',
-        'young', 'adult', 'senior'.
-    coat : {'short', 'medium', 'long', 'wire', 'hairless', 'curly'}, str, tuple or list of str, optional
-        Desired coat(s) to return. Must be of 'short', 'medium', 'long', 'wire', 'hairless', or 'curly'.
-    status : {'adoptable', 'adopted', 'found'} str, optional
-        Animal status to filter search results. Must be one of 'adoptable', 'adopted', or 'found'.
-    distance : int, optional
-        Returns results within the distance of the specified location. If not given, defaults to 100 miles.
-        Maximum distance range is 500 miles.
-    sort : {'recent', '-recent', 'distance', '-distance'}, str, optional
-            Sorts by specified attribute. Leading dashes represents a reverse-order sort. Must be one of 'recent',
-            '-recent', 'distance', or '-distance'.
-    limit : int, default 20
-        Number of results to return per page. Defaults to 20 results and cannot exceed 100 results per page.
+    status_code : int
+        Status code of the response.
+    reason : str
+        Reason phrase of the response.
+    json : callable
+        Function returning the decoded JSON body of the response. Only called when the body is needed to build the
+        exception.
+
+    Raises
+    ------
+    PetfinderInvalidParameters
+        Raised on a 400 response.
+    PetfinderInvalidCredentials
+        Raised on a 401 response.
+    PetfinderInsufficientAccess
+        Raised on a 403 response.
+    PetfinderResourceNotFound
+        Raised on a 404 response.
+    PetfinderRateLimitExceeded
+        Raised on a 429 response.
+    PetfinderUnexpectedError
+        Raised on any other status code.
+
+    """
+    if status_code == 400:
+        raise PetfinderInvalidParameters(
+            message='There are invalid parameters in the API query.',
+            err=json().get('invalid-params')
+        )
+    elif status_code == 401:
+        raise PetfinderInvalidCredentials(
+            message='Invalid Credentials',
+            err=(reason, status_code)
+        )
+    elif status_code == 403:
+        raise PetfinderInsufficientAccess(
+            message='Insufficient Access',
+            err=(reason, status_code)
+        )
+    elif status_code == 404:
+        raise PetfinderResourceNotFound(
+            message='Requested Resource not Found',
+            err=(reason, status_code)
+        )
+    elif status_code == 429:
+        raise PetfinderRateLimitExceeded(
+            message='Daily Rate Limit Exceeded. Resets at 12:00am UTC',
+            err=(reason, status_code)
+        )
+    else:
+        raise PetfinderUnexpectedError(
+            message='The Petfinder API encountered an unexpected error.',
+            err=(reason, status_code)
+        )
+
+
+def _check_animal_types(types: AnimalTypes = None):
+    r"""
+    Internal function for checking the animal types passed to the :code:`animal_types` and :code:`breeds` methods.
+
+    Parameters
+    ----------
+    types : str, list or tuple, optional
+        Animal type or types to check. Must be of 'dog', 'cat', 'rabbit', 'small-furry', 'horse', 'bird',
+        'scales-fins-other', 'barnyard'.
 
     Raises
     ------
     ValueError
+        Raised when the :code:`types` parameter receives an invalid animal type.
 
-    Returns
-    -------
-    None
-        If :code:`ValueError` is not raised, the function returns :code:`None` which signifies the passed API
-        parameters are valid.
+    """
+    if types is not None:
+        type_check = types
+        if isinstance(types, str):
+            type_check = [types]
+        diff = set(type_check).difference(('dog', 'cat', 'rabbit', 'small-furry', 'horse', 'bird',
+                                           'scales-fins-other', 'barnyard'))
+        if len(diff) > 0:
+            raise ValueError("animal types must be of the following 'dog', 'cat', 'rabbit', "
+                             "'small-furry', 'horse', 'bird', 'scales-fins-other', 'barnyard'")
+
+
+def _window_params(params, window, end=None):
+    r"""
+    Internal function for adding the :code:`after` and :code:`before` dates of a publish date window to the
+    parameters of a search. Both dates are exclusive, so the :code:`before` of a window that ends before :code:`end`,
+    the end of the whole search, is moved one second later to include the animals published at its end, which the
+    next window's :code:`after` excludes.
 
     """
-    _animal_types = ('dog', 'cat', 'rabbit', 'small-furry',
-                     'horse', 'bird', 'scales-fins-other', 'barnyard')
-    _sizes = ('small', 'medium', 'large', 'xlarge')
-    _genders = ('male', 'female', 'unknown')
-    _ages = ('baby', 'young', 'adult', 'senior')
-    _coats = ('short', 'medium', 'long', 'wire', 'hairless', 'curly')
-    _status = ('adoptable', 'adopted', 'found')
-    _sort = ('recent', '-recent', 'distance', '-distance')
-
-    incorrect_values = {}
-
-    if animal_types is not None and animal_types not in _animal_types:
-        incorrect_values['animal_types'] = "animal types {types} is not valid. Animal types " \
-                                           "must of the following: {animal_types}"\
-            .format(types=animal_types,
-                    animal_types=_animal_types)
-
-    if size is not None:
-        size_list = size.split(',')
-        diff = list(set(size_list).difference(_sizes))
+    after, before = window
+    params = dict(params)
 
-        if len(diff) > 0:
-            incorrect_values['size'] = "sizes {sizes} are not valid. Sizes must be of the following: {size_list}"\
-                .format(sizes=diff,
-                        size_list=_sizes)
+    if after is not None:
+        params['after'] = datetime.datetime.fromtimestamp(after, datetime.timezone.utc).isoformat()
 
-    if gender is not None:
-        gender_list = gender.split(',')
-        diff = list(set(gender_list).difference(_genders))
+    if before is not None:
+        if end is None or before < end:
+            before += 1
 
-        if len(diff) > 0:
-            incorrect_values['gender'] = "genders {genders} are not valid. Genders must be of the following: " \
-                                         "{gender_list}"\
-                .format(genders=diff,
-                        gender_list=_genders)
+        params['before'] = datetime.datetime.fromtimestamp(before, datetime.timezone.utc).isoformat()
 
-    if age is not None:
-        age_list = age.split(',')
-        diff = list(set(age_list).difference(_ages))
+    return params
 
-        if len(diff) > 0:
-            incorrect_values['age'] = "ages {age} are not valid. Ages must be of the following: " \
-                                      "{ages_list}" \
-                .format(age=diff,
-                        ages_list=_ages)
 
-    if coat is not None:
-        coat_list = coat.split(',')
-        diff = list(set(coat_list).difference(_coats))
+def _format_breeds(result, types, return_df=False, raw_results=False):
+    r"""
+    Internal function for shaping the results of the Petfinder API :code:`breeds` endpoint.
 
-        if len(diff) > 0:
-            incorrect_values['coat'] = "coats {coats} are not valid. Coats must be of the following: " \
-                                       "{coat_list}"\
-                .format(coats=diff,
-                        coat_list=_coats)
+    Parameters
+    ----------
+    result : dict
+        Breeds returned from the Petfinder API. If :code:`types` is a list or tuple, the breeds of each type are
+        stored under the key :code:`breeds` as a list of dictionaries keyed by the animal type.
+    types : str, list or tuple
+        The animal type or types that were requested.
+    return_df : boolean, default False
+        If :code:`True`, the result set is coerced into a pandas :code:`DataFrame`.
+    raw_results : boolean, default False
+        If :code:`True`, the entire result set returned from the Petfinder API is returned.
 
-    if status is not None:
-        status_list = status.split(',')
-        diff = list(set(status_list).difference(_status))
+    Returns
+    -------
+    dict or pandas DataFrame
+        Breeds of the requested animal types.
 
-        if len(diff) > 0:
-            incorrect_values['status'] = "status {status} are not valid. Coats must be of the following: " \
-                                       "{status_list}" \
-                .format(status=diff,
-                        status_list=_coats)
+    """
+    if return_df:
+        import pandas as pd
+        from pandas import json_normalize
+
+        raw_results = True
+        df_results = []
+        if isinstance(types, (tuple, list)):
+            for t in range(0, len(types)):
+                df_results.append(json_normalize(result['breeds'][t][types[t]]['breeds']))
+        else:
+            df_results.append(json_normalize(result['breeds']))
+        df_results = pd.concat(df_results)
+        df_results.rename(columns={'_links.type.href': 'breed'}, inplace=True)
+        df_results['breed'] = df_results['breed'].str.replace('/v2/types/', '').str.capitalize()
 
-    if sort is not None and sort not in _sort:
-        incorrect_values['sort'] = "sort order {sort} must be one of: {sort_list}"\
-            .format(sort=sort,
-                    sort_list=_sort)
+        result = df_results
 
-    if distance is not None:
-        if not 0 <= int(distance) <= 500:
-            incorrect_values['distance'] = "distance cannot be greater than 500 or less than 0."
+    if not raw_results:
+        json_result = {
+            'breeds': {
 
-    if good_with_dogs is not None:
-        if not isinstance(good_with_dogs, (bool, int)):
-            incorrect_values['good_with_dogs'] = 'good_with_dogs must be a boolean (True, False, 1, or 0).'
+            }
+        }
 
-    if good_with_cats is not None:
-        if not isinstance(good_with_cats, (bool, int)):
-            incorrect_values['good_with_cats'] = 'good_with_dogs must be a boolean (True, False, 1, or 0).'
+        if isinstance(types, (tuple, list)):
+            for t in range(0, len(types)):
+                json_result['breeds'][types[t]] = []
 
-    if good_with_children is not None:
-        if not isinstance(good_with_children, (bool, int)):
-            incorrect_values['good_with_children'] = 'good_with_dogs must be a boolean (True, False, 1, or 0).'
+                for breed in result['breeds'][t][types[t]]['breeds']:
+                    json_result['breeds'][types[t]].append(breed['name'])
 
-    if declawed is not None:
-        if not isinstance(declawed, (bool, int)):
-            incorrect_values['declawed'] = 'declawed must be a boolean (True, False, 1, or 0).'
+        else:
+            json_result['breeds'][types] = []
 
-    if house_trained is not None:
-        if not isinstance(house_trained, (bool, int)):
-            incorrect_values['house_trained'] = 'house_trained must be a boolean (True, False, 1, or 0).'
+            for breed in result['breeds']:
+                json_result['breeds'][types].append(breed['name'])
 
-    if special_needs is not None:
-        if not isinstance(special_needs, (bool, int)):
-            incorrect_values['special_needs'] = 'house_trained must be a boolean (True, False, 1, or 0).'
+        result = json_result
 
-    if limit is not None:
-        if int(limit) > 100:
-            incorrect_values['limit'] = "results per page cannot be greater than 100"
+    return result
 
-    if len(incorrect_values) > 0:
-        errors = ''
-        for k, v in incorrect_values.items():
-            errors = errors + v + '\n'
 
-        raise ValueError(errors)
+def _project(record, spec):
+    r"""
+    Internal function for keeping only the fields in :code:`spec` of a record. The record is returned unchanged if
+    :code:`spec` is :code:`None`.
 
-    return None
+    """
+    if spec is None:
+        return record
+
+    return project_record(record, spec)
 
 
 def _coerce_to_dataframe(results):
@@ -1216,22 +2237,5 @@ def _coerce_to_dataframe(results):
 
     """
     key = list(results.keys())[0]
-    results_df = json_normalize(results[key])
-
-    if key == 'animals':
-        results_df['_links.organization.href'] = results_df['_links.organization.href']\
-            .str.replace('/v2/organizations/', '')
-        results_df['_links.self.href'] = results_df['_links.self.href'].str.replace('/v2/animals/', '')
-        results_df['_links.type.href'] = results_df['_links.type.href'].str.replace('/v2/types/', '')
-
-        results_df.rename(columns={'_links.organization.href': 'organization_id',
-                                   '_links.self.href': 'animal_id',
-                                   '_links.type.href': 'animal_type'}, inplace=True)
-
-    if key == 'organizations':
-        del results_df['_links.animals.href']
-        results_df['_links.self.href'] = results_df['_links.self.href'].str.replace('/v2/organizations/', '')
-
-        results_df.rename(columns={'_links.self.href': 'organization_id'}, inplace=True)
 
-    return results_df
+    return flatten_records(key, results[key])
@@ -0,0 +1,700 @@
+# encoding=utf-8
+
+r"""
+
+The :code:`async_api.py` file stores the :code:`AsyncPetfinder` class, an asyncio-native counterpart to the
+:code:`Petfinder` class with its search and reference data methods. :code:`AsyncPetfinder` requires the
+`httpx <https://www.python-httpx.org/>`_ library, which can be installed with :code:`pip install petpy[async]`.
+
+"""
+
+
+import asyncio
+import json
+import time
+from typing import Union
+from urllib.parse import urlencode, urljoin
+
+from petpy.api import (
+    _check_animal_types,
+    _circuit_breaker,
+    _coerce_to_dataframe,
+    _format_breeds,
+    _hooks,
+    _project,
+    _raise_for_status,
+    _request_event,
+    _token_expired
+)
+from petpy.cache import SingleFlight, TTLCache
+from petpy.flatten import RecordFlattener, compile_fields, project_record
+from petpy.hooks import call_hooks
+from petpy.limiter import TokenBucket
+from petpy.parameters import format_dates, search_parameters
+from petpy.quota import QuotaBudget
+from petpy.records import RECORD_TYPES
+from petpy.retry import CircuitBreaker, RetryPolicy
+from petpy.petpy_types import (
+    AnimalTypes,
+    AnimalFeatures,
+    Animals,
+    Date,
+    Fields,
+    PetfinderID
+)
+from petpy.exceptions import (
+    PetfinderInvalidCredentials,
+    PetfinderResourceNotFound,
+    PetfinderUnexpectedError
+)
+
+
+class AsyncPetfinder(object):
+    r"""
+    Asyncio-native wrapper class for the PetFinder API.
+
+    All requests of an :code:`AsyncPetfinder` instance share a single pooled :code:`httpx.AsyncClient`. Requests
+    for multiple animal types, IDs or pages of results are sent concurrently, with the number of requests in flight
+    bounded by :code:`max_concurrency` and the request rate bounded by :code:`rate_limit`. The access token is
+    requested on the first call and refreshed shortly before it expires, with concurrent requests waiting on a
+    single refresh.
+
+    :code:`animal_types()`, :code:`breeds()`, :code:`animals()` and :code:`organizations()` take the parameters of
+    their :code:`Petfinder` counterparts, except for :code:`max_workers`, as concurrency is bounded by
+    :code:`max_concurrency` instead, and :code:`sink`, as sinks write to files and databases synchronously. The
+    :code:`http_cache_path` and :code:`transport` options of :code:`Petfinder` are not available either, as the
+    conditional request cache reads and writes pages on disk and transports are :code:`requests` adapters. The
+    :code:`lookup_animals()`, :code:`iter_animals()`, :code:`iter_organizations()`, :code:`sync_animals()`,
+    :code:`crawl_animals()` and :code:`estimate()` methods are only provided by :code:`Petfinder`.
+
+    Attributes
+    ----------
+    key : str
+        The key from the Petfinder API passed when the :code:`AsyncPetfinder` class is initialized.
+    secret : str
+        The secret key obtained from the Petfinder API passed when the :code:`AsyncPetfinder` class is initialized.
+    rate_limiter : TokenBucket
+        Token bucket that every HTTP request sent by the instance waits on.
+    reference_cache : TTLCache
+        Cache of the reference data returned by :code:`animal_types()` and :code:`breeds()`.
+    single_flight : SingleFlight
+        Single-flight layer shared by identical concurrent requests, with :code:`hits` and :code:`misses` counters.
+        :code:`None` if :code:`single_flight=False`.
+    quota : QuotaBudget
+        Daily request budget every request is taken from. :code:`None` unless :code:`quota` is given.
+    retry_policy : RetryPolicy
+        Policy deciding when and after how long failed requests are retried.
+    circuit_breaker : CircuitBreaker
+        Circuit breaker that fails requests fast while the Petfinder API is failing. :code:`None` unless
+        :code:`circuit_breaker` is given.
+    hooks : list
+        Callables called with a :code:`RequestEvent` for every HTTP request sent.
+
+    Methods
+    -------
+    animal_types(types=None, use_cache=True)
+        Returns data on an animal type, or types, available from the Petfinder API.
+    breeds(types=None, return_df=False, raw_results=False, use_cache=True)
+        Returns available breeds of specified animal type(s) from the Petfinder API.
+    animals(animal_id=None, animal_type=None, breed=None, size=None, gender=None, age=None, color=None,
+            coat=None, status=None, name=None, organization_id=None, location=None, distance=None, ...,
+            before_date=None, after_date=None, sort=None, pages=1, results_per_page=20, return_df=False,
+            fields=None, typed_records=False)
+        Finds adoptable animals based on given criteria.
+    organizations(organization_id=None, name=None, location=None, distance=None, state=None, country=None,
+                  query=None, sort=None, results_per_page=20, pages=1, return_df=False, fields=None,
+                  typed_records=False)
+        Finds animal organizations based on specified criteria in the Petfinder API database.
+    aclose()
+        Closes the connection pool used for all requests to the Petfinder API and writes the counts of the quota
+        to disk.
+
+    Examples
+    --------
+    >>> async with AsyncPetfinder(key=key, secret=secret) as pf:
+    >>>     cats = await pf.animals(animal_type='cat', pages=None)
+
+    """
+    def __init__(self, key: str, secret: str,
+                 max_connections: int = 10,
+                 max_keepalive_connections: int = 10,
+                 max_concurrency: int = 10,
+                 rate_limit: float = 50,
+                 rate_limit_burst: int = None,
+                 token_refresh_margin: float = 60,
+                 cache_ttl: float = 86400,
+                 cache_path: str = None,
+                 json_decoder=None,
+                 single_flight: bool = True,
+                 quota: QuotaBudget = None,
+                 retry_policy: RetryPolicy = None,
+                 circuit_breaker: Union[CircuitBreaker, bool] = None,
+                 hooks=None,
+                 host: str = 'https://api.petfinder.com/v2/'):
+        r"""
+        Initialization method of the :code:`AsyncPetfinder` class.
+
+        Parameters
+        ----------
+        key : str
+            API key given after `registering on the PetFinder site <https://www.petfinder.com/developers/api-key>`_
+        secret : str
+            Secret API key given in addition to general API key.
+        max_connections : int, default 10
+            Maximum number of concurrent connections to the Petfinder API.
+        max_keepalive_connections : int, default 10
+            Maximum number of idle connections kept alive in the pool.
+        max_concurrency : int, default 10
+            Maximum number of requests in flight at once.
+        rate_limit : float, default 50
+            Maximum number of requests per second sent to the Petfinder API, shared by all requests of the instance.
+        rate_limit_burst : int, optional
+            Maximum number of requests that can be sent at once before the :code:`rate_limit` applies. Defaults to
+            :code:`rate_limit`.
+        token_refresh_margin : float, default 60
+            Number of seconds before the access token expires at which it is refreshed.
+        cache_ttl : float, default 86400
+            Number of seconds the reference data returned by :code:`animal_types()` and :code:`breeds()` is cached
+            for. If :code:`None` or 0, the reference data is not cached.
+        cache_path : str, optional
+            Path of a JSON file the reference data cache is persisted to.
+        json_decoder : callable, optional
+            Function used to decode the JSON body of every response, called with the body as :code:`bytes`. Defaults
+            to :code:`json.loads`.
+        single_flight : boolean, default True
+            If :code:`True`, identical requests awaited at the same time share one request to the Petfinder API, and
+            each caller decodes the shared response separately.
+        quota : QuotaBudget, optional
+            A :code:`QuotaBudget` from :code:`petpy.quota` that every request to a Petfinder API endpoint is taken
+            from before it is sent. See :code:`Petfinder`.
+        retry_policy : RetryPolicy, optional
+            A :code:`RetryPolicy` from :code:`petpy.retry` deciding how requests that fail with a server error or a
+            connection error are retried. See :code:`Petfinder`.
+        circuit_breaker : CircuitBreaker or boolean, optional
+            A :code:`CircuitBreaker` from :code:`petpy.retry` that fails requests fast while the Petfinder API is
+            failing. See :code:`Petfinder`.
+        hooks : callable or list of callables, optional
+            Called with a :code:`RequestEvent` from :code:`petpy.hooks` after every HTTP request sent to the
+            Petfinder API. Hooks are called on the event loop and should not block. See :code:`Petfinder`.
+        host : str, default 'https://api.petfinder.com/v2/'
+            Base URL of the Petfinder API. See :code:`Petfinder`.
+
+        Raises
+        ------
+        ImportError
+            Raised if the :code:`httpx` library is not installed.
+
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError('AsyncPetfinder requires the httpx library. '
+                              'It can be installed with pip install petpy[async]')
+
+        self.key = key
+        self.secret = secret
+        self._host = host.rstrip('/') + '/'
+        self._client = httpx.AsyncClient(limits=httpx.Limits(max_connections=max_connections,
+                                                             max_keepalive_connections=max_keepalive_connections))
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.rate_limiter = TokenBucket(rate=rate_limit, capacity=rate_limit_burst)
+        self.reference_cache = TTLCache(ttl=cache_ttl, path=cache_path) if cache_ttl else None
+        self.json_decoder = json_decoder or json.loads
+        self.single_flight = SingleFlight() if single_flight else None
+        self.quota = quota
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = _circuit_breaker(circuit_breaker)
+        self.hooks = _hooks(hooks)
+        self._transport_errors = (httpx.TransportError,)
+        self._token_refresh_margin = token_refresh_margin
+        self._token_lock = asyncio.Lock()
+        self._token_expires_at = None
+        self._token = None
+        self._auth_headers = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        r"""
+        Closes the connection pool used for all requests to the Petfinder API, and writes the counts of the
+        :code:`quota` to disk.
+
+        """
+        await self._client.aclose()
+
+        if self.quota is not None:
+            self.quota.flush()
+
+    @property
+    def rate_limit_wait(self) -> float:
+        r"""
+        Number of seconds a request sent now would wait on the rate limiter.
+
+        """
+        return self.rate_limiter.wait_time
+
+    @property
+    def _access_token(self) -> str:
+        return self._token
+
+    @_access_token.setter
+    def _access_token(self, token: str):
+        self._token = token
+        self._auth_headers = {'Authorization': 'Bearer ' + token}
+
+    async def _authenticate(self) -> str:
+        r"""
+        Internal coroutine for authenticating users to the Petfinder API.
+
+        Raises
+        ------
+        PetfinderInvalidCredentials
+            Raised if the supplied secret key and secret access key are invalid.
+
+        Returns
+        -------
+        str
+            Access token granted by the Petfinder API.
+
+        """
+        url = urljoin(self._host, 'oauth2/token')
+
+        data = {
+            'grant_type': 'client_credentials',
+            'client_id': self.key,
+            'client_secret': self.secret
+        }
+
+        r = await self._send('post', url, count=False, data=data)
+
+        if r.status_code == 401:
+            raise PetfinderInvalidCredentials(
+                message="Client authentication failed.",
+                err=("Invalid credentials", 401)
+            )
+        elif self.retry_policy.retries(r.status_code) and r.status_code != 429:
+            raise PetfinderUnexpectedError(message="Couldn't authenticate after maximum retries.",
+                                           err=(r.reason_phrase, r.status_code))
+        elif r.status_code != 200:
+            _raise_for_status(r.status_code, r.reason_phrase, lambda: self.json_decoder(r.content))
+
+        token = self.json_decoder(r.content)
+        self._token_expires_at = time.monotonic() + token.get('expires_in', 3600)
+
+        return token['access_token']
+
+    async def _refresh_token(self, stale_headers: dict = None):
+        r"""
+        Internal coroutine for requesting a new access token when there is none yet, when it is about to expire, or
+        after it has been rejected. Concurrent callers wait on the same lock and check again once they acquire it,
+        so only one of them authenticates again.
+
+        """
+        async with self._token_lock:
+            if stale_headers is not None:
+                if self._auth_headers is not stale_headers:
+                    return
+            elif not self._token_expiring():
+                return
+
+            self._access_token = await self._authenticate()
+
+    def _token_expiring(self) -> bool:
+        return self._token_expires_at is None or \
+            time.monotonic() >= self._token_expires_at - self._token_refresh_margin
+
+    async def animal_types(self, types: AnimalTypes = None, use_cache: bool = True) -> dict:
+        r"""
+        Returns data on an animal type, or types available from the Petfinder API.
+
+        See Also
+        --------
+        Petfinder.animal_types
+
+        """
+        _check_animal_types(types)
+
+        if types is None:
+            result = await self._get_reference(urljoin(self._host, 'types'), use_cache=use_cache)
+
+        elif isinstance(types, str):
+            result = await self._get_reference(urljoin(self._host, 'types/{type}'.format(type=types)),
+                                               use_cache=use_cache)
+
+        elif isinstance(types, (tuple, list)):
+            results = await asyncio.gather(*(self._get_reference(urljoin(self._host, 'types/{type}'.format(type=t)),
+                                                                 use_cache=use_cache)
+                                             for t in types))
+
+            result = {'types': [r['type'] for r in results]}
+
+        else:
+            raise TypeError('types parameter must be either None, str, list or tuple')
+
+        return result
+
+    async def breeds(self, types: AnimalTypes = None,
+                     return_df: bool = False, raw_results: bool = False, use_cache: bool = True) -> dict:
+        r"""
+        Returns breed names of specified animal type, or types.
+
+        See Also
+        --------
+        Petfinder.breeds
+
+        """
+        _check_animal_types(types)
+
+        if types is None or isinstance(types, (list, tuple)):
+            if types is None:
+                types = ('dog', 'cat', 'rabbit', 'small-furry',
+                         'horse', 'bird', 'scales-fins-other', 'barnyard')
+
+            results = await asyncio.gather(
+                *(self._get_reference(urljoin(self._host, 'types/{type}/breeds'.format(type=t)), use_cache=use_cache)
+                  for t in types)
+            )
+
+            result = {'breeds': [{t: r} for t, r in zip(types, results)]}
+
+        elif isinstance(types, str):
+            result = await self._get_reference(urljoin(self._host, 'types/{type}/breeds'.format(type=types)),
+                                               use_cache=use_cache)
+
+        else:
+            raise TypeError('types parameter must be either None, str, list or tuple')
+
+        return _format_breeds(result, types=types, return_df=return_df, raw_results=raw_results)
+
+    async def animals(self, animal_id: PetfinderID = None,
+                      animal_type: str = None,
+                      breed: AnimalFeatures = None,
+                      size: AnimalFeatures = None,
+                      gender: AnimalFeatures = None,
+                      age: AnimalFeatures = None,
+                      color: str = None,
+                      coat: AnimalFeatures = None,
+                      status: str = None,
+                      name: str = None,
+                      organization_id: AnimalFeatures = None,
+                      location: str = None,
+                      distance: int = None,
+                      good_with_children: bool = None,
+                      good_with_dogs: bool = None,
+                      good_with_cats: bool = None,
+                      house_trained: bool = None,
+                      declawed: bool = None,
+                      special_needs: bool = None,
+                      before_date: Date = None,
+                      after_date: Date = None,
+                      sort: str = None,
+                      pages: int = 1,
+                      results_per_page: int = 20,
+                      return_df: bool = False,
+                      fields: Fields = None,
+                      typed_records: bool = False) -> Animals:
+        r"""
+        Returns adoptable animal data from Petfinder based on specified criteria. Multiple animal IDs and the pages
+        after the first page of search results are requested concurrently. With :code:`typed_records=True`, the
+        animals of a search are returned as compact :code:`petpy.records.Animal` objects.
+
+        See Also
+        --------
+        Petfinder.animals
+
+        """
+        before_date, after_date = format_dates(before_date, after_date)
+        spec = compile_fields(fields) if fields is not None else None
+
+        if typed_records and (animal_id is not None or return_df):
+            raise ValueError('typed_records can only be used with searches, and not with return_df.')
+
+        if animal_id is not None:
+            url = urljoin(self._host, 'animals/{id}')
+            if isinstance(animal_id, (tuple, list)):
+                animals = list(await asyncio.gather(*(self._get_record(url, record_id=ani_id, key='animal',
+                                                                       spec=spec)
+                                                      for ani_id in animal_id)))
+            else:
+                animals = await self._get_record(url, record_id=animal_id, key='animal', spec=spec)
+
+        else:
+            url = urljoin(self._host, 'animals/')
+
+            if animal_type:  # Petfinder API does not return correct results for animal_type otherwise
+                url += '?type={}'.format(animal_type)
+
+            params = search_parameters(animal_type=animal_type,
+                                       breed=breed,
+                                       size=size,
+                                       gender=gender,
+                                       age=age,
+                                       color=color,
+                                       coat=coat,
+                                       status=status,
+                                       name=name,
+                                       organization_id=organization_id,
+                                       location=location,
+                                       distance=distance,
+                                       sort=sort,
+                                       results_per_page=results_per_page,
+                                       before_date=before_date,
+                                       after_date=after_date,
+                                       good_with_cats=good_with_cats,
+                                       good_with_children=good_with_children,
+                                       good_with_dogs=good_with_dogs,
+                                       house_trained=house_trained,
+                                       declawed=declawed,
+                                       special_needs=special_needs)
+
+            flattener = RecordFlattener('animals', fields=fields) if return_df else None
+
+            animals = await self._get_pages(url, params=params, key='animals', pages=pages or None,
+                                            flattener=flattener, spec=spec, typed_records=typed_records)
+
+            if return_df:
+                return flattener.to_frame()
+
+        animals = {
+            'animals': animals
+        }
+
+        if return_df:
+            animals = _coerce_to_dataframe(animals)
+
+        return animals
+
+    async def organizations(self,
+                            organization_id: PetfinderID = None,
+                            name: str = None,
+                            location: str = None,
+                            distance: int = None,
+                            state: str = None,
+                            country: str = None,
+                            query: str = None,
+                            sort: str = None,
+                            results_per_page: int = 20,
+                            pages: int = 1,
+                            return_df: bool = False,
+                            fields: Fields = None,
+                            typed_records: bool = False):
+        r"""
+        Returns data on an animal welfare organization, or organizations, based on specified criteria. Multiple
+        organization IDs and the pages after the first page of search results are requested concurrently. With
+        :code:`typed_records=True`, the organizations of a search are returned as compact
+        :code:`petpy.records.Organization` objects.
+
+        See Also
+        --------
+        Petfinder.organizations
+
+        """
+        spec = compile_fields(fields) if fields is not None else None
+
+        if typed_records and (organization_id is not None or return_df):
+            raise ValueError('typed_records can only be used with searches, and not with return_df.')
+
+        if organization_id is not None:
+            url = urljoin(self._host, 'organizations/{id}')
+            if isinstance(organization_id, (tuple, list)):
+                organizations = list(await asyncio.gather(*(self._get_record(url, record_id=org_id,
+                                                                             key='organization', spec=spec)
+                                                            for org_id in organization_id)))
+            else:
+                organizations = await self._get_record(url, record_id=organization_id, key='organization',
+                                                       spec=spec)
+        else:
+            url = urljoin(self._host, 'organizations/')
+            params = search_parameters(name=name, location=location, distance=distance,
+                                       state=state, country=country, query=query, sort=sort,
+                                       results_per_page=results_per_page)
+
+            flattener = RecordFlattener('organizations', fields=fields) if return_df else None
+
+            organizations = await self._get_pages(url, params=params, key='organizations', pages=pages or None,
+                                                  flattener=flattener, spec=spec, typed_records=typed_records)
+
+            if return_df:
+                return flattener.to_frame()
+
+        organizations = {
+            'organizations': organizations
+        }
+
+        if return_df:
+            organizations = _coerce_to_dataframe(organizations)
+
+        return organizations
+
+    async def _get_reference(self, url, use_cache=True):
+        if use_cache and self.reference_cache is not None:
+            result = self.reference_cache.get(url)
+
+            if result is not None:
+                return result
+
+        result = await self._get_json(url)
+
+        if self.reference_cache is not None:
+            self.reference_cache.set(url, result)
+
+        return result
+
+    async def _get_pages(self, url, params, key, pages=None, flattener=None, spec=None, typed_records=False):
+        if pages is None:
+            params['limit'] = 100
+
+        results = []
+
+        if flattener is not None:
+            collect = flattener.add
+        elif typed_records:
+            record_type = RECORD_TYPES[key]
+
+            def collect(records):
+                results.extend(record_type(record if spec is None else project_record(record, spec))
+                               for record in records)
+        elif spec is not None:
+            def collect(records):
+                results.extend(project_record(record, spec) for record in records)
+        else:
+            collect = results.extend
+
+        first_page = await self._get_json(url, params=dict(params, page=1))
+
+        collect(first_page[key])
+        max_pages = first_page['pagination']['total_pages']
+
+        if pages is not None and pages < max_pages:
+            max_pages = pages
+
+        page_results = await asyncio.gather(*(self._get_json(url, params=dict(params, page=page))
+                                              for page in range(2, max_pages + 1)))
+
+        for page_result in page_results:
+            if isinstance(page_result, dict) and key in page_result:
+                collect(page_result[key])
+
+        return results
+
+    async def _get_record(self, url, record_id, key, spec=None):
+        try:
+            record = _project((await self._get_json(url.format(id=record_id)))[key], spec)
+            record['response'] = 200
+        except PetfinderResourceNotFound:
+            record = {
+                'id': record_id,
+                'response': 404
+            }
+        return record
+
+    async def _get_json(self, url, params=None):
+        r"""
+        Internal method for requesting an endpoint of the Petfinder API and decoding the body of the response.
+        Identical requests awaited at the same time share one request through the :code:`single_flight` layer.
+
+        """
+        if self.single_flight is None:
+            r = await self._request(url, params=params)
+        else:
+            r = await self.single_flight.do_async(self.single_flight.key(url, params),
+                                                  lambda: self._request(url, params=params))
+
+        return self.json_decoder(r.content)
+
+    async def _request(self, url, params=None):
+        token_refreshed = False
+
+        while True:
+            if self._token_expiring():
+                await self._refresh_token()
+
+            headers = self._auth_headers
+
+            r = await self._send('get', url, headers=headers, params=params)
+
+            if r.status_code == 200:
+                return r
+            elif r.status_code == 401 and not token_refreshed and _token_expired(self.json_decoder(r.content)):
+                await self._refresh_token(stale_headers=headers)
+                token_refreshed = True
+            elif self.retry_policy.retries(r.status_code) and r.status_code >= 500:
+                raise PetfinderUnexpectedError(
+                    message='The Petfinder API encountered an unexpected error after maximum retries.',
+                    err=(r.reason_phrase, r.status_code)
+                )
+            else:
+                if r.status_code == 429 and self.quota is not None:
+                    self.quota.exhaust()
+
+                _raise_for_status(r.status_code, r.reason_phrase, lambda: self.json_decoder(r.content))
+
+    async def _send(self, method, url, count=True, **kwargs):
+        r"""
+        Internal coroutine for sending a request through the circuit breaker, the quota and the rate limiter, retrying
+        it as the :code:`retry_policy` allows if it fails with a retried status code or a transport error. See
+        :code:`Petfinder._send`.
+
+        """
+        attempt = 0
+        request_url, request_kwargs = url, kwargs
+
+        # httpx replaces the query string of a URL with params, where requests appends params to it.
+        if kwargs.get('params') and '?' in url:
+            request_url = url + '&' + urlencode(kwargs['params'], doseq=True)
+            request_kwargs = {name: value for name, value in kwargs.items() if name != 'params'}
+
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request()
+
+            if count and self.quota is not None:
+                self.quota.spend()
+
+            wait, started = 0.0, time.perf_counter()
+
+            try:
+                async with self._semaphore:
+                    wait = await self.rate_limiter.acquire_async()
+                    started = time.perf_counter()
+                    r = await getattr(self._client, method)(request_url, **request_kwargs)
+            except self._transport_errors as e:
+                self._emit(method, url, kwargs, None, started, wait, attempt, error=e)
+                attempt += 1
+                self._record(failed=True)
+                delay = self.retry_policy.delay(attempt)
+
+                if delay is None:
+                    raise
+            else:
+                self._emit(method, url, kwargs, r, started, wait, attempt)
+                self._record(failed=r.status_code >= 500)
+
+                if not self.retry_policy.retries(r.status_code):
+                    return r
+
+                attempt += 1
+                delay = self.retry_policy.delay(attempt, r.status_code, r.headers.get('Retry-After'))
+
+                if delay is None:
+                    return r
+
+            await asyncio.sleep(delay)
+
+    def _record(self, failed):
+        if self.circuit_breaker is None:
+            return
+
+        if failed:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    def _emit(self, method, url, kwargs, response, started, wait, attempt, error=None):
+        if self.hooks:
+            call_hooks(self.hooks, _request_event(self._host, method, url, kwargs.get('params'), response, started,
+                                                  wait, attempt, error))
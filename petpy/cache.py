@@ -0,0 +1,420 @@
+# encoding=utf-8
+
+r"""
+
+The :code:`cache.py` file stores the caches used by :code:`Petfinder` to avoid repeating requests to the Petfinder
+API for data that has not changed, and the :code:`SingleFlight` layer that shares one request between identical
+concurrent calls.
+
+"""
+
+
+from collections import OrderedDict
+from concurrent.futures import Future
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode
+
+
+class TTLCache(object):
+    r"""
+    Thread-safe cache of JSON data whose entries expire after a fixed time-to-live.
+
+    Values are stored as serialized JSON, so every :code:`get` returns a new copy that can be modified without
+    affecting the cache. If a :code:`path` is given, the cache is loaded from and saved to a JSON file so cached
+    entries survive between Python sessions.
+
+    Parameters
+    ----------
+    ttl : float, default 86400
+        Number of seconds an entry stays in the cache. Defaults to one day.
+    path : str, optional
+        Path of a JSON file used to persist the cache to disk. If not given, the cache is kept in memory only.
+
+    Attributes
+    ----------
+    ttl : float
+        Number of seconds an entry stays in the cache.
+    path : str
+        Path of the JSON file the cache is persisted to, or :code:`None`.
+
+    Examples
+    --------
+    >>> cache = TTLCache(ttl=3600, path='petpy_cache.json')
+    >>> cache.set('types', {'types': []})
+    >>> cache.get('types')
+    {'types': []}
+
+    """
+    def __init__(self, ttl: float = 86400, path: str = None):
+        self.ttl = ttl
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+
+            self._remove_expired()
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._remove_expired()
+
+            return len(self._entries)
+
+    def get(self, key: str):
+        r"""
+        Returns a copy of the cached value for :code:`key`, or :code:`None` if it is not cached or has expired.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            if entry['expires'] <= time.time():
+                del self._entries[key]
+                return None
+
+            value = entry['value']
+
+        return json.loads(value)
+
+    def set(self, key: str, value):
+        r"""
+        Caches :code:`value` under :code:`key` for :code:`ttl` seconds. The value must be JSON serializable.
+
+        """
+        entry = {
+            'expires': time.time() + self.ttl,
+            'value': json.dumps(value)
+        }
+
+        with self._lock:
+            self._entries[key] = entry
+            self._save()
+
+    def invalidate(self, key: str = None):
+        r"""
+        Removes :code:`key` from the cache, or every entry if :code:`key` is not given.
+
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+            self._save()
+
+    def _remove_expired(self):
+        now = time.time()
+
+        for key in [k for k, entry in self._entries.items() if entry['expires'] <= now]:
+            del self._entries[key]
+
+    def _save(self):
+        if self.path is None:
+            return
+
+        _atomic_write(self.path, json.dumps(self._entries).encode('utf-8'))
+
+
+class ValidationCache(object):
+    r"""
+    On-disk cache of Petfinder API responses that are revalidated with conditional requests.
+
+    Each response is stored with the :code:`ETag` and :code:`Last-Modified` validators sent by the Petfinder API and
+    a SHA-256 digest of its body. The validators are sent back with the next request for the same URL and
+    parameters as :code:`If-None-Match` and :code:`If-Modified-Since` headers, and a :code:`304 Not Modified`
+    response is answered from the stored body. Responses without validators are compared by their digest instead.
+
+    Recently used bodies are kept in memory by digest, so a page that has not changed is answered without reading it
+    from disk. The cache saves the download and the disk read only: each call still decodes a new object from the
+    stored body, and any DataFrame is built from it again, so results can be modified without changing the cache or
+    the results returned to other calls. Copying a decoded page costs more than decoding it again.
+
+    Parameters
+    ----------
+    path : str
+        Directory the cached responses are stored in. It is created if it does not exist.
+    memo_size : int, default 128
+        Maximum number of response bodies kept in memory.
+
+    Attributes
+    ----------
+    path : str
+        Directory the cached responses are stored in.
+    hits : int
+        Number of responses answered from the cache, either by a 304 response or an unchanged digest.
+    misses : int
+        Number of responses that had changed or were not cached.
+
+    """
+    def __init__(self, path: str, memo_size: int = 128):
+        self.path = path
+        self.memo_size = memo_size
+        self.hits = 0
+        self.misses = 0
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key(url: str, params: dict = None) -> str:
+        r"""
+        Returns the cache key of a request, a digest of its URL and sorted query parameters.
+
+        """
+        query = urlencode(sorted((params or {}).items()))
+
+        return hashlib.sha256((url + '?' + query).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> dict:
+        r"""
+        Returns the stored validators and digest of a cached response, or :code:`None` if it is not cached.
+
+        """
+        if not os.path.exists(os.path.join(self.path, key + '.body')):
+            return None
+
+        try:
+            with open(os.path.join(self.path, key + '.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        r"""
+        Returns the conditional request headers for a cached response.
+
+        """
+        headers = {}
+
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        return headers
+
+    def revalidated(self, key: str, entry: dict, decoder=json.loads):
+        r"""
+        Returns the decoded body of a cached response after the Petfinder API answered with :code:`304 Not Modified`.
+
+        """
+        with self._lock:
+            self.hits += 1
+
+        return self._decode(entry['digest'], lambda: self._read_body(key), decoder)
+
+    def update(self, key: str, entry: dict, headers, body: bytes, decoder=json.loads):
+        r"""
+        Stores a response returned by the Petfinder API and returns its decoded body. If the body is unchanged from
+        the cached response, it is not written to disk again.
+
+        Parameters
+        ----------
+        key : str
+            Cache key of the request.
+        entry : dict
+            The currently cached entry for :code:`key`, or :code:`None`.
+        headers : dict
+            Headers of the response.
+        body : bytes
+            Body of the response.
+        decoder : callable, default json.loads
+            Function used to decode the body.
+
+        """
+        digest = hashlib.sha256(body).hexdigest()
+
+        new_entry = {
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'digest': digest
+        }
+
+        with self._lock:
+            if entry is not None and entry['digest'] == digest:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if new_entry != entry:
+            if entry is None or entry['digest'] != digest:
+                _atomic_write(os.path.join(self.path, key + '.body'), body)
+            _atomic_write(os.path.join(self.path, key + '.json'), json.dumps(new_entry).encode('utf-8'))
+
+        return self._decode(digest, lambda: body, decoder)
+
+    def invalidate(self):
+        r"""
+        Removes every cached response from disk and memory.
+
+        """
+        with self._lock:
+            self._memo.clear()
+
+        for name in os.listdir(self.path):
+            if name.endswith(('.json', '.body')):
+                os.remove(os.path.join(self.path, name))
+
+    def _read_body(self, key: str) -> bytes:
+        with open(os.path.join(self.path, key + '.body'), 'rb') as f:
+            return f.read()
+
+    def _decode(self, digest: str, body, decoder):
+        # Only the raw body is kept in memory, and a new object is decoded from it for every call, so callers never
+        # share a decoded result.
+        with self._lock:
+            content = self._memo.get(digest)
+            if content is not None:
+                self._memo.move_to_end(digest)
+
+        if content is None:
+            content = body()
+
+            with self._lock:
+                self._memo[digest] = content
+                if len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+
+        return decoder(content)
+
+
+class SingleFlight(object):
+    r"""
+    Shares one request between identical calls that are in flight at the same time.
+
+    The first call for a key runs the request and every identical call made before it finishes waits for its result,
+    or its exception, instead of sending a request of its own. Nothing is kept once the request finishes, so a call
+    made afterwards sends a new request. Works with threads through :code:`do` and with asyncio through
+    :code:`do_async`.
+
+    Attributes
+    ----------
+    hits : int
+        Number of calls that waited on a request already in flight.
+    misses : int
+        Number of calls that sent their own request.
+
+    Examples
+    --------
+    >>> flights = SingleFlight()
+    >>> key = flights.key('https://api.petfinder.com/v2/animals/', {'location': 'Seattle, WA'})
+    >>> response = flights.do(key, lambda: session.get(url, params=params))
+
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._calls = {}
+        self._async_calls = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, params: dict = None, headers: dict = None) -> str:
+        r"""
+        Returns the key of a request, its URL followed by its sorted query parameters and any extra headers.
+
+        """
+        key = url + '?' + urlencode(sorted((params or {}).items()), doseq=True)
+
+        if headers:
+            key += '#' + urlencode(sorted(headers.items()))
+
+        return key
+
+    def do(self, key: str, fn):
+        r"""
+        Returns the result of :code:`fn()`, calling it only if no call for :code:`key` is in flight and otherwise
+        waiting for the call in flight to finish. An exception raised by :code:`fn` is raised in every waiting
+        thread.
+
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+
+            if leader:
+                future = self._calls[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def do_async(self, key: str, fn):
+        r"""
+        Asyncio version of :code:`do` that awaits the coroutine returned by :code:`fn()`.
+
+        """
+        import asyncio
+
+        with self._lock:
+            future = self._async_calls.get(key)
+            leader = future is None
+
+            if leader:
+                future = self._async_calls[key] = asyncio.get_running_loop().create_future()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not leader:
+            return await asyncio.shield(future)
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Waiters re-raise the exception, so it should not be logged as never retrieved.
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._async_calls[key]
+
+
+def _atomic_write(path: str, data: bytes):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
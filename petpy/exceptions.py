@@ -166,3 +166,55 @@ class PetfinderRateLimitExceeded(PetfinderError):
         self.err = err
 
         super(PetfinderRateLimitExceeded, self).__init__(message, err, *args)
+
+
+class PetfinderQuotaExhausted(PetfinderRateLimitExceeded):
+    r"""
+    Exception raised before a request is sent when the daily request budget of a :code:`QuotaBudget`, or the
+    allowance of its active job, has been spent.
+
+    Parameters
+    ----------
+    message : str
+        Message stating which budget has been spent.
+    err : dict
+        The :code:`job` whose allowance was spent, or :code:`None` for the daily budget, with the number of requests
+        :code:`used` and the :code:`budget`.
+
+    Attributes
+    ----------
+    message : str
+        Message stating which budget has been spent.
+    err : dict
+        The :code:`job` whose allowance was spent, or :code:`None` for the daily budget, with the number of requests
+        :code:`used` and the :code:`budget`.
+
+    """
+    def __init__(self, message, err, *args):
+        super(PetfinderQuotaExhausted, self).__init__(message, err, *args)
+
+
+class PetfinderCircuitOpen(PetfinderUnexpectedError):
+    r"""
+    Exception raised without sending a request while the circuit breaker of a :code:`Petfinder` instance is open
+    because recent requests to the Petfinder API have failed.
+
+    Parameters
+    ----------
+    message : str
+        Message stating the Petfinder API is failing.
+    err : dict
+        The number of consecutive :code:`failures` and the seconds until a request is let through to probe the
+        Petfinder API, :code:`retry_in`.
+
+    Attributes
+    ----------
+    message : str
+        Message stating the Petfinder API is failing.
+    err : dict
+        The number of consecutive :code:`failures` and the seconds until a request is let through to probe the
+        Petfinder API, :code:`retry_in`.
+
+    """
+    def __init__(self, message, err, *args):
+        super(PetfinderCircuitOpen, self).__init__(message, err, *args)
@@ -0,0 +1,470 @@
+# encoding=utf-8
+
+r"""
+
+The :code:`flatten.py` file stores the :code:`RecordFlattener` used to coerce the animals and organizations
+returned by the Petfinder API into pandas DataFrames. pandas is only imported once a DataFrame is built, so
+importing :code:`petpy` does not load it.
+
+"""
+
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+ANIMAL_COLUMNS = (
+    'id', 'organization_id', 'url', 'type', 'species', 'age', 'gender', 'size', 'coat', 'tags', 'name',
+    'description', 'organization_animal_id', 'photos', 'videos', 'status', 'status_changed_at', 'published_at',
+    'distance',
+    'breeds.primary', 'breeds.secondary', 'breeds.mixed', 'breeds.unknown',
+    'colors.primary', 'colors.secondary', 'colors.tertiary',
+    'attributes.spayed_neutered', 'attributes.house_trained', 'attributes.declawed', 'attributes.special_needs',
+    'attributes.shots_current',
+    'environment.children', 'environment.dogs', 'environment.cats',
+    'primary_photo_cropped.small', 'primary_photo_cropped.medium', 'primary_photo_cropped.large',
+    'primary_photo_cropped.full',
+    'contact.email', 'contact.phone', 'contact.address.address1', 'contact.address.address2',
+    'contact.address.city', 'contact.address.state', 'contact.address.postcode', 'contact.address.country',
+    '_links.self.href', '_links.type.href', '_links.organization.href'
+)
+
+ORGANIZATION_COLUMNS = (
+    'id', 'name', 'email', 'phone', 'url', 'website', 'mission_statement', 'photos', 'distance',
+    'address.address1', 'address.address2', 'address.city', 'address.state', 'address.postcode', 'address.country',
+    'hours.monday', 'hours.tuesday', 'hours.wednesday', 'hours.thursday', 'hours.friday', 'hours.saturday',
+    'hours.sunday',
+    'adoption.policy', 'adoption.url',
+    'social_media.facebook', 'social_media.twitter', 'social_media.youtube', 'social_media.instagram',
+    'social_media.pinterest',
+    '_links.self.href', '_links.animals.href'
+)
+
+# Link columns whose prefix is removed to leave the ID, and the name the column is given.
+_LINK_IDS = {
+    'animals': {
+        '_links.organization.href': ('/v2/organizations/', 'organization_id'),
+        '_links.self.href': ('/v2/animals/', 'animal_id'),
+        '_links.type.href': ('/v2/types/', 'animal_type')
+    },
+    'organizations': {
+        '_links.self.href': ('/v2/organizations/', 'organization_id')
+    }
+}
+
+_DROPPED_COLUMNS = {
+    'animals': (),
+    'organizations': ('_links.animals.href',)
+}
+
+_SCHEMAS = {
+    'animals': ANIMAL_COLUMNS,
+    'organizations': ORGANIZATION_COLUMNS
+}
+
+# Value the columns of fields missing from a record are padded with, as in pandas.
+MISSING = float('nan')
+
+
+class _Field(object):
+    __slots__ = ('column', 'children', 'values', 'strip', 'dropped', 'selected')
+
+    def __init__(self, column, selected=True):
+        self.column = column
+        self.children = {}
+        self.values = None
+        self.strip = None
+        self.dropped = False
+        self.selected = selected
+
+
+class RecordFlattener(object):
+    r"""
+    Flattens the animals or organizations returned by the Petfinder API into the columns of a pandas DataFrame.
+
+    Nested fields are flattened into columns named by their dotted path, such as :code:`contact.address.city`,
+    in the same way as :code:`pandas.json_normalize`. Records are added a page at a time and their values are
+    written directly into one list per column, which is extended for each page, so no intermediate record or
+    DataFrame is built. The paths of the known Animal and Organization fields are resolved ahead of time, and the
+    :code:`/v2/...` prefixes of the :code:`_links` columns are removed from each value as it is written to leave
+    the linked ID.
+
+    Parameters
+    ----------
+    key : {'animals', 'organizations'}
+        The type of record being flattened. Any other key flattens the records without renaming or removing any
+        columns.
+    fields : str, list or tuple of str, optional
+        Dotted paths of the fields to keep, such as :code:`'breeds.primary'`. A path to a nested field keeps every
+        field below it. Values of other fields are skipped as each record is read, so their columns are never
+        created. If not given, every field is kept.
+
+    Attributes
+    ----------
+    key : str
+        The type of record being flattened.
+
+    Examples
+    --------
+    >>> flattener = RecordFlattener('animals', fields=['id', 'breeds.primary', 'contact.address'])
+    >>> flattener.add(pf.animals(pages=1)['animals'])
+    >>> animals = flattener.to_frame()
+
+    """
+    def __init__(self, key: str, fields=None):
+        self.key = key
+        self._columns = {}
+        self._rows = 0
+        self._fields = _Field('', selected=fields is None)
+
+        if fields is not None:
+            self._select(self._fields, compile_fields(fields))
+
+        link_ids = _LINK_IDS.get(key, {})
+        dropped = _DROPPED_COLUMNS.get(key, ())
+
+        for column in _SCHEMAS.get(key, ()):
+            self._field(column.split('.'))
+
+        for column, (prefix, _) in link_ids.items():
+            field = self._field(column.split('.'))
+            if field is not None:
+                field.strip = prefix
+
+        for column in dropped:
+            field = self._field(column.split('.'))
+            if field is not None:
+                field.dropped = True
+
+        self._renames = {column: name for column, (_, name) in link_ids.items()}
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _select(self, field, spec):
+        for name, children in spec.items():
+            child = field.children.get(name) or self._child(field, name)
+
+            if children is True:
+                child.selected = True
+            else:
+                self._select(child, children)
+
+    def _field(self, path):
+        field = self._fields
+
+        for name in path:
+            child = field.children.get(name)
+
+            if child is None:
+                if not field.selected:
+                    return None
+                child = self._child(field, name)
+
+            field = child
+
+        return field
+
+    @staticmethod
+    def _child(field, name):
+        child = field.children[name] = _Field(field.column + '.' + name if field.column else name, field.selected)
+
+        return child
+
+    def add(self, records):
+        r"""
+        Adds a page of records, or a single record, to the flattened columns.
+
+        Parameters
+        ----------
+        records : list or dict
+            The records to add.
+
+        """
+        if isinstance(records, dict):
+            records = [records]
+
+        size = len(records)
+
+        if size == 0:
+            return
+
+        start = self._rows
+        self._rows += size
+
+        padding = [MISSING] * size
+        for values in self._columns.values():
+            values.extend(padding)
+
+        root = self._fields
+        children = root.children
+        flatten = self._flatten
+        set_value = self._set
+
+        for row, record in enumerate(records, start):
+            nested = []
+
+            # Top-level values come before nested fields, as they do in pandas.json_normalize.
+            for name, value in record.items():
+                field = children.get(name)
+
+                if field is None:
+                    if not root.selected:
+                        continue
+                    field = self._child(root, name)
+
+                if isinstance(value, dict):
+                    nested.append((field, value))
+                elif field.values is not None and field.strip is None:
+                    field.values[row] = value
+                else:
+                    set_value(field, value, row)
+
+            for field, value in nested:
+                flatten(field, value, row)
+
+    def _flatten(self, field, record, row):
+        children = field.children
+
+        for name, value in record.items():
+            child = children.get(name)
+
+            if child is None:
+                if not field.selected:
+                    continue
+                child = self._child(field, name)
+
+            if isinstance(value, dict):
+                self._flatten(child, value, row)
+            elif child.values is not None and child.strip is None:
+                child.values[row] = value
+            else:
+                self._set(child, value, row)
+
+    def _set(self, field, value, row):
+        if field.dropped or not field.selected:
+            return
+
+        if field.strip is not None and isinstance(value, str):
+            value = value.replace(field.strip, '')
+
+        if field.values is None:
+            field.values = self._columns.get(field.column)
+
+            if field.values is None:
+                field.values = self._columns[field.column] = [MISSING] * self._rows
+
+        field.values[row] = value
+
+    def to_frame(self) -> 'pd.DataFrame':
+        r"""
+        Returns the flattened records as a pandas DataFrame.
+
+        Returns
+        -------
+        pandas DataFrame
+            One row per record and one column per flattened field. For animals, the :code:`_links` columns are
+            named :code:`organization_id`, :code:`animal_id` and :code:`animal_type`, and for organizations the
+            :code:`_links.self.href` column is named :code:`organization_id`.
+
+        """
+        import pandas as pd
+
+        results_df = pd.DataFrame(dict(enumerate(self._columns.values())), index=pd.RangeIndex(self._rows))
+        results_df.columns = [self._renames.get(column, column) for column in self._columns]
+
+        return results_df
+
+    def to_columns(self, columns) -> list:
+        r"""
+        Returns the values of the given columns as lists, in the order of :code:`columns`. Columns without any
+        values are filled with :code:`NaN`. If more than one flattened column has the same name, such as the two
+        :code:`organization_id` columns of animals, the first is returned.
+
+        Parameters
+        ----------
+        columns : list of str
+            Names of the columns to return, as they are named by :code:`to_frame`.
+
+        Returns
+        -------
+        list of lists
+            The values of each column, one per record.
+
+        """
+        named = {}
+
+        for column, values in self._columns.items():
+            named.setdefault(self._renames.get(column, column), values)
+
+        return [named[column] if column in named else [MISSING] * self._rows for column in columns]
+
+
+def flatten_records(key: str, records, fields=None) -> 'pd.DataFrame':
+    r"""
+    Returns the animals or organizations returned by the Petfinder API as a flattened pandas DataFrame.
+
+    Parameters
+    ----------
+    key : {'animals', 'organizations'}
+        The type of record being flattened.
+    records : list or dict
+        The records to flatten.
+    fields : str, list or tuple of str, optional
+        Dotted paths of the fields to keep. If not given, every field is kept.
+
+    Returns
+    -------
+    pandas DataFrame
+        The flattened records.
+
+    """
+    flattener = RecordFlattener(key, fields=fields)
+    flattener.add(records)
+
+    return flattener.to_frame()
+
+
+def schema_columns(key: str, fields=None) -> list:
+    r"""
+    Returns the columns of the known fields of animals or organizations, named as they are by
+    :code:`RecordFlattener.to_frame`. The columns are the same for every page of results, whichever fields are
+    missing from its records, so they can be used as a fixed schema when results are written a page at a time.
+
+    Parameters
+    ----------
+    key : {'animals', 'organizations'}
+        The type of record.
+    fields : str, list or tuple of str, optional
+        Dotted paths of the fields to keep. Paths that are not part of the known fields are returned as given,
+        after the known fields.
+
+    Returns
+    -------
+    list of str
+        The column names, without duplicates.
+
+    """
+    if key not in _SCHEMAS:
+        raise ValueError("key must be one of 'animals' or 'organizations'.")
+
+    columns = list(_SCHEMAS[key])
+
+    if fields is not None:
+        spec = compile_fields(fields)
+        selected = [column for column in columns if _selects(spec, column.split('.'))]
+
+        for path in _spec_paths(spec):
+            if not any(column == path or column.startswith(path + '.') for column in columns):
+                selected.append(path)
+
+        columns = selected
+
+    renames = {column: name for column, (_, name) in _LINK_IDS[key].items()}
+    dropped = _DROPPED_COLUMNS[key]
+
+    names = []
+    for column in columns:
+        name = renames.get(column, column)
+
+        if column not in dropped and name not in names:
+            names.append(name)
+
+    return names
+
+
+def _selects(spec, names):
+    node = spec
+
+    for name in names:
+        node = node.get(name)
+
+        if node is None:
+            return False
+        if node is True:
+            return True
+
+    return False
+
+
+def _spec_paths(spec, prefix=''):
+    for name, children in spec.items():
+        if children is True:
+            yield prefix + name
+        else:
+            yield from _spec_paths(children, prefix + name + '.')
+
+
+def compile_fields(fields) -> dict:
+    r"""
+    Returns dotted field paths as a nested dictionary keyed by field name, where :code:`True` marks a field that is
+    kept along with everything below it.
+
+    Parameters
+    ----------
+    fields : str, list or tuple of str
+        Dotted paths of the fields to keep, such as :code:`'contact.address.city'`.
+
+    Returns
+    -------
+    dict
+        The nested field paths.
+
+    Examples
+    --------
+    >>> compile_fields(['id', 'breeds.primary', 'breeds'])
+    {'id': True, 'breeds': True}
+
+    """
+    if isinstance(fields, str):
+        fields = [fields]
+
+    spec = {}
+
+    for path in fields:
+        names = path.split('.')
+
+        if not path or '' in names:
+            raise ValueError('{} is not a valid field path.'.format(repr(path)))
+
+        node = spec
+        for name in names[:-1]:
+            child = node.setdefault(name, {})
+
+            if child is True:
+                break
+            node = child
+        else:
+            node[names[-1]] = True
+
+    return spec
+
+
+def project_record(record: dict, spec: dict) -> dict:
+    r"""
+    Returns a copy of a record containing only the fields in :code:`spec`, as returned by :code:`compile_fields`.
+    Fields keep their nesting and their order in the record, and fields missing from the record are left out.
+
+    """
+    projected = {}
+
+    for name, value in record.items():
+        children = spec.get(name)
+
+        if children is True:
+            projected[name] = value
+        elif children is not None and isinstance(value, dict):
+            projected[name] = project_record(value, children)
+
+    return projected
+
+
+def is_missing(value) -> bool:
+    r"""
+    Returns :code:`True` if a flattened value is :code:`None` or :code:`MISSING`, the value the columns of fields
+    missing from a record are padded with.
+
+    """
+    return value is None or value is MISSING
@@ -0,0 +1,185 @@
+# encoding=utf-8
+
+r"""
+
+The :code:`hooks.py` file stores the :code:`RequestEvent` reported to the request hooks of :code:`Petfinder` and
+:code:`AsyncPetfinder` for every HTTP request they send, and :code:`RequestStats`, a hook that aggregates the events
+into per-endpoint totals and latency percentiles.
+
+"""
+
+
+import math
+import threading
+import warnings
+
+
+class RequestEvent(object):
+    r"""
+    Description of one HTTP request sent to the Petfinder API, passed to each request hook once the request returns
+    or fails.
+
+    Every attempt of a retried request is reported as its own event, so the events of one call can be told apart by
+    their :code:`attempt`.
+
+    Attributes
+    ----------
+    method : str
+        HTTP method of the request, :code:`'GET'` or :code:`'POST'`.
+    url : str
+        URL of the request, without the query parameters.
+    endpoint : str
+        Path of the URL relative to the Petfinder API, such as :code:`'animals/'`, :code:`'animals/12345'` or
+        :code:`'oauth2/token'`.
+    params : dict
+        Query parameters of the request, or an empty dictionary.
+    status : int
+        Status code of the response, or :code:`None` if the request failed with a connection error.
+    latency : float
+        Seconds from sending the request to receiving the whole response, or to the connection error.
+    bytes : int
+        Size of the response body in bytes, or 0 if there was no response.
+    attempt : int
+        Number of times the request had already been tried. 0 for the first attempt and :code:`n` for retry
+        :code:`n`.
+    rate_limit_wait : float
+        Seconds the request waited on the rate limiter before it was sent.
+    token_refresh : boolean
+        :code:`True` if the request was for a new access token.
+    error : Exception
+        The connection error the request failed with, or :code:`None`.
+    started : float
+        Time the request was sent, as seconds since the epoch.
+
+    """
+    __slots__ = ('method', 'url', 'endpoint', 'params', 'status', 'latency', 'bytes', 'attempt', 'rate_limit_wait',
+                 'token_refresh', 'error', 'started')
+
+    def __init__(self, method, url, endpoint, params, status, latency, bytes, attempt, rate_limit_wait,
+                 token_refresh, error, started):
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint
+        self.params = params
+        self.status = status
+        self.latency = latency
+        self.bytes = bytes
+        self.attempt = attempt
+        self.rate_limit_wait = rate_limit_wait
+        self.token_refresh = token_refresh
+        self.error = error
+        self.started = started
+
+    def __repr__(self):
+        return 'RequestEvent({} {} status={} latency={:.3f}s bytes={} attempt={})'.format(
+            self.method, self.endpoint, self.status, self.latency, self.bytes, self.attempt)
+
+    def to_dict(self) -> dict:
+        r"""
+        Returns the event as a dictionary, with the :code:`error` as its string representation.
+
+        """
+        event = {name: getattr(self, name) for name in self.__slots__}
+        event['error'] = repr(self.error) if self.error is not None else None
+
+        return event
+
+
+class RequestStats(object):
+    r"""
+    Thread-safe request hook that aggregates the events of every request into totals per endpoint.
+
+    Endpoints are grouped by their first path segment, so :code:`'animals/'` and :code:`'animals/12345'` are both
+    counted under :code:`'animals'`. The latency of every request is kept to compute percentiles.
+
+    Examples
+    --------
+    >>> stats = RequestStats()
+    >>> pf = Petfinder(key=key, secret=secret, hooks=stats)
+    >>> animals = pf.animals(location='Seattle, WA', pages=None)
+    >>> stats.summary()['animals']['latency_p99']
+
+    """
+    def __init__(self):
+        self._totals = {}
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent):
+        group = event.endpoint.split('/', 1)[0]
+
+        with self._lock:
+            totals = self._totals.get(group)
+
+            if totals is None:
+                totals = self._totals[group] = {'requests': 0, 'errors': 0, 'retries': 0, 'bytes': 0,
+                                                'latency': 0.0, 'rate_limit_wait': 0.0, 'token_refreshes': 0}
+                self._latencies[group] = []
+
+            totals['requests'] += 1
+            totals['errors'] += event.error is not None or event.status is None or event.status >= 400
+            totals['retries'] += event.attempt > 0
+            totals['bytes'] += event.bytes
+            totals['latency'] += event.latency
+            totals['rate_limit_wait'] += event.rate_limit_wait
+            totals['token_refreshes'] += event.token_refresh
+            self._latencies[group].append(event.latency)
+
+    def summary(self) -> dict:
+        r"""
+        Returns the totals of each endpoint, and of every request under :code:`'total'`: the number of
+        :code:`requests`, :code:`errors` and :code:`retries`, the response :code:`bytes`, the seconds spent on
+        :code:`latency` and :code:`rate_limit_wait`, the number of :code:`token_refreshes`, and the 50th, 90th and
+        99th percentile latencies in seconds.
+
+        """
+        with self._lock:
+            groups = {group: dict(totals) for group, totals in self._totals.items()}
+            latencies = {group: sorted(values) for group, values in self._latencies.items()}
+
+        total = {'requests': 0, 'errors': 0, 'retries': 0, 'bytes': 0, 'latency': 0.0, 'rate_limit_wait': 0.0,
+                 'token_refreshes': 0}
+
+        for totals in groups.values():
+            for name in total:
+                total[name] += totals[name]
+
+        groups['total'] = total
+        latencies['total'] = sorted(value for values in latencies.values() for value in values)
+
+        for group, totals in groups.items():
+            for percentile in (50, 90, 99):
+                totals['latency_p{}'.format(percentile)] = _percentile(latencies[group], percentile)
+
+        return groups
+
+    def reset(self):
+        r"""
+        Clears every aggregated event.
+
+        """
+        with self._lock:
+            self._totals.clear()
+            self._latencies.clear()
+
+
+def call_hooks(hooks, event: RequestEvent):
+    r"""
+    Calls each hook with :code:`event`. An exception raised by a hook is reported as a warning so it cannot fail the
+    request.
+
+    """
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception as e:
+            warnings.warn('Request hook {!r} raised {!r}'.format(hook, e), RuntimeWarning)
+
+
+def _percentile(values, percentile):
+    if not values:
+        return None
+
+    rank = max(int(math.ceil(percentile / 100 * len(values))) - 1, 0)
+
+    return values[rank]
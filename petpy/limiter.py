@@ -0,0 +1,145 @@
+# encoding=utf-8
+
+r"""
+
+The :code:`limiter.py` file stores the :code:`TokenBucket` rate limiter used by :code:`Petfinder` and
+:code:`AsyncPetfinder` to keep every HTTP request sent to the Petfinder API within the API's rate limit.
+
+"""
+
+
+import threading
+import time
+
+
+class TokenBucket(object):
+    r"""
+    Thread-safe token bucket rate limiter.
+
+    The bucket holds up to :code:`capacity` tokens and is refilled at :code:`rate` tokens per second. Each request
+    takes one token. When the bucket is empty, tokens are reserved ahead of time so concurrent callers are released
+    in the order they arrived, at exactly :code:`rate` requests per second.
+
+    Parameters
+    ----------
+    rate : float, default 50
+        Number of tokens added to the bucket per second. The Petfinder API allows 50 requests per second.
+    capacity : int, optional
+        Maximum number of tokens the bucket can hold, which is the largest burst of requests that can be sent at
+        once. Defaults to :code:`rate`.
+
+    Attributes
+    ----------
+    rate : float
+        Number of tokens added to the bucket per second.
+    capacity : float
+        Maximum number of tokens the bucket can hold.
+
+    Examples
+    --------
+    >>> bucket = TokenBucket(rate=10)
+    >>> bucket.acquire()
+    0.0
+
+    """
+    def __init__(self, rate: float = 50, capacity: int = None):
+        if rate <= 0:
+            raise ValueError('rate must be greater than 0.')
+
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+
+        if self.capacity < 1:
+            raise ValueError('capacity must be at least 1.')
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: int = 1) -> float:
+        r"""
+        Takes tokens from the bucket and returns how long the caller must wait before using them.
+
+        Parameters
+        ----------
+        tokens : int, default 1
+            Number of tokens to take.
+
+        Returns
+        -------
+        float
+            Number of seconds to wait before sending the request. :code:`0.0` if tokens were available.
+
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+
+            if self._tokens >= 0:
+                return 0.0
+
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: int = 1) -> float:
+        r"""
+        Takes tokens from the bucket, sleeping until they are available.
+
+        Parameters
+        ----------
+        tokens : int, default 1
+            Number of tokens to take.
+
+        Returns
+        -------
+        float
+            Number of seconds spent waiting.
+
+        """
+        delay = self.reserve(tokens)
+
+        if delay > 0:
+            time.sleep(delay)
+
+        return delay
+
+    async def acquire_async(self, tokens: int = 1) -> float:
+        r"""
+        Asyncio version of :code:`acquire` that awaits until tokens are available without blocking the event loop.
+
+        Parameters
+        ----------
+        tokens : int, default 1
+            Number of tokens to take.
+
+        Returns
+        -------
+        float
+            Number of seconds spent waiting.
+
+        """
+        import asyncio
+
+        delay = self.reserve(tokens)
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        return delay
+
+    @property
+    def wait_time(self) -> float:
+        r"""
+        Number of seconds a request sent now would wait for a token, without taking one.
+
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+
+            if self._tokens >= 1:
+                return 0.0
+
+            return (1 - self._tokens) / self.rate
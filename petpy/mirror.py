@@ -0,0 +1,533 @@
+# encoding=utf-8
+
+r"""
+
+The :code:`mirror.py` file stores the :code:`Mirror` class, a local SQLite copy of animals and organizations
+returned by the Petfinder API that can be searched with the same criteria as :code:`Petfinder.animals` and
+:code:`Petfinder.organizations` without sending a request.
+
+"""
+
+
+import datetime
+import json
+import sqlite3
+import threading
+
+from petpy.flatten import compile_fields, flatten_records, project_record
+from petpy.parameters import format_dates, search_parameters
+from petpy.petpy_types import (
+    AnimalFeatures,
+    Animals,
+    Date,
+    Fields
+)
+from petpy.sync import parse_timestamp
+from petpy.vocabulary import parameter_value
+
+
+_ANIMAL_COLUMNS = (
+    'id', 'organization_id', 'type', 'breed_primary', 'breed_secondary', 'color_primary', 'color_secondary',
+    'color_tertiary', 'age', 'gender', 'size', 'coat', 'status', 'name', 'good_with_children', 'good_with_dogs',
+    'good_with_cats', 'house_trained', 'declawed', 'special_needs', 'city', 'state', 'postcode', 'country',
+    'published_at', 'status_changed_at', 'record'
+)
+
+_ORGANIZATION_COLUMNS = ('id', 'name', 'city', 'state', 'postcode', 'country', 'record')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS animals (
+    id INTEGER PRIMARY KEY,
+    organization_id TEXT COLLATE NOCASE,
+    type TEXT,
+    breed_primary TEXT COLLATE NOCASE,
+    breed_secondary TEXT COLLATE NOCASE,
+    color_primary TEXT COLLATE NOCASE,
+    color_secondary TEXT COLLATE NOCASE,
+    color_tertiary TEXT COLLATE NOCASE,
+    age TEXT,
+    gender TEXT,
+    size TEXT,
+    coat TEXT,
+    status TEXT,
+    name TEXT COLLATE NOCASE,
+    good_with_children INTEGER,
+    good_with_dogs INTEGER,
+    good_with_cats INTEGER,
+    house_trained INTEGER,
+    declawed INTEGER,
+    special_needs INTEGER,
+    city TEXT COLLATE NOCASE,
+    state TEXT COLLATE NOCASE,
+    postcode TEXT,
+    country TEXT COLLATE NOCASE,
+    published_at TEXT,
+    status_changed_at TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS animals_type_age ON animals (type, age);
+CREATE INDEX IF NOT EXISTS animals_state_type ON animals (state, type);
+CREATE INDEX IF NOT EXISTS animals_organization_id ON animals (organization_id);
+CREATE INDEX IF NOT EXISTS animals_breed_primary ON animals (breed_primary);
+CREATE INDEX IF NOT EXISTS animals_postcode ON animals (postcode);
+CREATE INDEX IF NOT EXISTS animals_status ON animals (status);
+CREATE INDEX IF NOT EXISTS animals_published_at ON animals (published_at);
+CREATE TABLE IF NOT EXISTS organizations (
+    id TEXT PRIMARY KEY COLLATE NOCASE,
+    name TEXT COLLATE NOCASE,
+    city TEXT COLLATE NOCASE,
+    state TEXT COLLATE NOCASE,
+    postcode TEXT,
+    country TEXT COLLATE NOCASE,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS organizations_state ON organizations (state);
+CREATE INDEX IF NOT EXISTS organizations_postcode ON organizations (postcode);
+"""
+
+
+class Mirror(object):
+    r"""
+    Local SQLite copy of animals and organizations returned by the Petfinder API.
+
+    Records are stored whole along with indexed columns for the fields the Petfinder API can search on, such as the
+    animal type, age, size, breed, organization and the state and postcode of the contact address. The
+    :code:`animals()` and :code:`organizations()` methods accept the same search criteria as their
+    :code:`Petfinder` equivalents and answer them from the database. Records are added or updated with
+    :code:`upsert()`, or by running a search against the Petfinder API with :code:`refresh()`.
+
+    Searches are answered from the records in the mirror, so the results are only as recent as the last refresh.
+    Locations are matched exactly against the city and state or the postcode of each record's address, as the
+    mirror has no geographic data, and the :code:`distance` criterion is not supported.
+
+    Parameters
+    ----------
+    path : str, default ':memory:'
+        Path of the SQLite database file. The tables and indexes are created if they do not exist. Defaults to an
+        in-memory database.
+
+    Attributes
+    ----------
+    path : str
+        Path of the SQLite database file.
+
+    Examples
+    --------
+    >>> mirror = Mirror('petfinder.db')
+    >>> mirror.refresh(pf, location='WA', pages=None)
+    >>> young_cats = mirror.animals(animal_type='cat', age=['baby', 'young'], location='Seattle, WA', pages=None)
+
+    """
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count('animals')
+
+    def close(self):
+        r"""
+        Closes the database connection.
+
+        """
+        self._connection.close()
+
+    def count(self, key: str = 'animals') -> int:
+        r"""
+        Returns the number of animals, or organizations if :code:`key='organizations'`, in the mirror.
+
+        """
+        table = _table(key)
+
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM {}'.format(table)).fetchone()[0]
+
+    def upsert(self, records, key: str = 'animals') -> int:
+        r"""
+        Adds records to the mirror, replacing any stored record with the same ID that has changed.
+
+        Parameters
+        ----------
+        records : list or dict
+            Animals or organizations as returned by the Petfinder API.
+        key : {'animals', 'organizations'}, default 'animals'
+            The type of the records.
+
+        Returns
+        -------
+        int
+            Number of records that were added or changed.
+
+        """
+        if isinstance(records, dict):
+            records = [records]
+
+        table = _table(key)
+
+        if table == 'animals':
+            columns, rows = _ANIMAL_COLUMNS, [_animal_row(record) for record in records]
+        else:
+            columns, rows = _ORGANIZATION_COLUMNS, [_organization_row(record) for record in records]
+
+        statement = 'INSERT INTO {table} ({columns}) VALUES ({values}) ' \
+                    'ON CONFLICT (id) DO UPDATE SET {updates} WHERE {table}.record IS NOT excluded.record'.format(
+                        table=table,
+                        columns=', '.join(columns),
+                        values=', '.join('?' * len(columns)),
+                        updates=', '.join('{0} = excluded.{0}'.format(column) for column in columns[1:]))
+
+        with self._lock, self._connection:
+            changes = self._connection.total_changes
+            self._connection.executemany(statement, rows)
+
+            return self._connection.total_changes - changes
+
+    def refresh(self, pf, key: str = 'animals', state=None, **search) -> int:
+        r"""
+        Runs a search against the Petfinder API and upserts the returned records a page at a time.
+
+        Parameters
+        ----------
+        pf : Petfinder
+            The :code:`Petfinder` instance used to run the search.
+        key : {'animals', 'organizations'}, default 'animals'
+            The type of records to search for.
+        state : SyncState or str, optional
+            If given, animals are requested with :code:`Petfinder.sync_animals` using this :code:`SyncState`, so
+            only the animals published since the previous refresh of the same search are requested.
+        **search
+            Search criteria passed to :code:`Petfinder.iter_animals` or :code:`Petfinder.iter_organizations`, or
+            to :code:`Petfinder.sync_animals` if :code:`state` is given.
+
+        Returns
+        -------
+        int
+            Number of records that were added or changed.
+
+        """
+        table = _table(key)
+
+        if state is not None:
+            if table != 'animals':
+                raise ValueError('state can only be used to refresh animals.')
+
+            return self.upsert(pf.sync_animals(state, **search)['animals'], key='animals')
+
+        if table == 'animals':
+            pages = pf.iter_animals(by_page=True, **search)
+        else:
+            pages = pf.iter_organizations(by_page=True, **search)
+
+        return sum(self.upsert(page, key=key) for page in pages)
+
+    def animals(self,
+                animal_id=None,
+                animal_type: str = None,
+                breed: AnimalFeatures = None,
+                size: AnimalFeatures = None,
+                gender: AnimalFeatures = None,
+                age: AnimalFeatures = None,
+                color: str = None,
+                coat: AnimalFeatures = None,
+                status: str = None,
+                name: str = None,
+                organization_id: AnimalFeatures = None,
+                location: str = None,
+                distance: int = None,
+                good_with_children: bool = None,
+                good_with_dogs: bool = None,
+                good_with_cats: bool = None,
+                house_trained: bool = None,
+                declawed: bool = None,
+                special_needs: bool = None,
+                before_date: Date = None,
+                after_date: Date = None,
+                sort: str = None,
+                pages: int = 1,
+                results_per_page: int = 20,
+                return_df: bool = False,
+                fields: Fields = None) -> Animals:
+        r"""
+        Returns the animals in the mirror matching the search criteria. Takes the same parameters as
+        :code:`Petfinder.animals`, which are checked in the same way.
+
+        Unlike the Petfinder API, :code:`status` is not set to 'adoptable' when it is not given, :code:`location`
+        is matched exactly against the 'city, state', state or postcode of each animal's contact address, and
+        :code:`distance` and sorting by distance are not supported. Results are sorted with the most recently
+        published first unless :code:`sort='-recent'`.
+
+        Returns
+        -------
+        dict or pandas DataFrame
+            The matching animals under the key :code:`animals`, or a pandas DataFrame if :code:`return_df=True`.
+
+        """
+        before_date, after_date = format_dates(before_date, after_date)
+
+        params = search_parameters(animal_type=animal_type, breed=breed, size=size, gender=gender, age=age, color=color,
+                                   coat=coat, status=status, name=name, organization_id=organization_id,
+                                   location=location, distance=distance, sort=sort, results_per_page=results_per_page,
+                                   before_date=before_date, after_date=after_date, good_with_cats=good_with_cats,
+                                   good_with_children=good_with_children, good_with_dogs=good_with_dogs,
+                                   house_trained=house_trained, declawed=declawed, special_needs=special_needs)
+
+        if 'distance' in params or params.get('sort', '').endswith('distance'):
+            raise ValueError('Searching by distance is not supported by the mirror.')
+
+        where, args = [], []
+
+        if animal_id is not None:
+            _match_any(where, args, 'id', animal_id if isinstance(animal_id, (list, tuple)) else [animal_id])
+
+        for parameter in ('animal_type', 'size', 'gender', 'age', 'coat', 'status'):
+            if parameter in params:
+                column = 'type' if parameter == 'animal_type' else parameter
+                _match_any(where, args, column, params[parameter].lower().split(','))
+
+        if 'breed' in params:
+            breeds = _split(params['breed'])
+            where.append('(breed_primary IN ({0}) OR breed_secondary IN ({0}))'.format(', '.join('?' * len(breeds))))
+            args.extend(breeds * 2)
+
+        if 'color' in params:
+            colors = _split(params['color'])
+            where.append('(color_primary IN ({0}) OR color_secondary IN ({0}) OR color_tertiary IN ({0}))'.format(
+                ', '.join('?' * len(colors))))
+            args.extend(colors * 3)
+
+        if 'organization' in params:
+            _match_any(where, args, 'organization_id', _split(params['organization']))
+
+        if 'name' in params:
+            where.append("name LIKE ? ESCAPE '\\'")
+            args.append('%' + _escape_like(params['name']) + '%')
+
+        if 'location' in params:
+            _match_location(where, args, params['location'])
+
+        for parameter in ('good_with_children', 'good_with_dogs', 'good_with_cats', 'house_trained', 'declawed',
+                          'special_needs'):
+            if parameter in params:
+                where.append('{} = ?'.format(parameter))
+                args.append(params[parameter])
+
+        if 'before' in params:
+            where.append('published_at < ?')
+            args.append(_utc(params['before']))
+
+        if 'after' in params:
+            where.append('published_at > ?')
+            args.append(_utc(params['after']))
+
+        order = 'published_at ASC, id ASC' if params.get('sort') == '-recent' else 'published_at DESC, id DESC'
+
+        records = self._select('animals', where, args, order, pages, results_per_page)
+
+        return _format_results('animals', records, return_df, fields)
+
+    def organizations(self,
+                      organization_id=None,
+                      name: str = None,
+                      location: str = None,
+                      distance: int = None,
+                      state: str = None,
+                      country: str = None,
+                      query: str = None,
+                      sort: str = None,
+                      results_per_page: int = 20,
+                      pages: int = 1,
+                      return_df: bool = False,
+                      fields: Fields = None):
+        r"""
+        Returns the organizations in the mirror matching the search criteria. Takes the same parameters as
+        :code:`Petfinder.organizations`, which are checked in the same way.
+
+        :code:`location` is matched exactly against the 'city, state', state or postcode of each organization's
+        address, and :code:`distance` and sorting by distance are not supported. Results are sorted by
+        organization ID.
+
+        Returns
+        -------
+        dict or pandas DataFrame
+            The matching organizations under the key :code:`organizations`, or a pandas DataFrame if
+            :code:`return_df=True`.
+
+        """
+        params = search_parameters(name=name, location=location, distance=distance, state=state, country=country,
+                                   query=query, sort=sort, results_per_page=results_per_page)
+
+        if 'distance' in params or params.get('sort', '').endswith('distance'):
+            raise ValueError('Searching by distance is not supported by the mirror.')
+
+        where, args = [], []
+
+        if organization_id is not None:
+            _match_any(where, args, 'id', organization_id if isinstance(organization_id, (list, tuple))
+                       else [organization_id])
+
+        for parameter in ('state', 'country'):
+            if parameter in params:
+                _match_any(where, args, parameter, _split(params[parameter]))
+
+        if 'name' in params:
+            where.append("name LIKE ? ESCAPE '\\'")
+            args.append('%' + _escape_like(params['name']) + '%')
+
+        if 'query' in params:
+            where.append("(name LIKE ? ESCAPE '\\' OR city LIKE ? ESCAPE '\\' OR state LIKE ? ESCAPE '\\')")
+            args.extend(['%' + _escape_like(params['query']) + '%'] * 3)
+
+        if 'location' in params:
+            _match_location(where, args, params['location'])
+
+        records = self._select('organizations', where, args, 'id ASC', pages, results_per_page)
+
+        return _format_results('organizations', records, return_df, fields)
+
+    def _select(self, table, where, args, order, pages, results_per_page):
+        statement = 'SELECT record FROM {}'.format(table)
+
+        if where:
+            statement += ' WHERE ' + ' AND '.join(where)
+
+        statement += ' ORDER BY ' + order
+
+        if pages is not None:
+            statement += ' LIMIT ?'
+            args = args + [pages * results_per_page]
+
+        with self._lock:
+            rows = self._connection.execute(statement, args).fetchall()
+
+        return [json.loads(row[0]) for row in rows]
+
+
+def _table(key):
+    if key not in ('animals', 'organizations'):
+        raise ValueError("key must be one of 'animals' or 'organizations'.")
+
+    return key
+
+
+def _animal_row(record):
+    breeds = record.get('breeds') or {}
+    colors = record.get('colors') or {}
+    attributes = record.get('attributes') or {}
+    environment = record.get('environment') or {}
+    address = (record.get('contact') or {}).get('address') or {}
+
+    return (
+        record['id'],
+        record.get('organization_id'),
+        parameter_value(record.get('type')),
+        breeds.get('primary'),
+        breeds.get('secondary'),
+        colors.get('primary'),
+        colors.get('secondary'),
+        colors.get('tertiary'),
+        parameter_value(record.get('age')),
+        parameter_value(record.get('gender')),
+        parameter_value(record.get('size')),
+        parameter_value(record.get('coat')),
+        parameter_value(record.get('status')),
+        record.get('name'),
+        environment.get('children'),
+        environment.get('dogs'),
+        environment.get('cats'),
+        attributes.get('house_trained'),
+        attributes.get('declawed'),
+        attributes.get('special_needs'),
+        address.get('city'),
+        address.get('state'),
+        address.get('postcode'),
+        address.get('country'),
+        _utc(record.get('published_at')),
+        _utc(record.get('status_changed_at')),
+        json.dumps(record)
+    )
+
+
+def _organization_row(record):
+    address = record.get('address') or {}
+
+    return (
+        record['id'],
+        record.get('name'),
+        address.get('city'),
+        address.get('state'),
+        address.get('postcode'),
+        address.get('country'),
+        json.dumps(record)
+    )
+
+
+def _utc(timestamp):
+    r"""
+    Converts an ISO8601 timestamp to UTC so timestamps with different offsets can be compared as strings.
+
+    """
+    if timestamp is None:
+        return None
+
+    return parse_timestamp(timestamp).astimezone(datetime.timezone.utc).isoformat()
+
+
+def _split(values):
+    if not isinstance(values, (list, tuple)):
+        values = str(values).split(',')
+
+    return [str(value).strip() for value in values]
+
+
+def _escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _match_any(where, args, column, values):
+    values = list(values)
+    where.append('{} IN ({})'.format(column, ', '.join('?' * len(values))))
+    args.extend(values)
+
+
+def _match_location(where, args, location):
+    parts = _split(location)
+
+    if len(parts) == 2:
+        try:
+            float(parts[0]), float(parts[1])
+        except ValueError:
+            where.append('city = ? AND state = ?')
+            args.extend(parts)
+            return
+
+        raise ValueError('Searching by latitude and longitude is not supported by the mirror.')
+
+    if parts[0].isalpha() and len(parts[0]) == 2:
+        where.append('state = ?')
+    else:
+        where.append('postcode = ?')
+
+    args.append(parts[0])
+
+
+def _format_results(key, records, return_df, fields):
+    if return_df:
+        return flatten_records(key, records, fields=fields)
+
+    if fields is not None:
+        spec = compile_fields(fields)
+        records = [project_record(record, spec) for record in records]
+
+    return {
+        key: records
+    }
@@ -0,0 +1,416 @@
+# encoding=utf-8
+
+r"""
+
+The :code:`parameters.py` file stores the functions that check the search parameters of :code:`Petfinder`,
+:code:`AsyncPetfinder` and :code:`Mirror` and convert them into the query parameters of the Petfinder API.
+
+"""
+
+
+import datetime
+
+from petpy.petpy_types import (
+    AnimalFeatures,
+    Date,
+    PetfinderID
+)
+
+
+def format_dates(before_date: Date = None, after_date: Date = None):
+    r"""
+    Converts the :code:`before_date` and :code:`after_date` search parameters into the ISO8601 date-time strings
+    expected by the Petfinder API.
+
+    Parameters
+    ----------
+    before_date : str, datetime, optional
+        Must be a string in the form of 'YYYY-MM-DD' or 'YYYY-MM-DD H:M:S' or a datetime object.
+    after_date : str, datetime, optional
+        Must be a string in the form of 'YYYY-MM-DD' or 'YYYY-MM-DD H:M:S' or a datetime object.
+
+    Raises
+    ------
+    ValueError
+        Raised when :code:`before_date` is earlier than :code:`after_date`.
+
+    Returns
+    -------
+    tuple
+        The converted :code:`before_date` and :code:`after_date`.
+
+    """
+    if before_date:
+        if isinstance(before_date, str):
+            try:
+                before_date = datetime.datetime.strptime(before_date, '%Y-%m-%d %H:%M:%S')
+            except ValueError:
+                before_date = datetime.datetime.strptime(before_date, '%Y-%m-%d')
+        before_date = before_date.astimezone().replace(microsecond=0).isoformat()
+
+    if after_date:
+        if isinstance(after_date, str):
+            try:
+                after_date = datetime.datetime.strptime(after_date, '%Y-%m-%d %H:%M:%S')
+            except ValueError:
+                after_date = datetime.datetime.strptime(after_date, '%Y-%m-%d')
+        after_date = after_date.astimezone().replace(microsecond=0).isoformat()
+
+    if after_date is not None and before_date is not None:
+        if before_date < after_date:
+            raise ValueError('before_date parameter must be more recent than after_date parameter.')
+
+    return before_date, after_date
+
+
+def search_parameters(breed: AnimalFeatures = None,
+                      size: AnimalFeatures = None,
+                      gender: AnimalFeatures = None,
+                      color: str = None,
+                      coat: AnimalFeatures = None,
+                      animal_type: str = None, 
+                      location: int = None,
+                      distance: int = None,
+                      state: str = None,
+                      country: str = None,
+                      query: str = None,
+                      sort: str = None,
+                      name: str = None,
+                      age: str = None,
+                      good_with_children: bool = None,
+                      good_with_dogs: bool = None,
+                      good_with_cats: bool = None,
+                      declawed: bool = None,
+                      house_trained: bool = None,
+                      special_needs: bool = None,
+                      before_date: Date = None,
+                      after_date: Date = None,
+                      animal_id: PetfinderID = None,
+                      organization_id: PetfinderID = None,
+                      status: str = None,
+                      results_per_page: int = None,
+                      page: int = None):
+    r"""
+    Determines which parameters have been passed and aligns them to their respective Petfinder API parameters.
+
+    Parameters
+    ----------
+    breed: str, tuple or list of str, optional
+        String or tuple or list of strings of desired animal type breed to search.
+    size: {'small', 'medium', 'large', 'xlarge'}, str, tuple or list of str, optional
+        String or tuple or list of strings of desired animal sizes to return. The specified size(s) must be one
+        of 'small', 'medium', 'large', or 'xlarge'.
+    gender: {'male', 'female', 'unknown'} str, tuple or list of str, optional
+        String or tuple or list of strings representing animal genders to return. Must be of 'male', 'female',
+        or 'unknown'.
+    color : str, optional
+        String representing specified animal 'color' to search. Colors for each available animal type in the
+        Petfinder database can be found using the :code:`animal_types()` method.
+    coat : {'short', 'medium', 'long', 'wire', 'hairless', 'curly'}, str, tuple or list of str, optional
+        Desired coat(s) to return. Must be of 'short', 'medium', 'long', 'wire', 'hairless', or 'curly'.
+    animal_type : {'dog', 'cat', 'rabbit', 'small-furry', 'horse', 'bird', 'scales-fins-other', 'barnyard'}, str, optional
+        String representing desired animal type to search. Must be one of 'dog', 'cat', 'rabbit', 'small-furry',
+        'horse', 'bird', 'scales-fins-other', or 'barnyard'.
+    location : str, optional
+        Returns results by specified location. Must be in the format 'city, state' for city-level results,
+        'latitude, longitude' for lat-long results, or 'postal code'.
+    distance : int, optional
+        Returns results within the distance of the specified location. If not given, defaults to 100 miles.
+        Maximum distance range is 500 miles.
+    state : str, optional
+        Filters the results by the selected state. Must be a two-letter state code abbreviation of the state
+        name, such as 'WA' for Washington or 'NY' for New York.
+    country : {'US', 'CA'}, str, optional
+        Filters results to specified country. Must be a two-letter abbreviation of the country and is limited
+        to the United States and Canada.
+    query : str, optional
+        Search matching and partially matching name, city or state.
+    sort : {'recent', '-recent', 'distance', '-distance'}, str, optional
+            Sorts by specified attribute. Leading dashes represents a reverse-order sort. Must be one of 'recent',
+            '-recent', 'distance', or '-distance'.
+    name : str, optional
+        Name of animal or organization to search.
+    age : {'baby', 'young', 'adult', 'senior'} str, tuple or list of str, optional
+        String or tuple or list of strings specifying animal age(s) to return from search. Must be of 'baby',
+        'young', 'adult', 'senior'.
+    good_with_cats: bool, optional
+        Filters returned animal results to animals that are designated as good with cats. Must be a boolean value
+        (True, False) or a value that can be coerced to a boolean (1, 0).
+    good_with_children: bool, optional
+        Filters returned animal results to animals that are designated as good with children. Must be a boolean value
+        (True, False) or a value that can be coerced to a boolean (1, 0).
+    good_with_dogs: bool, optional
+        Filters returned animal results to animals that are designated as good with dogs. Must be a boolean value
+        (True, False) or a value that can be coerced to a boolean (1, 0).
+    before_date: str, datetime, optional
+        Returns results with a `published_at` datetime before the specified time. Must be a string in the form of
+        'YYYY-MM-DD' or 'YYYY-MM-DD H:M:S' or a datetime object.
+    after_date: str, datetime, optional
+        Returns results with a `published_at` datetime after the specified time. Must be a string in the form of
+        'YYYY-MM-DD' or 'YYYY-MM-DD H:M:S' or a datetime object.
+    animal_id : int, tuple or list of int, optional
+        Integer or list or tuple of integers representing animal IDs obtained from Petfinder.
+    organization_id : str, tuple or list of str, optional
+        Returns animals associated with given :code:`organization_id`. Can be a str or a tuple or list of str
+        representing multiple organizations.
+    status : {'adoptable', 'adopted', 'found'} str, optional
+        Animal status to filter search results. Must be one of 'adoptable', 'adopted', or 'found'.
+    results_per_page : int, default 20
+        Number of results to return per page. Defaults to 20 results and cannot exceed 100 results per page.
+    page : int, default 1
+        Specifies which page of results to return. Defaults to the first page of results. If set to :code:`None`,
+        all results will be returned.
+
+    Returns
+    -------
+    dict
+        Dictionary representing aligned parameters and headers for ingestion into the Petfinder API.
+
+    """
+    if isinstance(age, (list, tuple)):
+        age = ','.join(age).replace(' ', '')
+    if isinstance(gender, (list, tuple)):
+        gender = ','.join(gender).replace(' ', '')
+    if isinstance(status, (list, tuple)):
+        status = ','.join(status).replace(' ', '')
+    if isinstance(animal_type, (list, tuple)):
+        animal_type = ','.join(animal_type).replace(' ', '')
+    if isinstance(size, (list, tuple)):
+        size = ','.join(size).replace(' ', '')
+    if isinstance(coat, (list, tuple)):
+        coat = ','.join(coat).replace(' ', '')
+
+    if good_with_cats is not None:
+        good_with_cats = int(good_with_cats)
+    if good_with_children is not None:
+        good_with_children = int(good_with_children)
+    if good_with_dogs is not None:
+        good_with_dogs = int(good_with_dogs)
+    if declawed is not None:
+        declawed = int(declawed)
+    if house_trained is not None:
+        house_trained = int(house_trained)
+    if special_needs is not None:
+        special_needs = int(special_needs)
+
+    check_parameters(
+        animal_types=animal_type,
+        size=size,
+        gender=gender,
+        age=age,
+        coat=coat,
+        status=status,
+        distance=distance,
+        sort=sort,
+        limit=results_per_page,
+        good_with_cats=good_with_cats,
+        good_with_children=good_with_children,
+        good_with_dogs=good_with_dogs,
+        declawed=declawed,
+        house_trained=house_trained,
+        special_needs=special_needs
+    )
+
+    args = {
+        'breed': breed,
+        'size': size,
+        'gender': gender,
+        'age': age,
+        'color': color,
+        'coat': coat,
+        'animal_type': animal_type,
+        'location': location,
+        'distance': distance,
+        'state': state,
+        'country': country,
+        'query': query,
+        'sort': sort,
+        'name': name,
+        'animal_id': animal_id,
+        'organization': organization_id,
+        'good_with_cats': good_with_cats,
+        'good_with_children': good_with_children,
+        'good_with_dogs': good_with_dogs,
+        'house_trained': house_trained,
+        'special_needs': special_needs,
+        'declawed': declawed,
+        'before': before_date,
+        'after': after_date,
+        'status': status,
+        'limit': results_per_page,
+        'page': page
+    }
+
+    args = {key: val for key, val in args.items() if val is not None}
+
+    return args
+
+
+def check_parameters(
+        animal_types: str = None,
+        size: AnimalFeatures = None,
+        gender: AnimalFeatures = None,
+        age: AnimalFeatures = None,
+        coat: AnimalFeatures = None,
+        status: str = None,
+        distance: int = None,
+        good_with_children: bool = None,
+        good_with_dogs: bool = None,
+        good_with_cats: bool = None,
+        declawed: bool = None,
+        house_trained: bool = None,
+        special_needs: bool = None,
+        sort: str = None,
+        limit: int = None):
+    r"""
+    Checks the passed parameters against valid options available in the Petfinder API.
+
+    Parameters
+    ----------
+    animal_type : {'dog', 'cat', 'rabbit', 'small-furry', 'horse', 'bird', 'scales-fins-other', 'barnyard'}, str, optional
+        String representing desired animal type to search. Must be one of 'dog', 'cat', 'rabbit', 'small-furry',
+        'horse', 'bird', 'scales-fins-other', or 'barnyard'.
+    size: {'small', 'medium', 'large', 'xlarge'}, str, tuple or list of str, optional
+        String or tuple or list of strings of desired animal sizes to return. The specified size(s) must be one
+        of 'small', 'medium', 'large', or 'xlarge'.
+    gender: {'male', 'female', 'unknown'} str, tuple or list of str, optional
+        String or tuple or list of strings representing animal genders to return. Must be of 'male', 'female',
+        or 'unknown'.
+    age : {'baby', 'young', 'adult', 'senior'} str, tuple or list of str, optional
+        String or tuple or list of strings specifying animal age(s) to return from search. Must be of 'baby',
+        'young', 'adult', 'senior'.
+    coat : {'short', 'medium', 'long', 'wire', 'hairless', 'curly'}, str, tuple or list of str, optional
+        Desired coat(s) to return. Must be of 'short', 'medium', 'long', 'wire', 'hairless', or 'curly'.
+    status : {'adoptable', 'adopted', 'found'} str, optional
+        Animal status to filter search results. Must be one of 'adoptable', 'adopted', or 'found'.
+    distance : int, optional
+        Returns results within the distance of the specified location. If not given, defaults to 100 miles.
+        Maximum distance range is 500 miles.
+    sort : {'recent', '-recent', 'distance', '-distance'}, str, optional
+            Sorts by specified attribute. Leading dashes represents a reverse-order sort. Must be one of 'recent',
+            '-recent', 'distance', or '-distance'.
+    limit : int, default 20
+        Number of results to return per page. Defaults to 20 results and cannot exceed 100 results per page.
+
+    Raises
+    ------
+    ValueError
+
+    Returns
+    -------
+    None
+        If :code:`ValueError` is not raised, the function returns :code:`None` which signifies the passed API
+        parameters are valid.
+
+    """
+    _animal_types = ('dog', 'cat', 'rabbit', 'small-furry',
+                     'horse', 'bird', 'scales-fins-other', 'barnyard')
+    _sizes = ('small', 'medium', 'large', 'xlarge')
+    _genders = ('male', 'female', 'unknown')
+    _ages = ('baby', 'young', 'adult', 'senior')
+    _coats = ('short', 'medium', 'long', 'wire', 'hairless', 'curly')
+    _status = ('adoptable', 'adopted', 'found')
+    _sort = ('recent', '-recent', 'distance', '-distance')
+
+    incorrect_values = {}
+
+    if animal_types is not None and animal_types not in _animal_types:
+        incorrect_values['animal_types'] = "animal types {types} is not valid. Animal types " \
+                                           "must of the following: {animal_types}"\
+            .format(types=animal_types,
+                    animal_types=_animal_types)
+
+    if size is not None:
+        size_list = size.split(',')
+        diff = list(set(size_list).difference(_sizes))
+
+        if len(diff) > 0:
+            incorrect_values['size'] = "sizes {sizes} are not valid. Sizes must be of the following: {size_list}"\
+                .format(sizes=diff,
+                        size_list=_sizes)
+
+    if gender is not None:
+        gender_list = gender.split(',')
+        diff = list(set(gender_list).difference(_genders))
+
+        if len(diff) > 0:
+            incorrect_values['gender'] = "genders {genders} are not valid. Genders must be of the following: " \
+                                         "{gender_list}"\
+                .format(genders=diff,
+                        gender_list=_genders)
+
+    if age is not None:
+        age_list = age.split(',')
+        diff = list(set(age_list).difference(_ages))
+
+        if len(diff) > 0:
+            incorrect_values['age'] = "ages {age} are not valid. Ages must be of the following: " \
+                                      "{ages_list}" \
+                .format(age=diff,
+                        ages_list=_ages)
+
+    if coat is not None:
+        coat_list = coat.split(',')
+        diff = list(set(coat_list).difference(_coats))
+
+        if len(diff) > 0:
+            incorrect_values['coat'] = "coats {coats} are not valid. Coats must be of the following: " \
+                                       "{coat_list}"\
+                .format(coats=diff,
+                        coat_list=_coats)
+
+    if status is not None:
+        status_list = status.split(',')
+        diff = list(set(status_list).difference(_status))
+
+        if len(diff) > 0:
+            incorrect_values['status'] = "status {status} are not valid. Coats must be of the following: " \
+                                       "{status_list}" \
+                .format(status=diff,
+                        status_list=_coats)
+
+    if sort is not None and sort not in _sort:
+        incorrect_values['sort'] = "sort order {sort} must be one of: {sort_list}"\
+            .format(sort=sort,
+                    sort_list=_sort)
+
+    if distance is not None:
+        if not 0 <= int(distance) <= 500:
+            incorrect_values['distance'] = "distance cannot be greater than 500 or less than 0."
+
+    if good_with_dogs is not None:
+        if not isinstance(good_with_dogs, (bool, int)):
+            incorrect_values['good_with_dogs'] = 'good_with_dogs must be a boolean (True, False, 1, or 0).'
+
+    if good_with_cats is not None:
+        if not isinstance(good_with_cats, (bool, int)):
+            incorrect_values['good_with_cats'] = 'good_with_dogs must be a boolean (True, False, 1, or 0).'
+
+    if good_with_children is not None:
+        if not isinstance(good_with_children, (bool, int)):
+            incorrect_values['good_with_children'] = 'good_with_dogs must be a boolean (True, False, 1, or 0).'
+
+    if declawed is not None:
+        if not isinstance(declawed, (bool, int)):
+            incorrect_values['declawed'] = 'declawed must be a boolean (True, False, 1, or 0).'
+
+    if house_trained is not None:
+        if not isinstance(house_trained, (bool, int)):
+            incorrect_values['house_trained'] = 'house_trained must be a boolean (True, False, 1, or 0).'
+
+    if special_needs is not None:
+        if not isinstance(special_needs, (bool, int)):
+            incorrect_values['special_needs'] = 'house_trained must be a boolean (True, False, 1, or 0).'
+
+    if limit is not None:
+        if int(limit) > 100:
+            incorrect_values['limit'] = "results per page cannot be greater than 100"
+
+    if len(incorrect_values) > 0:
+        errors = ''
+        for k, v in incorrect_values.items():
+            errors = errors + v + '\n'
+
+        raise ValueError(errors)
+
+    return None
@@ -1,7 +1,9 @@
-from typing import Union, TypeAlias
+from typing import TYPE_CHECKING, Union, TypeAlias
 import datetime
 
-from pandas import DataFrame
+# pandas is only imported by type checkers, so importing petpy does not load it.
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 # Parameters
@@ -9,6 +11,7 @@ AnimalTypes: TypeAlias = Union[str, list, tuple]
 PetfinderID: TypeAlias = Union[int, list[int], tuple[int]]
 AnimalFeatures: TypeAlias = Union[str, list[str], tuple[str]]
 Date: TypeAlias = Union[str, datetime]
+Fields: TypeAlias = Union[str, list[str], tuple[str]]
 
 # Return Types
-Animals: TypeAlias = Union[dict, DataFrame]
+Animals: TypeAlias = Union[dict, 'DataFrame']
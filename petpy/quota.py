@@ -0,0 +1,218 @@
+# encoding=utf-8
+
+r"""
+
+The :code:`quota.py` file stores the :code:`QuotaBudget` used to count the requests sent to the Petfinder API each
+day and to stop a :code:`Petfinder` instance before it exceeds the daily request limit of its API key.
+
+"""
+
+
+import datetime
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from petpy.cache import _atomic_write
+from petpy.exceptions import PetfinderQuotaExhausted
+
+
+class QuotaBudget(object):
+    r"""
+    Thread-safe counter of the requests sent to the Petfinder API each day, optionally persisted to a JSON file.
+
+    Every request a :code:`Petfinder` instance sends is taken from the budget before it is sent, and a
+    :code:`PetfinderQuotaExhausted` error is raised instead of sending the request once :code:`budget` requests have
+    been sent that day. The count resets at 00:00 UTC, when the Petfinder API resets its daily limit. If the
+    Petfinder API answers with :code:`429 Too Many Requests`, the rest of the day's budget is marked as spent.
+
+    Requests can also be counted against named jobs, each with its own allowance, so a single crawl cannot spend the
+    whole day's budget. A job is active for every request taken from the budget, from any thread, while its
+    :code:`job()` block is open.
+
+    The counts are written to :code:`path` every :code:`save_every` requests, when a job ends, when the budget is
+    exhausted and when :code:`flush()` is called, which :code:`Petfinder.close()` does. The file is only read when the
+    budget is created, so it can be shared between sessions one after another but not between processes running at
+    the same time, which would overwrite each other's counts.
+
+    Parameters
+    ----------
+    budget : int, default 1000
+        Maximum number of requests to send each day. Defaults to 1000, the daily limit of a Petfinder API key.
+    path : str, optional
+        Path of the JSON file the counts are persisted to, so they are shared between Python sessions. If not given,
+        the counts are kept in memory only.
+    save_every : int, default 20
+        Number of requests taken from the budget between writes of the counts to :code:`path`. If the process
+        stops without calling :code:`flush()`, up to :code:`save_every - 1` requests are not counted on the next
+        run.
+
+    Attributes
+    ----------
+    budget : int
+        Maximum number of requests to send each day.
+    path : str
+        Path of the JSON file the counts are persisted to, or :code:`None`.
+
+    Examples
+    --------
+    >>> quota = QuotaBudget(budget=950, path='petpy_quota.json')
+    >>> pf = Petfinder(key=key, secret=secret, quota=quota)
+    >>> with quota.job('nightly-crawl', allowance=600):
+    >>>     animals = pf.animals(location='WA', pages=None)
+    >>> quota.remaining
+    350
+
+    """
+    def __init__(self, budget: int = 1000, path: str = None, save_every: int = 20):
+        self.budget = budget
+        self.path = path
+        self.save_every = save_every
+        self._unsaved = 0
+        self._state = {'day': _today(), 'used': 0, 'jobs': {}}
+        self._allowances = {}
+        self._jobs = []
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self._state = json.load(f)
+
+    @property
+    def used(self) -> int:
+        r"""
+        Number of requests sent today.
+
+        """
+        with self._lock:
+            self._reset_if_new_day()
+
+            return self._state['used']
+
+    @property
+    def remaining(self) -> int:
+        r"""
+        Number of requests that can still be sent today.
+
+        """
+        with self._lock:
+            self._reset_if_new_day()
+
+            return max(self.budget - self._state['used'], 0)
+
+    def job_used(self, name: str) -> int:
+        r"""
+        Number of requests sent today by the job :code:`name`.
+
+        """
+        with self._lock:
+            self._reset_if_new_day()
+
+            return self._state['jobs'].get(name, 0)
+
+    @contextmanager
+    def job(self, name: str, allowance: int = None):
+        r"""
+        Context manager that counts the requests sent inside the block against the job :code:`name`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the job. Requests are counted against the same name on every run of the job that day.
+        allowance : int, optional
+            Maximum number of requests the job can send each day. If not given, the job is only limited by the
+            daily budget.
+
+        """
+        with self._lock:
+            self._allowances[name] = allowance
+            self._jobs.append(name)
+
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._jobs.remove(name)
+                self._save()
+
+    def spend(self, requests: int = 1):
+        r"""
+        Takes :code:`requests` from today's budget and from the allowance of the active job.
+
+        Raises
+        ------
+        PetfinderQuotaExhausted
+            Raised, without taking anything from the budget, if the daily budget or the active job's allowance does
+            not have :code:`requests` left.
+
+        """
+        with self._lock:
+            self._reset_if_new_day()
+
+            job = self._jobs[-1] if self._jobs else None
+            used = self._state['used']
+
+            if used + requests > self.budget:
+                raise PetfinderQuotaExhausted(
+                    message='The daily budget of {} requests has been spent. Resets at 12:00am UTC'.format(
+                        self.budget),
+                    err={'job': None, 'used': used, 'budget': self.budget}
+                )
+
+            if job is not None:
+                job_used = self._state['jobs'].get(job, 0)
+                allowance = self._allowances.get(job)
+
+                if allowance is not None and job_used + requests > allowance:
+                    raise PetfinderQuotaExhausted(
+                        message='The daily allowance of {} requests for {} has been spent.'.format(allowance, job),
+                        err={'job': job, 'used': job_used, 'budget': allowance}
+                    )
+
+                self._state['jobs'][job] = job_used + requests
+
+            self._state['used'] = used + requests
+            self._unsaved += requests
+
+            if self._unsaved >= self.save_every:
+                self._save()
+
+    def exhaust(self):
+        r"""
+        Marks the rest of today's budget as spent. Called when the Petfinder API reports the daily limit of the API
+        key has been reached.
+
+        """
+        with self._lock:
+            self._reset_if_new_day()
+
+            self._state['used'] = max(self._state['used'], self.budget)
+            self._save()
+
+    def flush(self):
+        r"""
+        Writes the counts to :code:`path`, if there are requests that have not been written yet.
+
+        """
+        with self._lock:
+            if self._unsaved:
+                self._save()
+
+    def _reset_if_new_day(self):
+        today = _today()
+
+        if self._state['day'] != today:
+            self._state = {'day': today, 'used': 0, 'jobs': {}}
+
+    def _save(self):
+        self._unsaved = 0
+
+        if self.path is None:
+            return
+
+        _atomic_write(self.path, json.dumps(self._state, sort_keys=True).encode('utf-8'))
+
+
+def _today() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).date().isoformat()
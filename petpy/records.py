@@ -0,0 +1,153 @@
+# encoding=utf-8
+
+r"""
+
+The :code:`records.py` file stores the :code:`Animal` and :code:`Organization` record types returned by searches
+with :code:`typed_records=True`. They take a fraction of the memory of the nested dictionaries returned by default,
+for searches that keep hundreds of thousands of records in memory.
+
+"""
+
+
+import json
+import sys
+
+
+class Record(object):
+    r"""
+    Base class of the compact record types.
+
+    The hot fields of a record, listed in :code:`HOT_FIELDS`, are kept as attributes in :code:`__slots__`, and short
+    categorical values among them, listed in :code:`INTERNED_FIELDS`, are interned so records share one copy of each.
+    Every other field, such as the nested :code:`contact`, :code:`photos` and :code:`_links` blocks, is kept as one
+    compact JSON string and decoded the first time any of them is accessed.
+
+    Fields are read as attributes, :code:`animal.published_at` or :code:`animal.contact`, or by key as with the
+    dictionaries returned by default, :code:`animal['contact']` or :code:`animal.get('videos')`. Fields missing from
+    the record, such as those dropped with :code:`fields=`, raise an :code:`AttributeError` or :code:`KeyError`.
+    :code:`to_dict()` returns the record as a dictionary.
+
+    Parameters
+    ----------
+    record : dict
+        Record returned by the Petfinder API.
+
+    """
+    __slots__ = ('_cold',)
+
+    HOT_FIELDS = ()
+    INTERNED_FIELDS = ()
+
+    def __init__(self, record: dict):
+        cold = {}
+
+        for name, value in record.items():
+            if name in self.HOT_FIELDS:
+                if name in self.INTERNED_FIELDS and isinstance(value, str):
+                    value = sys.intern(value)
+                setattr(self, name, value)
+            else:
+                cold[name] = value
+
+        self._cold = json.dumps(cold, separators=(',', ':'))
+
+    def __getattr__(self, name):
+        # Only called for names that are not set, so unset slots and cold fields end up here.
+        if name == '_cold' or name.startswith('__'):
+            raise AttributeError(name)
+
+        try:
+            return self._cold_fields()[name]
+        except KeyError:
+            raise AttributeError('{} has no field {!r}'.format(type(self).__name__, name))
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __eq__(self, other):
+        if not isinstance(other, Record):
+            return NotImplemented
+
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return '{}(id={!r})'.format(type(self).__name__, getattr(self, 'id', None))
+
+    def get(self, key, default=None):
+        r"""
+        Returns the field :code:`key`, or :code:`default` if the record does not have it.
+
+        """
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            return default
+
+    def keys(self) -> list:
+        r"""
+        Returns the names of the fields of the record.
+
+        """
+        return [name for name in self.HOT_FIELDS if hasattr(self, name)] + list(self._cold_fields())
+
+    def to_dict(self) -> dict:
+        r"""
+        Returns the record as a dictionary with the fields returned by the Petfinder API.
+
+        """
+        return {name: getattr(self, name) for name in self.keys()}
+
+    def _cold_fields(self) -> dict:
+        if isinstance(self._cold, str):
+            self._cold = json.loads(self._cold)
+
+        return self._cold
+
+
+class Animal(Record):
+    r"""
+    Compact, slotted record of an animal returned by the Petfinder API.
+
+    The identifying, categorical and date fields are kept as attributes, and the nested blocks, such as
+    :code:`breeds`, :code:`attributes`, :code:`contact`, :code:`photos` and :code:`_links`, are decoded the first time
+    one of them is accessed. See :code:`Record`.
+
+    Examples
+    --------
+    >>> animals = pf.animals(location='WA', pages=None, typed_records=True)['animals']
+    >>> dogs = [animal for animal in animals if animal.type == 'Dog' and animal.status == 'adoptable']
+    >>> dogs[0].contact['address']['postcode']
+
+    """
+    HOT_FIELDS = ('id', 'organization_id', 'type', 'species', 'age', 'gender', 'size', 'coat', 'status', 'name',
+                  'status_changed_at', 'published_at', 'distance')
+    INTERNED_FIELDS = ('organization_id', 'type', 'species', 'age', 'gender', 'size', 'coat', 'status')
+
+    __slots__ = HOT_FIELDS
+
+
+class Organization(Record):
+    r"""
+    Compact, slotted record of an organization returned by the Petfinder API.
+
+    The identifying and contact fields are kept as attributes, and the nested blocks, such as :code:`address`,
+    :code:`hours`, :code:`social_media` and :code:`_links`, are decoded the first time one of them is accessed. See
+    :code:`Record`.
+
+    """
+    HOT_FIELDS = ('id', 'name', 'email', 'phone', 'url', 'website', 'distance')
+    INTERNED_FIELDS = ()
+
+    __slots__ = HOT_FIELDS
+
+
+RECORD_TYPES = {
+    'animals': Animal,
+    'organizations': Organization
+}
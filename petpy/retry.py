@@ -0,0 +1,226 @@
+# encoding=utf-8
+
+r"""
+
+The :code:`retry.py` file stores the :code:`RetryPolicy` that decides when and after how long a failed request to
+the Petfinder API is retried, and the :code:`CircuitBreaker` that stops requests from being sent while the Petfinder
+API is failing.
+
+"""
+
+
+import datetime
+from email.utils import parsedate_to_datetime
+import random
+import threading
+import time
+
+from petpy.exceptions import PetfinderCircuitOpen
+
+
+class RetryPolicy(object):
+    r"""
+    Retry policy for requests to the Petfinder API that fail with a server error or a connection error.
+
+    Retries wait an exponentially growing, jittered delay: before retry :code:`n` a random delay between 0 and
+    :code:`min(max_backoff, backoff * 2 ** (n - 1))` seconds, so clients that failed at the same time do not retry at
+    the same time. If the response has a :code:`Retry-After` header, the request is retried after the time it gives
+    instead. A :code:`429 Too Many Requests` response is only retried if it has a :code:`Retry-After` header, as the
+    Petfinder API otherwise uses it to report the daily request limit has been reached.
+
+    Parameters
+    ----------
+    max_retries : int, default 3
+        Maximum number of times a request is retried. If 0, requests are never retried.
+    backoff : float, default 0.5
+        Upper bound, in seconds, of the delay before the first retry. The bound doubles with each retry.
+    max_backoff : float, default 30
+        Maximum upper bound, in seconds, of the delay before a retry.
+    jitter : boolean, default True
+        If :code:`True`, each delay is drawn uniformly between 0 and its upper bound. If :code:`False`, the upper
+        bound is used.
+    statuses : tuple of int, default (429, 500, 502, 503, 504)
+        Response status codes that are retried.
+    max_retry_after : float, default 60
+        Longest :code:`Retry-After` time, in seconds, that is waited for. Responses asking for a longer wait are not
+        retried.
+
+    Examples
+    --------
+    >>> pf = Petfinder(key=key, secret=secret, retry_policy=RetryPolicy(max_retries=5, backoff=1))
+
+    """
+    def __init__(self,
+                 max_retries: int = 3,
+                 backoff: float = 0.5,
+                 max_backoff: float = 30,
+                 jitter: bool = True,
+                 statuses: tuple = (429, 500, 502, 503, 504),
+                 max_retry_after: float = 60):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = tuple(statuses)
+        self.max_retry_after = max_retry_after
+
+    def retries(self, status_code: int) -> bool:
+        r"""
+        Returns :code:`True` if a response with :code:`status_code` is retried.
+
+        """
+        return status_code in self.statuses
+
+    def delay(self, attempt: int, status_code: int = None, retry_after: str = None) -> float:
+        r"""
+        Returns the number of seconds to wait before retrying a request, or :code:`None` if it should not be retried.
+
+        Parameters
+        ----------
+        attempt : int
+            Number of times the request has failed, starting at 1.
+        status_code : int, optional
+            Status code of the failed response, or :code:`None` if the request failed with a connection error.
+        retry_after : str, optional
+            Value of the :code:`Retry-After` header of the failed response.
+
+        Returns
+        -------
+        float
+            Seconds to wait before retrying, or :code:`None`.
+
+        """
+        if attempt > self.max_retries:
+            return None
+
+        if status_code is not None and not self.retries(status_code):
+            return None
+
+        wait = parse_retry_after(retry_after)
+
+        if wait is not None:
+            return wait if wait <= self.max_retry_after else None
+
+        if status_code == 429:
+            return None
+
+        bound = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+
+        return random.uniform(0, bound) if self.jitter else bound
+
+
+class CircuitBreaker(object):
+    r"""
+    Thread-safe circuit breaker that fails requests fast while the Petfinder API is failing.
+
+    The circuit opens after :code:`failure_threshold` consecutive requests fail with a server error or a connection
+    error. While it is open, requests raise :code:`PetfinderCircuitOpen` without being sent. Once
+    :code:`recovery_timeout` seconds have passed, one request is let through as a probe: if it succeeds the circuit
+    closes, and if it fails the circuit opens for another :code:`recovery_timeout`. Requests made while the probe is
+    in flight fail fast. Responses other than server errors, such as :code:`404 Not Found`, count as successes.
+
+    Parameters
+    ----------
+    failure_threshold : int, default 5
+        Number of consecutive failed requests that open the circuit.
+    recovery_timeout : float, default 30
+        Number of seconds the circuit stays open before a probe request is let through.
+
+    Attributes
+    ----------
+    state : str
+        :code:`'closed'` while requests are sent, :code:`'open'` while they fail fast, and :code:`'half-open'`
+        while a probe request is in flight.
+    failures : int
+        Number of consecutive failed requests.
+
+    Examples
+    --------
+    >>> breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+    >>> pf = Petfinder(key=key, secret=secret, circuit_breaker=breaker)
+
+    """
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        r"""
+        Called before a request is sent.
+
+        Raises
+        ------
+        PetfinderCircuitOpen
+            Raised if the circuit is open, or a probe request is already in flight.
+
+        """
+        with self._lock:
+            if self.state == 'closed':
+                return
+
+            waited = time.monotonic() - self._opened_at
+
+            # A probe that never reported back is replaced once the recovery timeout passes again.
+            if waited < self.recovery_timeout:
+                raise PetfinderCircuitOpen(
+                    message='The Petfinder API is failing. Requests are not sent until it recovers.',
+                    err={'failures': self.failures, 'retry_in': self.recovery_timeout - waited}
+                )
+
+            self.state = 'half-open'
+            self._opened_at = time.monotonic()
+
+    def record_success(self):
+        r"""
+        Called when a request succeeds. Closes the circuit.
+
+        """
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        r"""
+        Called when a request fails with a server error or a connection error. Opens the circuit if the request was
+        a probe or :code:`failure_threshold` consecutive requests have failed.
+
+        """
+        with self._lock:
+            self.failures += 1
+
+            if self.state == 'half-open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self._opened_at = time.monotonic()
+
+
+def parse_retry_after(value: str) -> float:
+    r"""
+    Returns the number of seconds given by a :code:`Retry-After` header, either as a number of seconds or as an HTTP
+    date, or :code:`None` if the header is missing or cannot be parsed.
+
+    """
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at is None:
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+
+    return max((retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0)
@@ -0,0 +1,371 @@
+# encoding=utf-8
+
+r"""
+
+The :code:`sinks.py` file stores the sinks that the pages of an :code:`animals()` or :code:`organizations()` search
+can be written to as they are returned, so large crawls can be saved to NDJSON, CSV or Parquet files without
+holding every record in memory.
+
+"""
+
+
+import csv
+import json
+import os
+
+from petpy.flatten import RecordFlattener, compile_fields, is_missing, project_record, schema_columns
+
+
+class Sink(object):
+    r"""
+    Base class of the sinks that search results are written to a page at a time.
+
+    A sink is opened by :code:`Petfinder.animals()` or :code:`Petfinder.organizations()` with the type of record and
+    the :code:`fields` of the search before the first page is written. The same sink can be passed to several
+    searches for the same type of record and fields, for example to write the animals of several locations to one
+    file. Sinks should be closed once every search has been written, either with :code:`close()` or by using the
+    sink as a context manager.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file the records are written to.
+
+    Attributes
+    ----------
+    path : str
+        Path of the file the records are written to.
+    key : str
+        The type of record written to the sink, :code:`'animals'` or :code:`'organizations'`, or :code:`None` if
+        the sink has not been opened.
+    fields : tuple of str
+        The fields written to the sink, or :code:`None` if every field is written.
+    rows : int
+        Number of records written to the sink.
+
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.key = None
+        self.fields = None
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def open(self, key: str, fields=None):
+        r"""
+        Prepares the sink for records of type :code:`key`. Called before the first page of a search is written.
+
+        Parameters
+        ----------
+        key : {'animals', 'organizations'}
+            The type of record that will be written.
+        fields : str, list or tuple of str, optional
+            Dotted paths of the fields to write. If not given, every field is written.
+
+        """
+        if isinstance(fields, str):
+            fields = (fields,)
+        elif fields is not None:
+            fields = tuple(fields)
+
+        if self.key is None:
+            self.key = key
+            self.fields = fields
+            self._open()
+        elif (key, fields) != (self.key, self.fields):
+            raise ValueError('{} is already open for {} with fields {}.'.format(type(self).__name__, self.key,
+                                                                                 self.fields))
+
+    def write(self, records):
+        r"""
+        Writes a page of records, or a single record, to the sink.
+
+        Parameters
+        ----------
+        records : list or dict
+            Records as returned by the Petfinder API.
+
+        """
+        if self.key is None:
+            raise ValueError('{} must be opened before records are written.'.format(type(self).__name__))
+
+        if isinstance(records, dict):
+            records = [records]
+
+        if records:
+            self._write(records)
+            self.rows += len(records)
+
+    def close(self):
+        r"""
+        Writes any buffered records and closes the file.
+
+        """
+        pass
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _write(self, records):
+        raise NotImplementedError
+
+
+class NDJSONSink(Sink):
+    r"""
+    Writes records to a newline-delimited JSON file, one record per line, with the nesting returned by the Petfinder
+    API.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file the records are written to.
+    append : boolean, default False
+        If :code:`True`, records are added to the end of an existing file instead of replacing it.
+
+    Examples
+    --------
+    >>> with NDJSONSink('animals.ndjson') as sink:
+    >>>     pf.animals(location='Seattle, WA', pages=None, sink=sink)
+
+    """
+    def __init__(self, path: str, append: bool = False):
+        super().__init__(path)
+        self.append = append
+        self._file = None
+        self._spec = None
+
+    def _open(self):
+        self._spec = compile_fields(self.fields) if self.fields is not None else None
+        self._file = open(self.path, 'a' if self.append else 'w', encoding='utf-8')
+
+    def _write(self, records):
+        spec = self._spec
+        lines = []
+
+        for record in records:
+            lines.append(json.dumps(project_record(record, spec) if spec is not None else record))
+
+        self._file.write('\n'.join(lines) + '\n')
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _TabularSink(Sink):
+    r"""
+    Base class of the sinks that write flattened records to a fixed set of columns, as returned by
+    :code:`flatten.schema_columns`. Fields that are missing from a record are written as empty values and fields
+    outside the columns are not written, so every page has the same columns.
+
+    """
+    columns = None
+
+    def _open(self):
+        self.columns = schema_columns(self.key, self.fields)
+        self._start()
+
+    def _write(self, records):
+        flattener = RecordFlattener(self.key, fields=self.fields)
+        flattener.add(records)
+
+        self._write_columns(flattener.to_columns(self.columns), len(records))
+
+    def _start(self):
+        raise NotImplementedError
+
+    def _write_columns(self, values, rows):
+        raise NotImplementedError
+
+
+class CSVSink(_TabularSink):
+    r"""
+    Writes flattened records to a CSV file with one column per field, named as in the DataFrames returned with
+    :code:`return_df=True`. The columns are fixed when the sink is opened, so every page has the same columns. Lists,
+    such as :code:`photos` and :code:`tags`, are written as JSON and missing values as empty strings.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file the records are written to.
+
+    Examples
+    --------
+    >>> with CSVSink('organizations.csv') as sink:
+    >>>     pf.organizations(state='WA', pages=None, sink=sink)
+
+    """
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file = None
+        self._writer = None
+
+    def _start(self):
+        self._file = open(self.path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def _write_columns(self, values, rows):
+        self._writer.writerows([_csv_value(value) for value in row] for row in zip(*values))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ParquetSink(_TabularSink):
+    r"""
+    Writes flattened records to a Parquet file with one column per field, named as in the DataFrames returned with
+    :code:`return_df=True`. Requires the :code:`pyarrow` library, which can be installed with
+    :code:`pip install petpy[parquet]`.
+
+    The schema is fixed when the sink is opened, so every row group has the same columns and types. Animal IDs are
+    stored as integers, :code:`distance` as a float, the animal :code:`breeds`, :code:`attributes` and
+    :code:`environment` flags as booleans and every other field as a string. Lists, such as :code:`photos` and
+    :code:`tags`, are stored as JSON strings. Missing values, and values that do not match the type of their column,
+    are stored as nulls.
+
+    Records are buffered until :code:`row_group_size` records have been written and are then written as a row
+    group, so at most one row group is held in memory.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file the records are written to.
+    row_group_size : int, default 10000
+        Number of records in each row group.
+    compression : str, default 'snappy'
+        Compression codec passed to :code:`pyarrow.parquet.ParquetWriter`.
+
+    Examples
+    --------
+    >>> with ParquetSink('animals.parquet') as sink:
+    >>>     pf.animals(pages=None, sink=sink)
+    >>> animals = pandas.read_parquet('animals.parquet')
+
+    """
+    def __init__(self, path: str, row_group_size: int = 10000, compression: str = 'snappy'):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError('ParquetSink requires the pyarrow library. '
+                              'It can be installed with pip install petpy[parquet]')
+
+        super().__init__(path)
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._writer = None
+        self._schema = None
+        self._kinds = None
+        self._buffer = None
+        self._buffered = 0
+
+    def _start(self):
+        pa = self._pa
+        types = {'int': pa.int64(), 'float': pa.float64(), 'bool': pa.bool_(), 'str': pa.string()}
+
+        self._kinds = [_ARROW_KINDS[self.key].get(column, 'str') for column in self.columns]
+        self._schema = pa.schema([(column, types[kind]) for column, kind in zip(self.columns, self._kinds)])
+        self._writer = self._pq.ParquetWriter(self.path, self._schema, compression=self.compression)
+        self._buffer = [[] for _ in self.columns]
+
+    def _write_columns(self, values, rows):
+        for buffer, column, kind in zip(self._buffer, values, self._kinds):
+            buffer.extend(_arrow_value(value, kind) for value in column)
+
+        self._buffered += rows
+
+        if self._buffered >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if self._buffered == 0:
+            return
+
+        table = self._pa.Table.from_arrays([self._pa.array(buffer, type=field.type)
+                                            for buffer, field in zip(self._buffer, self._schema)],
+                                           schema=self._schema)
+        self._writer.write_table(table)
+
+        self._buffer = [[] for _ in self.columns]
+        self._buffered = 0
+
+    def close(self):
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+
+
+_ARROW_KINDS = {
+    'animals': {
+        'id': 'int',
+        'distance': 'float',
+        'breeds.mixed': 'bool',
+        'breeds.unknown': 'bool',
+        'attributes.spayed_neutered': 'bool',
+        'attributes.house_trained': 'bool',
+        'attributes.declawed': 'bool',
+        'attributes.special_needs': 'bool',
+        'attributes.shots_current': 'bool',
+        'environment.children': 'bool',
+        'environment.dogs': 'bool',
+        'environment.cats': 'bool'
+    },
+    'organizations': {
+        'distance': 'float'
+    }
+}
+
+
+def open_sink(path: str, **kwargs) -> Sink:
+    r"""
+    Returns a sink for :code:`path` chosen by its file extension: :code:`.parquet` for a :code:`ParquetSink`,
+    :code:`.csv` for a :code:`CSVSink` and :code:`.ndjson`, :code:`.jsonl` or :code:`.json` for an
+    :code:`NDJSONSink`. Keyword arguments are passed to the sink.
+
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == '.parquet':
+        return ParquetSink(path, **kwargs)
+    if extension == '.csv':
+        return CSVSink(path, **kwargs)
+    if extension in ('.ndjson', '.jsonl', '.json'):
+        return NDJSONSink(path, **kwargs)
+
+    raise ValueError('Unable to choose a sink for {}. The file extension must be one of .parquet, .csv, '
+                     '.ndjson, .jsonl or .json.'.format(path))
+
+
+def _csv_value(value):
+    if is_missing(value):
+        return ''
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+
+    return value
+
+
+def _arrow_value(value, kind):
+    if is_missing(value):
+        return None
+
+    if kind == 'str':
+        return value if isinstance(value, str) else json.dumps(value)
+    if kind == 'bool':
+        return value if isinstance(value, bool) else None
+    if kind == 'int':
+        return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
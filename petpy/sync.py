@@ -0,0 +1,226 @@
+# encoding=utf-8
+
+r"""
+
+The :code:`sync.py` file stores the :code:`SyncState` store of watermarks used by :code:`Petfinder.sync_animals` to
+request only the animals published or changed since the previous sync.
+
+"""
+
+
+import datetime
+import json
+import os
+import threading
+from urllib.parse import urlencode
+
+from petpy.cache import _atomic_write
+
+
+class SyncState(object):
+    r"""
+    Thread-safe store of the watermarks of incremental syncs, optionally persisted to a JSON file.
+
+    Each sync is stored under a key with its watermark, the latest :code:`published_at` timestamp of the records it
+    has returned, the IDs of the records published at exactly that time, and the latest :code:`status_changed_at`
+    timestamp of the records it has seen. A watermark is only saved once a sync has returned every new record, so a
+    sync that fails partway through is repeated from the previous watermark.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path of the JSON file the watermarks are persisted to. If not given, the watermarks are kept in memory only.
+
+    Attributes
+    ----------
+    path : str
+        Path of the JSON file the watermarks are persisted to, or :code:`None`.
+
+    Examples
+    --------
+    >>> state = SyncState('petpy_sync.json')
+    >>> new_cats = pf.sync_animals(state, animal_type='cat', location='Seattle, WA')
+    >>> state.get(state.keys()[0])['watermark']
+    '2024-05-01T17:02:11+0000'
+
+    """
+    def __init__(self, path: str = None):
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def keys(self) -> list:
+        r"""
+        Returns the keys of the stored syncs.
+
+        """
+        with self._lock:
+            return list(self._entries)
+
+    def get(self, key: str) -> dict:
+        r"""
+        Returns a copy of the watermark stored for :code:`key`, a dictionary with the :code:`watermark` timestamp,
+        the :code:`ids` published at that time and the latest :code:`status_changed_at`, or :code:`None` if nothing
+        is stored.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            return dict(entry, ids=list(entry['ids'])) if entry is not None else None
+
+    def set(self, key: str, entry: dict):
+        r"""
+        Stores the watermark of :code:`key` and saves the state to disk.
+
+        """
+        with self._lock:
+            self._entries[key] = {'watermark': entry['watermark'], 'ids': list(entry['ids']),
+                                  'status_changed_at': entry.get('status_changed_at')}
+            self._save()
+
+    def reset(self, key: str = None):
+        r"""
+        Removes the watermark of :code:`key`, or of every sync if :code:`key` is not given, so the next sync
+        starts again from its :code:`start_date`.
+
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+            self._save()
+
+    def _save(self):
+        if self.path is None:
+            return
+
+        _atomic_write(self.path, json.dumps(self._entries, indent=2, sort_keys=True).encode('utf-8'))
+
+
+def default_sync_key(key: str, params: dict) -> str:
+    r"""
+    Returns the default key of a sync, built from the record type and the search parameters that select the
+    records. Parameters that change between runs, such as the watermark and page size, are left out.
+
+    """
+    criteria = {k: v for k, v in params.items() if k not in ('after', 'before', 'limit', 'page', 'sort')}
+
+    return key + '?' + urlencode(sorted(criteria.items()))
+
+
+def parse_timestamp(value: str) -> datetime.datetime:
+    r"""
+    Returns a Petfinder API timestamp, such as :code:`'2024-05-01T17:02:11+0000'`, as a timezone-aware datetime.
+    Offsets written as :code:`'Z'` or :code:`'+00:00'`, as in the :code:`after` and :code:`before` search
+    parameters, are accepted as well.
+
+    """
+    if value.endswith('Z'):
+        value = value[:-1] + '+0000'
+    elif len(value) > 6 and value[-6] in '+-' and value[-3] == ':':
+        value = value[:-3] + value[-2:]
+
+    return datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z')
+
+
+def epoch_seconds(timestamp) -> int:
+    r"""
+    Returns an ISO8601 timestamp, such as the :code:`published_at` of a record or an :code:`after` search parameter,
+    or a datetime, as whole seconds since the epoch. Returns :code:`None` if :code:`timestamp` is :code:`None`.
+
+    """
+    if timestamp is None:
+        return None
+
+    if isinstance(timestamp, str):
+        timestamp = parse_timestamp(timestamp)
+
+    return int(timestamp.timestamp())
+
+
+def is_new(record: dict, entry: dict) -> bool:
+    r"""
+    Returns :code:`True` if a record was published after the watermark :code:`entry`, or at the watermark but not
+    among the records already returned. Every record is new if :code:`entry` is :code:`None`.
+
+    """
+    if entry is None:
+        return True
+
+    published = record.get('published_at')
+
+    if published is None:
+        return False
+
+    published = parse_timestamp(published)
+    watermark = parse_timestamp(entry['watermark'])
+
+    return published > watermark or (published == watermark and record.get('id') not in entry['ids'])
+
+
+def is_changed(record: dict, entry: dict) -> bool:
+    r"""
+    Returns :code:`True` if the status of a record changed after the latest :code:`status_changed_at` seen by the
+    syncs of the watermark :code:`entry`. No record is changed if :code:`entry` is :code:`None`.
+
+    """
+    if entry is None or entry.get('status_changed_at') is None:
+        return False
+
+    changed = record.get('status_changed_at')
+
+    if changed is None:
+        return False
+
+    return parse_timestamp(changed) > parse_timestamp(entry['status_changed_at'])
+
+
+def advance(entry: dict, records: list) -> dict:
+    r"""
+    Returns the watermark after a sync that saw :code:`records`: the latest :code:`published_at` of the records and
+    of :code:`entry`, with the IDs of the records published at that time, and the latest
+    :code:`status_changed_at`.
+
+    """
+    watermark = entry['watermark'] if entry is not None else None
+    latest = parse_timestamp(watermark) if watermark is not None else None
+    ids = set(entry['ids']) if entry is not None else set()
+    status_changed_at = entry.get('status_changed_at') if entry is not None else None
+    latest_change = parse_timestamp(status_changed_at) if status_changed_at is not None else None
+
+    for record in records:
+        changed = record.get('status_changed_at')
+
+        if changed is not None:
+            timestamp = parse_timestamp(changed)
+
+            if latest_change is None or timestamp > latest_change:
+                status_changed_at, latest_change = changed, timestamp
+
+        published = record.get('published_at')
+
+        if published is None:
+            continue
+
+        timestamp = parse_timestamp(published)
+
+        if latest is None or timestamp > latest:
+            watermark, latest, ids = published, timestamp, {record.get('id')}
+        elif timestamp == latest:
+            ids.add(record.get('id'))
+
+    if watermark is None:
+        return entry
+
+    return {'watermark': watermark, 'ids': sorted(ids, key=str), 'status_changed_at': status_changed_at}
@@ -0,0 +1,633 @@
+# encoding=utf-8
+
+r"""
+
+The :code:`testing.py` file stores :code:`PetfinderServer`, a local stand-in for the Petfinder API v2 that
+:code:`Petfinder` and :code:`AsyncPetfinder` can be pointed at to test and benchmark code using :code:`petpy`
+without an API key or spending the daily request limit, and the factories of the animal and organization records
+it serves.
+
+The server can also be started from the command line, printing its URL::
+
+    python -m petpy.testing --animals 10000 --latency 0.05
+
+"""
+
+
+import argparse
+import datetime
+import hashlib
+import json
+import math
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from petpy.sync import epoch_seconds
+from petpy.vocabulary import parameter_value
+
+
+_TYPES = ('Dog', 'Cat', 'Rabbit', 'Small & Furry', 'Horse', 'Bird', 'Scales, Fins & Other', 'Barnyard')
+
+_STATUS_TITLES = {
+    400: 'Invalid Request',
+    401: 'Unauthorized',
+    403: 'Access Denied',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    429: 'Too Many Requests',
+    500: 'Unexpected Error',
+    502: 'Bad Gateway',
+    503: 'Service Unavailable',
+    504: 'Gateway Timeout'
+}
+
+# Animal search criteria the server filters on, mapped to the record field they match. Values are compared without
+# case and can be comma-separated lists, as with the Petfinder API.
+_ANIMAL_FILTERS = {
+    'type': 'type',
+    'organization': 'organization_id',
+    'status': 'status',
+    'age': 'age',
+    'gender': 'gender',
+    'size': 'size',
+    'coat': 'coat'
+}
+
+
+class PetfinderServer(object):
+    r"""
+    Local stand-in for the Petfinder API v2, serving generated animals and organizations over HTTP from a background
+    thread.
+
+    The server implements the :code:`oauth2/token`, :code:`types`, :code:`types/{type}`, :code:`types/{type}/breeds`,
+    :code:`animals` and :code:`organizations` endpoints, with the pagination, error responses and access token
+    expiry of the Petfinder API. Animal searches can be filtered by type, organization, status, age, gender, size,
+    coat and publish date and sorted by :code:`recent` or :code:`-recent`. Organization searches can be filtered by
+    state and country. Other search criteria are accepted and ignored. Search pages are sent with an :code:`ETag`,
+    and a request whose :code:`If-None-Match` header matches it is answered with :code:`304 Not Modified`.
+
+    Failures are injected with :code:`fail()`, which makes the next requests return an error status such as
+    :code:`429` or :code:`500`, and :code:`expire_tokens()`, which makes every access token issued so far be
+    rejected with :code:`401`. Animals can be changed while the server is running with :code:`update_animal()`.
+
+    Parameters
+    ----------
+    animals : int or list, default 1000
+        Number of animals to serve, built with :code:`animal_record()`, or a list of animal records.
+    organizations : int or list, default 100
+        Number of organizations to serve, built with :code:`organization_record()`, or a list of organization
+        records.
+    latency : float, default 0
+        Number of seconds every response is delayed by. Can be changed while the server is running.
+    token_ttl : int, default 3600
+        Number of seconds access tokens are valid for.
+    key : str, optional
+        API key the server accepts. If not given, any key is accepted.
+    secret : str, optional
+        Secret key the server accepts. If not given, any secret is accepted.
+    host : str, default '127.0.0.1'
+        Address the server listens on.
+    port : int, default 0
+        Port the server listens on. Defaults to a free port chosen by the operating system.
+
+    Attributes
+    ----------
+    url : str
+        Base URL of the server's API, to pass as the :code:`host` of :code:`Petfinder` or :code:`AsyncPetfinder`.
+    requests : int
+        Number of requests the server has received.
+    log : list
+        The requests the server has received, oldest first, each a dictionary with the :code:`method`, the
+        :code:`path` with its query string, the parsed :code:`query` and the :code:`client` address and port of the
+        connection the request was sent on. Can be cleared while the server is running.
+    connections : int
+        Number of client connections currently open to the server.
+    latency : float
+        Number of seconds every response is delayed by.
+
+    Examples
+    --------
+    >>> with PetfinderServer(animals=5000, latency=0.05) as server:
+    >>>     pf = Petfinder(key='key', secret='secret', host=server.url)
+    >>>     server.fail(500, times=2)
+    >>>     animals = pf.animals(results_per_page=100, pages=None)
+
+    """
+    def __init__(self,
+                 animals=1000,
+                 organizations=100,
+                 latency: float = 0,
+                 token_ttl: int = 3600,
+                 key: str = None,
+                 secret: str = None,
+                 host: str = '127.0.0.1',
+                 port: int = 0):
+        if isinstance(animals, int):
+            animals = [animal_record(i) for i in range(animals)]
+        if isinstance(organizations, int):
+            organizations = [organization_record(i) for i in range(organizations)]
+
+        # Animals are kept newest first, the order of the default 'recent' sort.
+        published = [epoch_seconds(record['published_at']) for record in animals]
+        order = sorted(range(len(animals)), key=lambda i: published[i], reverse=True)
+
+        self._animals = [animals[i] for i in order]
+        self._published = [published[i] for i in order]
+        self._animal_ids = {str(record['id']): record for record in animals}
+        self._organizations = list(organizations)
+        self._organization_ids = {record['id'].lower(): record for record in organizations}
+        # Records are encoded once, so encoding search pages does not make the server the bottleneck of a benchmark.
+        self._encoded = {id(record): json.dumps(record) for record in self._animals + self._organizations}
+
+        self.latency = latency
+        self.token_ttl = token_ttl
+        self.key = key
+        self.secret = secret
+        self.requests = 0
+        self.log = []
+        self.connections = 0
+        self._tokens = {}
+        self._faults = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.petfinder = self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+
+        return 'http://{}:{}/v2/'.format(host, port)
+
+    def start(self):
+        r"""
+        Starts serving requests from a background thread. Returns the server.
+
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05},
+                                            daemon=True)
+            self._thread.start()
+
+        return self
+
+    def stop(self):
+        r"""
+        Stops the server and closes its socket.
+
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+
+        self._server.server_close()
+
+    def fail(self, status: int, times: int = 1, retry_after: str = None, endpoint: str = None):
+        r"""
+        Makes the next :code:`times` requests return an error response with :code:`status` instead of their result.
+
+        Parameters
+        ----------
+        status : int
+            Status code of the error responses, such as 401, 429 or 500.
+        times : int, default 1
+            Number of requests that fail.
+        retry_after : str, optional
+            Value of the :code:`Retry-After` header of the error responses.
+        endpoint : str, optional
+            Only requests to endpoints starting with :code:`endpoint`, such as :code:`'animals'` or
+            :code:`'oauth2/token'`, fail. If not given, any request fails, including access token requests.
+
+        """
+        with self._lock:
+            self._faults.append({'status': status, 'times': times, 'retry_after': retry_after,
+                                 'endpoint': endpoint})
+
+    def expire_tokens(self):
+        r"""
+        Expires every access token issued so far, so requests sent with them are rejected with :code:`401`.
+
+        """
+        with self._lock:
+            self._tokens.clear()
+
+    def update_animal(self, animal_id: int, **fields) -> dict:
+        r"""
+        Changes the fields of a served animal, such as its :code:`status` and :code:`status_changed_at`, and returns
+        the updated record. The :code:`published_at` of an animal cannot be changed.
+
+        Raises
+        ------
+        KeyError
+            Raised when no animal has the ID :code:`animal_id`.
+        ValueError
+            Raised when :code:`published_at` is given.
+
+        """
+        if 'published_at' in fields:
+            raise ValueError('published_at cannot be changed, as it sets the order animals are served in.')
+
+        with self._lock:
+            record = self._animal_ids[str(animal_id)]
+            record.update(fields)
+            self._encoded[id(record)] = json.dumps(record)
+
+        return record
+
+    def _respond(self, method: str, path: str, query: dict, headers, body: bytes):
+        r"""
+        Returns the status code, body and extra headers of the response to a request. The body is a JSON object, or
+        a string of already encoded JSON.
+
+        """
+        endpoint = path[len('/v2/'):] if path.startswith('/v2/') else path
+
+        with self._lock:
+            self.requests += 1
+            fault = self._take_fault(endpoint)
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if fault is not None:
+            extra = [('Retry-After', str(fault['retry_after']))] if fault['retry_after'] is not None else []
+            return _problem(fault['status'], 'Injected failure.') + (extra,)
+
+        if endpoint == 'oauth2/token':
+            if method != 'POST':
+                return _problem(405, 'Use POST to request an access token.') + ([],)
+
+            return self._token(parse_qs(body.decode('utf-8'))) + ([],)
+
+        if method != 'GET':
+            return _problem(405, 'Method not allowed.') + ([],)
+
+        if not self._authorized(headers.get('Authorization', '')):
+            return _problem(401, 'Access token invalid or expired') + ([],)
+
+        parts = endpoint.rstrip('/').split('/')
+
+        if parts[0] == 'types':
+            return self._types(parts[1:]) + ([],)
+
+        if parts[0] in ('animals', 'organizations'):
+            if len(parts) == 2:
+                records = self._animal_ids if parts[0] == 'animals' else self._organization_ids
+                record = records.get(parts[1].lower())
+
+                if record is None:
+                    return _problem(404, 'Not Found') + ([],)
+
+                return 200, {parts[0][:-1]: record}, []
+
+            if len(parts) == 1:
+                status, payload = self._search(parts[0], query)
+
+                if status != 200:
+                    return status, payload, []
+
+                etag = '"{}"'.format(hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32])
+
+                if headers.get('If-None-Match') == etag:
+                    return 304, '', [('ETag', etag)]
+
+                return 200, payload, [('ETag', etag)]
+
+        return _problem(404, 'Not Found') + ([],)
+
+    def _take_fault(self, endpoint):
+        for fault in self._faults:
+            if fault['endpoint'] is None or endpoint.startswith(fault['endpoint']):
+                fault['times'] -= 1
+
+                if fault['times'] <= 0:
+                    self._faults.remove(fault)
+
+                return fault
+
+        return None
+
+    def _token(self, form):
+        key = form.get('client_id', [None])[0]
+        secret = form.get('client_secret', [None])[0]
+
+        if (self.key is not None and key != self.key) or (self.secret is not None and secret != self.secret):
+            return 401, {'error': 'invalid_client', 'error_description': 'Client authentication failed',
+                         'message': 'Client authentication failed'}
+
+        token = uuid.uuid4().hex
+
+        with self._lock:
+            self._tokens[token] = time.monotonic() + self.token_ttl
+
+        return 200, {'token_type': 'Bearer', 'expires_in': self.token_ttl, 'access_token': token}
+
+    def _authorized(self, authorization):
+        token = authorization[len('Bearer '):] if authorization.startswith('Bearer ') else None
+
+        with self._lock:
+            expires_at = self._tokens.get(token)
+
+        return expires_at is not None and time.monotonic() < expires_at
+
+    def _types(self, parts):
+        if not parts:
+            return 200, {'types': [_animal_type(name) for name in _TYPES]}
+
+        types = {parameter_value(name): name for name in _TYPES}
+        name = types.get(parts[0].lower())
+
+        if name is None:
+            return _problem(404, 'Not Found')
+
+        if len(parts) == 1:
+            return 200, {'type': _animal_type(name)}
+
+        if parts[1:] == ['breeds']:
+            return 200, {'breeds': [{'name': '{} Breed {}'.format(name, i),
+                                     '_links': {'type': {'href': '/v2/types/{}'.format(parameter_value(name))}}}
+                                    for i in range(1, 11)]}
+
+        return _problem(404, 'Not Found')
+
+    def _search(self, key, query):
+        params = {name: values[-1] for name, values in query.items()}
+
+        try:
+            limit = int(params.get('limit', 20))
+            page = int(params.get('page', 1))
+        except ValueError:
+            return _problem(400, 'limit and page must be integers.')
+
+        if not 1 <= limit <= 100 or page < 1:
+            return 400, {'type': 'https://www.petfinder.com/developers/v2/docs/errors/ERR-00002/', 'status': 400,
+                         'title': _STATUS_TITLES[400], 'detail': 'The request contains invalid parameters.',
+                         'invalid-params': [{'in': 'query', 'path': 'limit' if page >= 1 else 'page',
+                                             'message': 'Invalid value.'}]}
+
+        if key == 'animals':
+            records = self._filter_animals(params)
+        else:
+            records = self._filter_organizations(params)
+
+        total_pages = max(int(math.ceil(len(records) / limit)), 1)
+        pagination = {
+            'count_per_page': limit,
+            'total_count': len(records),
+            'current_page': page,
+            'total_pages': total_pages
+        }
+
+        if page < total_pages:
+            pagination['_links'] = {'next': {'href': '/v2/{}?limit={}&page={}'.format(key, limit, page + 1)}}
+
+        encoded = ','.join(self._encoded[id(record)] for record in records[(page - 1) * limit:page * limit])
+
+        return 200, '{{"{}": [{}], "pagination": {}}}'.format(key, encoded, json.dumps(pagination))
+
+    def _filter_animals(self, params):
+        # petpy sends the animal type as 'animal_type', the Petfinder API documents it as 'type'.
+        if 'animal_type' in params:
+            params.setdefault('type', params['animal_type'])
+
+        filters = [(field, set(parameter_value(value) for value in params[name].split(',')))
+                   for name, field in _ANIMAL_FILTERS.items() if name in params]
+        after = epoch_seconds(params.get('after'))
+        before = epoch_seconds(params.get('before'))
+
+        records = [record for record, published in zip(self._animals, self._published)
+                   if (after is None or published > after) and (before is None or published < before) and
+                   all(parameter_value(record.get(field) or '') in values for field, values in filters)]
+
+        if params.get('sort') == '-recent':
+            records.reverse()
+
+        return records
+
+    def _filter_organizations(self, params):
+        records = self._organizations
+
+        for name in ('state', 'country'):
+            if name in params:
+                records = [record for record in records
+                           if (record['address'].get(name) or '').lower() == params[name].lower()]
+
+        return records
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+
+        with self.server.petfinder._lock:
+            self.server.petfinder.connections += 1
+
+    def finish(self):
+        try:
+            super().finish()
+        finally:
+            with self.server.petfinder._lock:
+                self.server.petfinder.connections -= 1
+
+    def _handle(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        server = self.server.petfinder
+
+        with server._lock:
+            server.log.append({'method': self.command, 'path': self.path, 'query': query,
+                               'client': self.client_address[:2]})
+
+        status, payload, headers = server._respond(self.command, url.path, query, self.headers, body)
+        content = (payload if isinstance(payload, str) else json.dumps(payload)).encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json' if status < 400 else 'application/problem+json')
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def animal_record(i: int, **fields) -> dict:
+    r"""
+    Returns an animal with the same fields and nesting as those returned by the Petfinder API v2. Animal :code:`i`
+    is published :code:`i` minutes after 2024-01-01 00:00 UTC and belongs to organization :code:`WA{i % 500}`.
+
+    Fields given as keyword arguments replace those of the record. Nested fields are named with double underscores,
+    such as :code:`breeds__primary='Tabby'` or :code:`contact__address__city='Portland'`.
+
+    Examples
+    --------
+    >>> animal_record(2, type='Cat', name='Mittens', environment__children=None)['environment']
+    {'children': None, 'dogs': None, 'cats': False}
+
+    """
+    published_at = (datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc) +
+                    datetime.timedelta(minutes=i)).isoformat()
+    org_id = 'WA{}'.format(i % 500)
+
+    record = {
+        'id': i,
+        'organization_id': org_id,
+        'url': 'https://www.petfinder.com/dog/pet-{}/wa/seattle/shelter-{}/'.format(i, org_id.lower()),
+        'type': 'Dog',
+        'species': 'Dog',
+        'breeds': {'primary': 'Labrador Retriever', 'secondary': None, 'mixed': True, 'unknown': False},
+        'colors': {'primary': 'Black', 'secondary': None, 'tertiary': None},
+        'age': ('Baby', 'Young', 'Adult', 'Senior')[i % 4],
+        'gender': ('Male', 'Female')[i % 2],
+        'size': ('Small', 'Medium', 'Large', 'Extra Large')[i % 4],
+        'coat': 'Short',
+        'attributes': {'spayed_neutered': True, 'house_trained': bool(i % 2), 'declawed': None,
+                       'special_needs': False, 'shots_current': True},
+        'environment': {'children': True, 'dogs': None, 'cats': False},
+        'tags': ['Friendly', 'Playful', 'Smart'],
+        'name': 'Pet {}'.format(i),
+        'description': 'A friendly dog looking for a home. Loves walks, treats and naps in the sun.',
+        'organization_animal_id': 'A{}'.format(i),
+        'photos': [
+            {
+                'small': 'https://photos.petfinder.com/photos/pets/{}/1/?width=100'.format(i),
+                'medium': 'https://photos.petfinder.com/photos/pets/{}/1/?width=300'.format(i),
+                'large': 'https://photos.petfinder.com/photos/pets/{}/1/?width=600'.format(i),
+                'full': 'https://photos.petfinder.com/photos/pets/{}/1/'.format(i)
+            }
+        ],
+        'primary_photo_cropped': {
+            'small': 'https://photos.petfinder.com/crop/{}/?width=100'.format(i),
+            'medium': 'https://photos.petfinder.com/crop/{}/?width=300'.format(i),
+            'large': 'https://photos.petfinder.com/crop/{}/?width=600'.format(i),
+            'full': 'https://photos.petfinder.com/crop/{}/'.format(i)
+        },
+        'videos': [],
+        'status': 'adoptable',
+        'status_changed_at': published_at,
+        'published_at': published_at,
+        'distance': None,
+        'contact': {
+            'email': 'adopt@shelter{}.org'.format(i % 500),
+            'phone': '(206) 555-0100',
+            'address': {'address1': None, 'address2': None, 'city': 'Seattle', 'state': 'WA',
+                        'postcode': '98101', 'country': 'US'}
+        },
+        '_links': {
+            'self': {'href': '/v2/animals/{}'.format(i)},
+            'type': {'href': '/v2/types/dog'},
+            'organization': {'href': '/v2/organizations/{}'.format(org_id.lower())}
+        }
+    }
+
+    for name, value in fields.items():
+        parents = name.split('__')
+        field = parents.pop()
+        parent = record
+
+        for key in parents:
+            parent = parent[key]
+
+        parent[field] = value
+
+    return record
+
+
+def organization_record(i: int) -> dict:
+    r"""
+    Returns an organization with the same fields and nesting as those returned by the Petfinder API v2, with the ID
+    :code:`WA{i}`.
+
+    """
+    org_id = 'WA{}'.format(i)
+
+    return {
+        'id': org_id,
+        'name': 'Shelter {}'.format(i),
+        'email': 'adopt@shelter{}.org'.format(i),
+        'phone': '(206) 555-0100',
+        'address': {'address1': None, 'address2': None, 'city': 'Seattle', 'state': 'WA',
+                    'postcode': '98101', 'country': 'US'},
+        'hours': {'monday': '9-5', 'tuesday': '9-5', 'wednesday': '9-5', 'thursday': '9-5', 'friday': '9-5',
+                  'saturday': None, 'sunday': None},
+        'url': 'https://www.petfinder.com/member/us/wa/seattle/shelter-{}/'.format(org_id.lower()),
+        'website': None,
+        'mission_statement': 'Finding homes for animals in need.',
+        'adoption': {'policy': None, 'url': None},
+        'social_media': {'facebook': None, 'twitter': None, 'youtube': None, 'instagram': None,
+                         'pinterest': None},
+        'photos': [],
+        'distance': None,
+        '_links': {
+            'self': {'href': '/v2/organizations/{}'.format(org_id.lower())},
+            'animals': {'href': '/v2/animals?organization={}'.format(org_id.lower())}
+        }
+    }
+
+
+def _animal_type(name):
+    slug = parameter_value(name)
+
+    return {
+        'name': name,
+        'coats': ['Short', 'Medium', 'Long'],
+        'colors': ['Black', 'Brown', 'White'],
+        'genders': ['Male', 'Female'],
+        '_links': {'self': {'href': '/v2/types/{}'.format(slug)},
+                   'breeds': {'href': '/v2/types/{}/breeds'.format(slug)}}
+    }
+
+
+def _problem(status, detail):
+    return status, {'type': 'https://www.petfinder.com/developers/v2/docs/errors/ERR-{}/'.format(status),
+                    'status': status, 'title': _STATUS_TITLES.get(status, 'Error'), 'detail': detail}
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m petpy.testing',
+                                     description='Runs a local stand-in for the Petfinder API v2.')
+    parser.add_argument('--animals', type=int, default=1000, help='number of animals to serve')
+    parser.add_argument('--organizations', type=int, default=100, help='number of organizations to serve')
+    parser.add_argument('--latency', type=float, default=0, help='seconds every response is delayed by')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=0, help='port to listen on, a free port if 0')
+    args = parser.parse_args(args)
+
+    server = PetfinderServer(animals=args.animals, organizations=args.organizations, latency=args.latency,
+                             host=args.host, port=args.port)
+
+    print(server.url, flush=True)
+
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
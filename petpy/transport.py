@@ -0,0 +1,186 @@
+# encoding=utf-8
+
+r"""
+
+The :code:`transport.py` file stores the :code:`RecordTransport` and :code:`ReplayTransport` adapters that a
+:code:`Petfinder` instance can send its requests through to record every response of the Petfinder API to an
+archive, and to serve the recorded responses back later without a network connection.
+
+Archives are gzip-compressed files of one JSON object per response. Replaying an archive through a new build of
+:code:`petpy` runs the same parsing and DataFrame code on the same data with no network noise, so CPU time and
+memory can be compared between builds.
+
+"""
+
+
+import collections
+import datetime
+import gzip
+import json
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+class RecordTransport(HTTPAdapter):
+    r"""
+    Transport adapter that sends requests to the Petfinder API and records every response to an archive.
+
+    Each response is written with its request method and URL, status code, headers, body and latency. Request bodies
+    are not recorded, so the API key and secret sent to authenticate never reach the archive, and access tokens in
+    the recorded responses are replaced with a placeholder. The archive is complete once the :code:`Petfinder`
+    instance, or the transport, is closed.
+
+    Parameters
+    ----------
+    path : str
+        Path of the archive to write. An existing file is overwritten.
+    **kwargs
+        Passed to :code:`requests.adapters.HTTPAdapter`, such as :code:`pool_maxsize`.
+
+    Attributes
+    ----------
+    path : str
+        Path of the archive.
+    responses : int
+        Number of responses recorded.
+
+    Examples
+    --------
+    >>> with Petfinder(key=key, secret=secret, transport=RecordTransport('crawl.ndjson.gz')) as pf:
+    >>>     animals = pf.animals(location='Seattle, WA', pages=None)
+
+    """
+    def __init__(self, path: str, **kwargs):
+        super(RecordTransport, self).__init__(**kwargs)
+
+        self.path = path
+        self.responses = 0
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        started = time.perf_counter()
+        response = super(RecordTransport, self).send(request, **kwargs)
+        body = response.content
+        latency = time.perf_counter() - started
+
+        if urlparse(request.url).path.endswith('oauth2/token') and response.status_code == 200:
+            token = json.loads(body.decode('utf-8'))
+            token['access_token'] = 'recorded-token'
+            body = json.dumps(token).encode('utf-8')
+
+        entry = {
+            'method': request.method,
+            'url': request.url,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': dict(response.headers),
+            'body': body.decode('utf-8'),
+            'latency': round(latency, 6)
+        }
+
+        with self._lock:
+            self._file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            self.responses += 1
+
+        return response
+
+    def close(self):
+        super(RecordTransport, self).close()
+
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class ReplayTransport(HTTPAdapter):
+    r"""
+    Transport adapter that answers requests with the responses recorded by :code:`RecordTransport`, without sending
+    them.
+
+    Requests are matched to recorded responses by method, URL path and query parameters, ignoring the host and the
+    order of the parameters. Identical requests are answered with their recorded responses in the order they were
+    recorded, and with the last one once they run out, so retries and repeated searches replay as they were
+    recorded. Requests without a recorded response raise a :code:`LookupError`.
+
+    Parameters
+    ----------
+    path : str
+        Path of the archive written by :code:`RecordTransport`.
+    latency : boolean, default False
+        If :code:`True`, each response is delayed by the latency it was recorded with. If :code:`False`, responses
+        are returned immediately.
+
+    Attributes
+    ----------
+    path : str
+        Path of the archive.
+    responses : int
+        Number of responses replayed.
+
+    Examples
+    --------
+    >>> pf = Petfinder(key=key, secret=secret, rate_limit=10000, transport=ReplayTransport('crawl.ndjson.gz'))
+    >>> animals = pf.animals(location='Seattle, WA', pages=None, return_df=True)
+
+    """
+    def __init__(self, path: str, latency: bool = False):
+        super(ReplayTransport, self).__init__()
+
+        self.path = path
+        self.latency = latency
+        self.responses = 0
+        self._entries = collections.defaultdict(list)
+        self._served = collections.Counter()
+        self._lock = threading.Lock()
+
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                self._entries[_request_key(entry['method'], entry['url'])].append(entry)
+
+    def send(self, request, **kwargs):
+        key = _request_key(request.method, request.url)
+
+        with self._lock:
+            entries = self._entries.get(key)
+
+            if not entries:
+                raise LookupError('No recorded response for {} {}'.format(request.method, request.url))
+
+            entry = entries[min(self._served[key], len(entries) - 1)]
+            self._served[key] += 1
+            self.responses += 1
+
+        if self.latency:
+            time.sleep(entry['latency'])
+
+        response = Response()
+        response.status_code = entry['status']
+        response.reason = entry['reason']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = entry['body'].encode('utf-8')
+        response.url = request.url
+        response.request = request
+        response.elapsed = datetime.timedelta(seconds=entry['latency'])
+        response.connection = self
+
+        return response
+
+
+def _request_key(method, url):
+    r"""
+    Internal function for matching a request to its recorded responses by method, URL path and sorted query
+    parameters.
+
+    """
+    url = urlparse(url)
+
+    return method.upper(), url.path, urlencode(sorted(parse_qsl(url.query, keep_blank_values=True)))
@@ -0,0 +1,31 @@
+# encoding=utf-8
+
+r"""
+
+The :code:`vocabulary.py` file stores the values of the Petfinder API search parameters that differ from the values
+of the record fields they match, such as the animal type :code:`'Scales, Fins & Other'` searched for as
+:code:`'scales-fins-other'`, shared by :code:`petpy.mirror` and :code:`petpy.testing`.
+
+"""
+
+
+# Values of animal fields, lowercased, that differ from the search parameter values accepted by the Petfinder API.
+PARAMETER_VALUES = {
+    'small & furry': 'small-furry',
+    'scales, fins & other': 'scales-fins-other',
+    'extra large': 'xlarge'
+}
+
+
+def parameter_value(value: str) -> str:
+    r"""
+    Returns the search parameter value matching the value of a record field, such as :code:`'xlarge'` for the size
+    :code:`'Extra Large'`. Other values are lowercased, and :code:`None` is returned as is.
+
+    """
+    if value is None:
+        return None
+
+    value = value.lower()
+
+    return PARAMETER_VALUES.get(value, value)
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip('httpx')
+
+from petpy import Petfinder
+from petpy.async_api import AsyncPetfinder
+from petpy.exceptions import PetfinderRateLimitExceeded, PetfinderUnexpectedError
+from petpy.hooks import RequestStats
+from petpy.retry import RetryPolicy
+from petpy.testing import PetfinderServer
+
+
+@pytest.fixture(scope='module')
+def server():
+    with PetfinderServer(animals=250, organizations=30) as server:
+        yield server
+
+
+def run(server, call, **kwargs):
+    stats = RequestStats()
+
+    async def main():
+        async with AsyncPetfinder(key='key', secret='secret', host=server.url, hooks=[stats],
+                                  retry_policy=RetryPolicy(backoff=0.01), **kwargs) as pf:
+            return await call(pf)
+
+    return asyncio.run(main()), stats.summary()
+
+
+def test_pagination_order(server):
+    result, summary = run(server, lambda pf: pf.animals(pages=None))
+
+    assert [animal['id'] for animal in result['animals']] == list(range(249, -1, -1))
+    assert summary['animals']['requests'] == 3
+
+    result, _ = run(server, lambda pf: pf.organizations(pages=0))
+    assert len(result['organizations']) == 30
+
+    result, _ = run(server, lambda pf: pf.organizations(results_per_page=10, pages=2))
+    assert [organization['id'] for organization in result['organizations']] == \
+        [organization['id'] for organization in server._organizations[:20]]
+
+
+def test_search_requests_match_petfinder(server):
+    def requests(call):
+        del server.log[:]
+        result = call()
+        return result, [(entry['path'].split('?')[0], entry['query']) for entry in server.log
+                        if entry['path'].startswith('/v2/animals')]
+
+    def search(pf):
+        return pf.animals(animal_type='dog', age='baby', results_per_page=10, pages=2)
+
+    with Petfinder(key='key', secret='secret', host=server.url) as pf:
+        expected, expected_requests = requests(lambda: search(pf))
+
+    async def main():
+        async with AsyncPetfinder(key='key', secret='secret', host=server.url) as pf:
+            return await search(pf)
+
+    result, async_requests = requests(lambda: asyncio.run(main()))
+
+    assert result == expected and len(result['animals']) == 20
+    # The animal type is sent in the URL, as Petfinder sends it.
+    assert sorted(async_requests, key=str) == sorted(expected_requests, key=str)
+    assert async_requests[0][1]['type'] == ['dog'] and async_requests[0][1]['animal_type'] == ['dog']
+
+
+def test_animal_ids_with_missing_id(server):
+    result, _ = run(server, lambda pf: pf.animals(animal_id=[5, 999999, 7]))
+    animals = result['animals']
+
+    assert [animal['id'] for animal in animals] == [5, 999999, 7]
+    assert [animal['response'] for animal in animals] == [200, 404, 200]
+
+
+def test_token_refresh_is_shared(server):
+    async def call(pf):
+        await pf.animals(pages=1)
+        server.expire_tokens()
+        # Every concurrent request is rejected with the expired token and waits on the same refresh.
+        return await asyncio.gather(*(pf.animals(animal_id=i) for i in range(8)))
+
+    result, summary = run(server, call)
+
+    assert [animal['animals']['id'] for animal in result] == list(range(8))
+    assert summary['oauth2']['requests'] == 2
+
+
+def test_retries_and_errors(server):
+    server.fail(500, times=2, endpoint='animals')
+    result, summary = run(server, lambda pf: pf.animals(pages=1))
+
+    assert len(result['animals']) == 20
+    assert summary['animals']['retries'] == 2
+
+    server.fail(429, times=1, retry_after='0', endpoint='animals')
+    result, summary = run(server, lambda pf: pf.animals(pages=1))
+
+    assert len(result['animals']) == 20
+    assert summary['animals']['retries'] == 1
+
+    # The first request and its 3 retries are rejected.
+    server.fail(429, times=4, retry_after='0', endpoint='animals')
+    with pytest.raises(PetfinderRateLimitExceeded):
+        run(server, lambda pf: pf.animals(pages=1))
+
+    server.fail(500, times=4, endpoint='animals')
+    with pytest.raises(PetfinderUnexpectedError):
+        run(server, lambda pf: pf.animals(pages=1), circuit_breaker=False)
+
+    result, _ = run(server, lambda pf: pf.animals(pages=1))
+    assert len(result['animals']) == 20
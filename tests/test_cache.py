@@ -0,0 +1,172 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+from petpy import Petfinder
+from petpy.cache import SingleFlight, TTLCache, ValidationCache
+from petpy.testing import PetfinderServer
+
+
+def test_ttl_cache():
+    cache = TTLCache(ttl=60)
+    cache.set('types', {'types': [{'name': 'Cat'}]})
+
+    assert 'types' in cache
+    assert cache.get('types') == {'types': [{'name': 'Cat'}]}
+    assert cache.get('breeds') is None
+    assert len(cache) == 1
+
+
+def test_ttl_cache_returns_copies():
+    cache = TTLCache(ttl=60)
+    cache.set('types', {'types': []})
+
+    result = cache.get('types')
+    result['types'].append('dog')
+
+    assert cache.get('types') == {'types': []}
+
+
+def test_ttl_cache_expiry():
+    cache = TTLCache(ttl=0.05)
+    cache.set('types', {'types': []})
+    time.sleep(0.1)
+
+    assert cache.get('types') is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_invalidate():
+    cache = TTLCache(ttl=60)
+    cache.set('types', 1)
+    cache.set('breeds', 2)
+
+    cache.invalidate('types')
+    assert cache.get('types') is None
+    assert cache.get('breeds') == 2
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_ttl_cache_persistence(tmp_path):
+    path = str(tmp_path / 'cache.json')
+
+    cache = TTLCache(ttl=60, path=path)
+    cache.set('types', {'types': ['cat']})
+
+    assert TTLCache(ttl=60, path=path).get('types') == {'types': ['cat']}
+
+    cache.invalidate()
+    assert TTLCache(ttl=60, path=path).get('types') is None
+
+
+def test_validation_cache(tmp_path):
+    cache = ValidationCache(str(tmp_path))
+    key = cache.key('https://api.petfinder.com/v2/animals/', {'page': 2, 'limit': 100})
+
+    assert key == cache.key('https://api.petfinder.com/v2/animals/', {'limit': 100, 'page': 2})
+    assert cache.get(key) is None
+    assert cache.conditional_headers(None) == {}
+
+    body = b'{"animals": [{"id": 1}]}'
+    first = cache.update(key, None, {'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}, body)
+    entry = cache.get(key)
+
+    assert first == {'animals': [{'id': 1}]}
+    assert cache.conditional_headers(entry) == {'If-None-Match': '"abc"',
+                                                'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    assert cache.revalidated(key, entry) == first
+    assert ValidationCache(str(tmp_path)).revalidated(key, entry) == first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_validation_cache_digest(tmp_path):
+    cache = ValidationCache(str(tmp_path))
+    key = cache.key('https://api.petfinder.com/v2/animals/')
+
+    first = cache.update(key, None, {}, b'{"animals": []}')
+    second = cache.update(key, cache.get(key), {}, b'{"animals": []}')
+    third = cache.update(key, cache.get(key), {}, b'{"animals": [{"id": 2}]}')
+
+    assert second == first and second is not first
+    assert third == {'animals': [{'id': 2}]}
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    cache.invalidate()
+    assert cache.get(key) is None
+
+
+def test_validation_cache_returns_copies(tmp_path):
+    cache = ValidationCache(str(tmp_path))
+    key = cache.key('https://api.petfinder.com/v2/animals/')
+
+    first = cache.update(key, None, {'ETag': '"abc"'}, b'{"animals": [{"id": 1, "name": "Rex"}]}')
+    first['animals'][0]['name'] = 'MUTATED'
+
+    assert cache.revalidated(key, cache.get(key))['animals'][0]['name'] == 'Rex'
+    assert cache.update(key, cache.get(key), {}, b'{"animals": [{"id": 1, "name": "Rex"}]}') == \
+        {'animals': [{'id': 1, 'name': 'Rex'}]}
+
+
+def test_http_cache_search_returns_copies(tmp_path):
+    with PetfinderServer(animals=20) as server, \
+            Petfinder(key='key', secret='secret', host=server.url, http_cache_path=str(tmp_path)) as pf:
+        first = pf.animals(results_per_page=10, pages=1)
+        name = first['animals'][0]['name']
+        first['animals'][0]['name'] = 'MUTATED'
+        second = pf.animals(results_per_page=10, pages=1)
+
+    assert second['animals'][0]['name'] == name
+    assert pf.http_cache.hits == 1
+
+
+def test_single_flight():
+    flights = SingleFlight()
+    key = flights.key('https://api.petfinder.com/v2/animals/', {'page': 1, 'limit': 100})
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def request():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return {'animals': []}
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+    futures = [executor.submit(flights.do, key, request)]
+    started.wait()
+    futures += [executor.submit(flights.do, key, request) for _ in range(3)]
+
+    while flights.hits < 3:
+        time.sleep(0.01)
+
+    release.set()
+
+    assert [f.result() for f in futures] == [{'animals': []}] * 4
+    assert len(calls) == 1
+    assert (flights.hits, flights.misses) == (3, 1)
+    assert key == flights.key('https://api.petfinder.com/v2/animals/', {'limit': 100, 'page': 1})
+
+    flights.do(key, request)
+    assert len(calls) == 2
+
+
+def test_single_flight_async():
+    flights = SingleFlight()
+    calls = []
+
+    async def request():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise ValueError('failed')
+
+    async def run():
+        return await asyncio.gather(*(flights.do_async('key', request) for _ in range(5)), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert (flights.hits, flights.misses) == (4, 1)
@@ -0,0 +1,65 @@
+import datetime
+
+import pytest
+
+from petpy.api import Petfinder, _window_params
+from petpy.quota import QuotaBudget
+from petpy.sync import epoch_seconds
+from petpy.testing import PetfinderServer
+
+
+START = int(datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc).timestamp())
+
+
+@pytest.fixture(scope='module')
+def server():
+    # Animals are published a minute apart, from 2024-01-01 00:00 UTC.
+    with PetfinderServer(animals=1234) as server:
+        yield server
+
+
+def crawl(server, **kwargs):
+    pages = []
+
+    def record_page(event):
+        if event.endpoint.startswith('animals'):
+            pages.append((event.params.get('after'), event.params.get('before'), event.params['page']))
+
+    with Petfinder(key='key', secret='secret', host=server.url, rate_limit=1000, hooks=[record_page],
+                   quota=QuotaBudget()) as pf:
+        animals = pf.crawl_animals(**kwargs)
+
+    assert pf.quota.used == len(pages)
+
+    return animals['animals'], pages
+
+
+def test_window_params():
+    params = _window_params({'limit': 100}, (START, START + 60), START + 120)
+
+    assert params['after'] == '2024-01-01T00:00:00+00:00'
+    assert params['before'] == '2024-01-01T00:01:01+00:00'
+    assert _window_params({}, (START, START + 60), START + 60)['before'] == '2024-01-01T00:01:00+00:00'
+    assert _window_params({}, (None, None)) == {}
+    assert epoch_seconds('2024-01-01T00:00:00+0000') == START
+    assert epoch_seconds('2024-01-01T01:00:00+01:00') == START
+
+
+def test_crawl_animals(server):
+    animals, pages = crawl(server, window_size=200, results_per_page=50)
+
+    assert [a['id'] for a in animals] == list(reversed(range(1234)))
+    assert all(page <= 4 for _, _, page in pages)
+    assert any(after is not None for after, _, _ in pages)
+
+    animals, _ = crawl(server, window_size=200, sort='-recent', fields='id')
+
+    assert animals == [{'id': i} for i in range(1234)]
+
+
+def test_crawl_animals_small():
+    with PetfinderServer(animals=150) as server:
+        animals, pages = crawl(server, window_size=200)
+
+    assert len(animals) == 150
+    assert len(pages) == 2
@@ -0,0 +1,90 @@
+import pandas as pd
+from pandas import json_normalize
+import pytest
+
+from petpy.flatten import RecordFlattener, compile_fields, flatten_records, project_record
+from petpy.testing import animal_record, organization_record
+
+
+def test_flatten_animals_matches_json_normalize():
+    records = [animal_record(0), animal_record(1, primary_photo_cropped=None), animal_record(2, contact={}),
+               animal_record(3, distance=1.5)]
+
+    expected = json_normalize(records)
+    for column, prefix in (('_links.organization.href', '/v2/organizations/'),
+                           ('_links.self.href', '/v2/animals/'),
+                           ('_links.type.href', '/v2/types/')):
+        expected[column] = expected[column].str.replace(prefix, '')
+    expected.rename(columns={'_links.organization.href': 'organization_id',
+                             '_links.self.href': 'animal_id',
+                             '_links.type.href': 'animal_type'}, inplace=True)
+
+    pd.testing.assert_frame_equal(flatten_records('animals', records), expected)
+
+
+def test_flatten_animals_link_ids():
+    animals = flatten_records('animals', [animal_record(7)])
+
+    assert animals['animal_id'].tolist() == ['7']
+    assert animals['animal_type'].tolist() == ['dog']
+    assert list(animals.columns).count('organization_id') == 2
+
+
+def test_flatten_organizations():
+    organizations = flatten_records('organizations', [organization_record(i) for i in range(3)])
+
+    assert '_links.animals.href' not in organizations.columns
+    assert organizations['organization_id'].tolist() == ['wa0', 'wa1', 'wa2']
+    assert organizations['hours.saturday'].isna().all()
+
+
+def test_flatten_by_page():
+    records = [animal_record(i) for i in range(5)] + [animal_record(5, environment={'cats': True})]
+
+    flattener = RecordFlattener('animals')
+    flattener.add(records[:3])
+    flattener.add(records[3:])
+
+    animals = flattener.to_frame()
+
+    assert len(flattener) == 6
+    pd.testing.assert_frame_equal(animals, flatten_records('animals', records))
+    assert animals['environment.children'].isna().tolist() == [False] * 5 + [True]
+
+
+def test_flatten_single_record_and_empty():
+    assert flatten_records('animals', animal_record(1)).shape[0] == 1
+    assert flatten_records('animals', []).empty
+
+
+def test_compile_fields():
+    assert compile_fields(['id', 'breeds.primary', 'breeds']) == {'id': True, 'breeds': True}
+    assert compile_fields('contact.address.city') == {'contact': {'address': {'city': True}}}
+
+    with pytest.raises(ValueError):
+        compile_fields(['breeds.'])
+
+
+def test_project_record():
+    spec = compile_fields(['name', 'breeds.primary', 'contact.address', 'environment.cats'])
+
+    assert project_record(animal_record(1), spec) == {
+        'name': 'Pet 1',
+        'breeds': {'primary': 'Labrador Retriever'},
+        'contact': {'address': animal_record(1)['contact']['address']},
+        'environment': {'cats': False}
+    }
+
+
+def test_flatten_fields():
+    records = [animal_record(0), animal_record(1, primary_photo_cropped=None)]
+    fields = ['id', 'breeds.primary', 'primary_photo_cropped', '_links.self.href']
+
+    animals = flatten_records('animals', records, fields=fields)
+
+    assert list(animals.columns) == ['id', 'breeds.primary', 'primary_photo_cropped.small',
+                                     'primary_photo_cropped.medium', 'primary_photo_cropped.large',
+                                     'primary_photo_cropped.full', 'animal_id', 'primary_photo_cropped']
+    pd.testing.assert_frame_equal(animals, flatten_records('animals', records)[list(animals.columns)])
+    pd.testing.assert_frame_equal(animals, flatten_records('animals', [project_record(r, compile_fields(fields))
+                                                                       for r in records]))
@@ -0,0 +1,81 @@
+import pytest
+
+from petpy import Petfinder
+from petpy.hooks import RequestEvent, RequestStats, call_hooks
+from petpy.retry import RetryPolicy
+from petpy.testing import PetfinderServer
+
+
+def event(endpoint, status=200, latency=0.1, attempt=0, error=None):
+    return RequestEvent(method='GET', url='https://api.petfinder.com/v2/' + endpoint, endpoint=endpoint, params={},
+                        status=status, latency=latency, bytes=100, attempt=attempt, rate_limit_wait=0.01,
+                        token_refresh=endpoint == 'oauth2/token', error=error, started=0.0)
+
+
+def test_request_stats():
+    stats = RequestStats()
+
+    for latency in range(1, 101):
+        stats(event('animals/', latency=latency / 100))
+
+    stats(event('animals/12345', status=503, latency=0.5))
+    stats(event('animals/12345', attempt=1, latency=0.5))
+    stats(event('oauth2/token', latency=0.2))
+    stats(event('organizations/', status=None, latency=0.0, error=OSError()))
+
+    summary = stats.summary()
+    animals = summary['animals']
+
+    assert (animals['requests'], animals['errors'], animals['retries'], animals['bytes']) == (102, 1, 1, 10200)
+    assert (animals['latency_p50'], animals['latency_p99']) == (0.5, 0.99)
+    assert summary['oauth2']['token_refreshes'] == 1
+    assert summary['organizations']['errors'] == 1
+    assert summary['total']['requests'] == 104
+    assert summary['total']['rate_limit_wait'] == pytest.approx(1.04)
+
+    stats.reset()
+    assert stats.summary()['total']['requests'] == 0
+    assert stats.summary()['total']['latency_p50'] is None
+
+
+def test_call_hooks_warns_on_hook_error():
+    events = []
+
+    def broken(e):
+        raise ValueError('broken hook')
+
+    with pytest.warns(RuntimeWarning, match='broken hook'):
+        call_hooks([broken, events.append], event('types'))
+
+    assert len(events) == 1
+    assert event('types').to_dict()['endpoint'] == 'types'
+
+
+def test_petfinder_events(tmp_path):
+    events = []
+
+    with PetfinderServer(animals=100) as server, \
+            Petfinder(key='key', secret='secret', host=server.url, hooks=[events.append],
+                      retry_policy=RetryPolicy(backoff=0.01), http_cache_path=str(tmp_path)) as pf:
+        assert [(event.endpoint, event.status, event.token_refresh) for event in events] == \
+            [('oauth2/token', 200, True)]
+
+        del events[:]
+        server.fail(503, times=2, endpoint='animals')
+        pf.animals(results_per_page=50, pages=1)
+
+        # A retried request emits an event for every attempt.
+        assert [(event.method, event.endpoint, event.status, event.attempt) for event in events] == \
+            [('GET', 'animals/', 503, 0), ('GET', 'animals/', 503, 1), ('GET', 'animals/', 200, 2)]
+        assert all(event.params == {'limit': 50, 'page': 1} and event.url == server.url + 'animals/'
+                   for event in events)
+        assert events[-1].bytes > 0 and not events[-1].token_refresh and events[-1].error is None
+
+        del events[:]
+        animals = pf.animals(results_per_page=50, pages=1)['animals']
+
+        # A page revalidated with its ETag emits a single 304 event without a body.
+        assert [(event.endpoint, event.status, event.attempt, event.bytes) for event in events] == \
+            [('animals/', 304, 0, 0)]
+        assert [animal['id'] for animal in animals] == list(range(99, 49, -1))
+        assert pf.http_cache.hits == 1
@@ -0,0 +1,16 @@
+import subprocess
+import sys
+
+
+def test_import_does_not_load_pandas():
+    code = "import sys, petpy; print(sorted({'pandas', 'asyncio'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, universal_newlines=True, check=True)
+
+    assert result.stdout.strip() == '[]'
+
+
+def test_async_petfinder_is_imported_on_first_use():
+    import petpy
+    from petpy.async_api import AsyncPetfinder
+
+    assert petpy.AsyncPetfinder is AsyncPetfinder
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from petpy import Petfinder
+from petpy.hooks import RequestStats
+from petpy.limiter import TokenBucket
+from petpy.testing import PetfinderServer
+
+
+def test_token_bucket_burst():
+    bucket = TokenBucket(rate=10, capacity=5)
+
+    waits = [bucket.acquire() for _ in range(5)]
+
+    assert waits == [0.0] * 5
+    assert bucket.wait_time > 0
+
+
+def test_token_bucket_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+
+    start = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+
+    assert elapsed >= 0.19
+
+
+def test_token_bucket_shared_across_threads():
+    bucket = TokenBucket(rate=100, capacity=1)
+
+    def worker():
+        for _ in range(5):
+            bucket.acquire()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    start = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - start
+
+    assert elapsed >= 0.18
+
+
+def test_token_bucket_async():
+    bucket = TokenBucket(rate=50, capacity=1)
+
+    async def run():
+        return await asyncio.gather(*(bucket.acquire_async() for _ in range(6)))
+
+    start = time.monotonic()
+    waits = asyncio.run(run())
+
+    assert waits[0] == 0.0
+    assert max(waits) == pytest.approx(0.1, abs=0.02)
+    assert time.monotonic() - start >= 0.09
+
+
+def test_token_bucket_invalid():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=10, capacity=0)
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_petfinder_search_is_rate_limited(max_workers):
+    stats = RequestStats()
+
+    with PetfinderServer(animals=1000) as server, \
+            Petfinder(key='key', secret='secret', host=server.url, rate_limit=40, rate_limit_burst=1,
+                      hooks=[stats]) as pf:
+        start = time.monotonic()
+        animals = pf.animals(pages=None, max_workers=max_workers)
+        elapsed = time.monotonic() - start
+
+    # The token is requested before the search, and the 10 pages share the bucket, so the 9 pages after the first
+    # take at least 9 / 40 seconds however many workers send them.
+    assert len(animals['animals']) == 1000
+    assert server.requests == 11
+    assert elapsed >= 0.22
+    assert stats.summary()['total']['rate_limit_wait'] > 0
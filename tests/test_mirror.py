@@ -0,0 +1,101 @@
+import pytest
+
+from petpy import Petfinder
+from petpy.mirror import Mirror
+from petpy.sync import SyncState
+from petpy.testing import PetfinderServer, animal_record
+
+
+@pytest.fixture
+def mirror():
+    with Mirror() as m:
+        m.upsert([
+            animal_record(1, environment__children=None, published_at='2024-05-01T17:02:11+0000'),
+            animal_record(2, type='Cat', age='Baby', size='Small', breeds__primary='Tabby',
+                          published_at='2024-05-02T09:00:00+0000'),
+            animal_record(3, type='Small & Furry', breeds__primary='Rabbit', name='Mr. Whiskers',
+                          environment__children=None, contact__address__city='Portland', contact__address__state='OR',
+                          contact__address__postcode='97201', published_at='2024-04-30T12:00:00+0000'),
+        ])
+
+        yield m
+
+
+def test_upsert(mirror):
+    assert len(mirror) == 3
+    assert mirror.upsert(mirror.animals(animal_id=1)['animals']) == 0
+    assert mirror.upsert([animal_record(1, name='Max'), animal_record(4)]) == 2
+    assert mirror.animals(animal_id=1)['animals'][0]['name'] == 'Max'
+    assert len(mirror) == 4
+
+
+def test_animals(mirror):
+    ids = lambda **kwargs: [a['id'] for a in mirror.animals(pages=None, **kwargs)['animals']]
+
+    assert ids() == [2, 1, 3]
+    assert ids(sort='-recent') == [3, 1, 2]
+    assert ids(animal_type='small-furry', size='xlarge') == [3]
+    assert ids(age=['baby', 'young'], location='Seattle, WA') == [2, 1]
+    assert ids(location='97201') == [3]
+    assert ids(location='or') == [3]
+    assert ids(breed=['labrador retriever', 'Tabby']) == [2, 1]
+    assert ids(good_with_children=True) == [2]
+    assert ids(name='whisk') == [3]
+    assert ids(after_date='2024-05-02', before_date='2024-05-03 12:00:00') == [2]
+    assert [a['id'] for a in mirror.animals(results_per_page=1)['animals']] == [2]
+
+    with pytest.raises(ValueError):
+        mirror.animals(size='huge')
+    with pytest.raises(ValueError):
+        mirror.animals(location='Seattle, WA', distance=10)
+
+
+def test_animals_fields(mirror):
+    assert mirror.animals(animal_id=1, fields=['id', 'breeds.primary'])['animals'] == [
+        {'id': 1, 'breeds': {'primary': 'Labrador Retriever'}}]
+
+    animals = mirror.animals(pages=None, return_df=True, fields=['id', 'contact.address.city'])
+    assert list(animals.columns) == ['id', 'contact.address.city']
+    assert list(animals['id']) == [2, 1, 3]
+
+
+def test_organizations():
+    with Mirror() as m:
+        m.upsert([
+            {'id': 'WA40', 'name': 'Seattle Humane', 'address': {'city': 'Bellevue', 'state': 'WA', 'postcode': '98006',
+                                                                 'country': 'US'}},
+            {'id': 'OR12', 'name': 'Oregon Humane', 'address': {'city': 'Portland', 'state': 'OR', 'postcode': '97211',
+                                                                'country': 'US'}}
+        ], key='organizations')
+
+        ids = lambda **kwargs: [o['id'] for o in m.organizations(pages=None, **kwargs)['organizations']]
+
+        assert m.count('organizations') == 2
+        assert ids() == ['OR12', 'WA40']
+        assert ids(state='WA') == ['WA40']
+        assert ids(query='portland') == ['OR12']
+        assert ids(organization_id='wa40') == ['WA40']
+
+
+def test_refresh():
+    state = SyncState()
+
+    with PetfinderServer(animals=150, organizations=30) as server, Mirror() as m, \
+            Petfinder(key='key', secret='secret', host=server.url) as pf:
+        assert m.refresh(pf, state=state, results_per_page=50) == 150
+        assert m.refresh(pf, state=state, results_per_page=50) == 0
+        watermark = state.get(state.keys()[0])
+
+        server.update_animal(120, status='adopted', status_changed_at='2024-02-01T00:00:00+0000')
+        assert m.refresh(pf, state=state, results_per_page=50) == 1
+
+        assert m.refresh(pf, key='organizations', results_per_page=10, pages=2) == 20
+
+        assert len(m) == 150
+        assert m.count('organizations') == 20
+        assert [a['id'] for a in m.animals(status='adopted')['animals']] == [120]
+        assert m.animals(animal_id=149)['animals'] == [animal_record(149)]
+
+    assert watermark == {'watermark': animal_record(149)['published_at'], 'ids': [149],
+                         'status_changed_at': animal_record(149)['status_changed_at']}
+    assert state.get(state.keys()[0]) == dict(watermark, status_changed_at='2024-02-01T00:00:00+0000')
@@ -0,0 +1,106 @@
+import os
+
+import pytest
+
+from petpy import Petfinder
+from petpy import quota as quota_module
+from petpy.exceptions import PetfinderQuotaExhausted, PetfinderRateLimitExceeded
+from petpy.quota import QuotaBudget
+from petpy.testing import PetfinderServer
+
+
+def test_quota_budget(tmp_path):
+    path = os.path.join(str(tmp_path), 'quota.json')
+
+    budget = QuotaBudget(budget=3, path=path)
+    budget.spend()
+    budget.spend()
+    budget.flush()
+
+    budget = QuotaBudget(budget=3, path=path)
+    assert (budget.used, budget.remaining) == (2, 1)
+
+    budget.spend()
+    with pytest.raises(PetfinderQuotaExhausted) as e:
+        budget.spend()
+
+    assert isinstance(e.value, PetfinderRateLimitExceeded)
+    assert e.value.err == {'job': None, 'used': 3, 'budget': 3}
+    assert budget.used == 3
+
+
+def test_quota_jobs():
+    budget = QuotaBudget(budget=10)
+
+    with budget.job('crawl', allowance=2):
+        budget.spend()
+        budget.spend()
+
+        with pytest.raises(PetfinderQuotaExhausted) as e:
+            budget.spend()
+
+    assert e.value.err['job'] == 'crawl'
+    assert budget.job_used('crawl') == 2
+
+    budget.spend()
+    assert budget.used == 3
+
+    budget.exhaust()
+    assert budget.remaining == 0
+
+
+def test_quota_resets_daily(monkeypatch):
+    budget = QuotaBudget(budget=1)
+    budget.spend()
+
+    monkeypatch.setattr(quota_module, '_today', lambda: '2999-01-01')
+
+    assert budget.remaining == 1
+    budget.spend()
+
+
+def test_quota_batches_writes(tmp_path):
+    path = os.path.join(str(tmp_path), 'quota.json')
+
+    budget = QuotaBudget(path=path, save_every=3)
+    budget.spend()
+    budget.spend()
+    assert not os.path.exists(path)
+
+    budget.spend()
+    budget.spend()
+    assert QuotaBudget(path=path).used == 3
+
+    with budget.job('crawl'):
+        budget.spend()
+    assert QuotaBudget(path=path).job_used('crawl') == 1
+
+    with PetfinderServer(animals=10) as server:
+        with Petfinder(key='key', secret='secret', host=server.url, quota=budget) as pf:
+            pf.animals(pages=1)
+
+    assert QuotaBudget(path=path).used == 6
+
+
+def test_estimate():
+    with PetfinderServer(animals=250) as server:
+        with Petfinder(key='key', secret='secret', host=server.url, quota=QuotaBudget(budget=4)) as pf:
+            requests = server.requests
+            cost = pf.estimate(max_workers=2)
+
+            # Only the first page is requested, and it is taken from the quota.
+            assert server.requests == requests + 1
+            assert {k: cost[k] for k in ('total_count', 'total_pages', 'requests', 'quota_remaining',
+                                         'within_quota')} == {'total_count': 250, 'total_pages': 3, 'requests': 3,
+                                                              'quota_remaining': 3, 'within_quota': True}
+            assert cost['seconds'] >= cost['latency'] * 2
+
+            cost = pf.estimate(pages=10, results_per_page=20)
+            assert (cost['total_pages'], cost['requests'], cost['quota_remaining'], cost['within_quota']) == \
+                (13, 10, 2, False)
+
+            cost = pf.estimate(key='organizations', results_per_page=20, pages=1)
+            assert (cost['total_count'], cost['requests']) == (100, 1)
+
+            with pytest.raises(ValueError):
+                pf.estimate(key='breeds')
@@ -0,0 +1,47 @@
+import copy
+import pickle
+
+import pytest
+
+from petpy import Petfinder
+from petpy.records import Animal, Organization
+from petpy.testing import PetfinderServer, animal_record, organization_record
+
+
+def test_animal_record():
+    record = animal_record(5)
+    animal = Animal(record)
+
+    assert (animal.id, animal.type, animal.published_at) == (5, 'Dog', record['published_at'])
+    assert animal.contact == record['contact']
+    assert animal['_links'] == record['_links']
+    assert animal.get('missing', 'default') == 'default'
+    assert 'photos' in animal
+    assert animal.to_dict() == record
+    assert pickle.loads(pickle.dumps(animal)) == animal == copy.deepcopy(animal)
+
+    with pytest.raises(AttributeError):
+        animal.missing
+
+    with pytest.raises(KeyError):
+        animal['missing']
+
+    projected = Animal({'id': 1, 'breeds': {'primary': 'Labrador Retriever'}})
+    assert projected.keys() == ['id', 'breeds']
+    assert projected.get('type') is None
+
+    assert Organization(organization_record(3)).address['state'] == 'WA'
+
+
+def test_typed_record_search():
+    with PetfinderServer(animals=150, organizations=20) as server:
+        with Petfinder(key='key', secret='secret', host=server.url) as pf:
+            animals = pf.animals(results_per_page=100, pages=None, typed_records=True)['animals']
+            assert [animal.id for animal in animals] == list(range(149, -1, -1))
+            assert all(isinstance(animal, Animal) for animal in animals)
+
+            organizations = pf.organizations(pages=1, fields=['id', 'address.state'], typed_records=True)
+            assert organizations['organizations'][0].to_dict() == {'id': 'WA0', 'address': {'state': 'WA'}}
+
+            with pytest.raises(ValueError):
+                pf.animals(return_df=True, typed_records=True)
@@ -0,0 +1,85 @@
+import time
+
+import pytest
+
+from petpy import Petfinder
+from petpy.exceptions import PetfinderCircuitOpen, PetfinderUnexpectedError
+from petpy.retry import CircuitBreaker, RetryPolicy, parse_retry_after
+from petpy.testing import PetfinderServer
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(max_retries=3, backoff=0.5, max_backoff=1.5, jitter=False)
+
+    assert [policy.delay(attempt) for attempt in (1, 2, 3)] == [0.5, 1.0, 1.5]
+    assert policy.delay(4) is None
+    assert policy.delay(1, status_code=404) is None
+    assert policy.delay(1, status_code=503, retry_after='7') == 7.0
+    assert policy.delay(1, status_code=503, retry_after='600') is None
+    assert policy.delay(1, status_code=429) is None
+    assert policy.delay(1, status_code=429, retry_after='2') == 2.0
+
+    jittered = RetryPolicy(backoff=1)
+    assert all(0 <= jittered.delay(2) <= 2 for _ in range(100))
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after('soon') is None
+
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    with pytest.raises(PetfinderCircuitOpen) as e:
+        breaker.before_request()
+
+    assert isinstance(e.value, PetfinderUnexpectedError)
+
+    time.sleep(0.06)
+    breaker.before_request()
+    assert breaker.state == 'half-open'
+
+    with pytest.raises(PetfinderCircuitOpen):
+        breaker.before_request()
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    time.sleep(0.06)
+    breaker.before_request()
+    breaker.record_success()
+    assert (breaker.state, breaker.failures) == ('closed', 0)
+
+
+def test_petfinder_circuit_breaker():
+    with PetfinderServer(animals=20) as server:
+        with Petfinder(key='key', secret='secret', host=server.url, retry_policy=RetryPolicy(backoff=0.01)) as pf:
+            assert pf.circuit_breaker is None
+
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.1)
+
+        with Petfinder(key='key', secret='secret', host=server.url, retry_policy=RetryPolicy(backoff=0.01),
+                       circuit_breaker=breaker) as pf:
+            server.fail(500, times=2, endpoint='animals')
+            requests = server.requests
+
+            # The second failure opens the circuit, so the third attempt fails fast instead of being retried.
+            with pytest.raises(PetfinderCircuitOpen):
+                pf.animals(pages=1)
+            assert server.requests == requests + 2
+
+            with pytest.raises(PetfinderCircuitOpen):
+                pf.animals(pages=1)
+            assert server.requests == requests + 2
+
+            time.sleep(0.12)
+            assert len(pf.animals(pages=1)['animals']) == 20
+            assert breaker.state == 'closed'
@@ -0,0 +1,182 @@
+import json
+import threading
+
+import pytest
+
+from petpy import Petfinder
+from petpy.exceptions import PetfinderInvalidParameters
+from petpy.retry import RetryPolicy
+from petpy.testing import PetfinderServer, animal_record
+
+
+@pytest.fixture(scope='module')
+def server():
+    with PetfinderServer(animals=1000, organizations=250) as server:
+        yield server
+
+
+@pytest.fixture
+def pf(server):
+    with Petfinder(key='key', secret='secret', host=server.url, rate_limit=1000,
+                   retry_policy=RetryPolicy(backoff=0.01)) as pf:
+        yield pf
+
+
+def endpoint_requests(events, endpoint):
+    return [event for event in events if event.endpoint.startswith(endpoint)]
+
+
+def test_concurrent_pages_in_order(server, pf):
+    events = []
+    pf.hooks.append(events.append)
+
+    animals = pf.animals(pages=None, max_workers=4)['animals']
+    assert [animal['id'] for animal in animals] == list(range(999, -1, -1))
+    assert sorted(event.params['page'] for event in endpoint_requests(events, 'animals')) == list(range(1, 11))
+
+    del events[:]
+    organizations = pf.organizations(results_per_page=20, pages=None, max_workers=4)['organizations']
+    assert [organization['id'] for organization in organizations] == \
+        [organization['id'] for organization in server._organizations]
+    # A search with pages=None requests 100 records per page, so the 250 organizations take 3 pages.
+    assert sorted(event.params['page'] for event in endpoint_requests(events, 'organizations')) == [1, 2, 3]
+
+
+def test_pages_zero_returns_every_page(server, pf):
+    assert len(pf.animals(pages=0)['animals']) == 1000
+    assert len(pf.organizations(pages=0)['organizations']) == 250
+    assert pf.estimate('organizations', pages=0)['requests'] == 3
+
+
+def test_concurrent_page_error_propagates(server, pf):
+    events = []
+
+    def fail_after_first_page(event):
+        events.append(event)
+        if event.endpoint.startswith('animals') and event.params['page'] == 1:
+            server.fail(400, endpoint='animals')
+
+    pf.hooks.append(fail_after_first_page)
+    server.latency = 0.02
+
+    try:
+        with pytest.raises(PetfinderInvalidParameters):
+            pf.animals(pages=None, max_workers=4)
+    finally:
+        server.latency = 0
+
+    requested = len(endpoint_requests(events, 'animals'))
+
+    # Pages that had not started when the error was raised are cancelled, and no worker is left running.
+    assert requested < 10
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith('ThreadPoolExecutor')]
+    assert len(endpoint_requests(events, 'animals')) == requested
+
+
+def test_concurrent_pages_share_token_refresh(server, pf):
+    events = []
+
+    def expire_after_first_page(event):
+        events.append(event)
+        if event.endpoint.startswith('animals') and event.params['page'] == 1 and event.status == 200:
+            server.expire_tokens()
+
+    pf.hooks.append(expire_after_first_page)
+    server.latency = 0.02
+
+    try:
+        animals = pf.animals(pages=None, max_workers=4)['animals']
+    finally:
+        server.latency = 0
+
+    # Every page after the first is rejected with the expired token and waits on the same refresh.
+    assert len(animals) == 1000
+    assert len(endpoint_requests(events, 'oauth2')) == 1
+    assert sum(event.status == 401 for event in endpoint_requests(events, 'animals')) >= 2
+
+
+def test_json_decoder(server, pf):
+    bodies = []
+
+    def decoder(body):
+        bodies.append(body)
+        return json.loads(body)
+
+    with Petfinder(key='key', secret='secret', host=server.url, json_decoder=decoder) as custom:
+        animals = custom.animals(results_per_page=100, pages=None)['animals']
+        organizations = custom.organizations(organization_id='WA5')['organizations']
+
+    assert pf.json_decoder is json.loads
+    assert animals == pf.animals(results_per_page=100, pages=None)['animals'] == \
+        [animal_record(i) for i in range(999, -1, -1)]
+    assert organizations == pf.organizations(organization_id='WA5')['organizations']
+    # The access token and each of the 10 pages and the organization are decoded with the custom decoder.
+    assert len(bodies) == 12 and all(isinstance(body, bytes) for body in bodies)
+
+
+def test_iter_requests_one_page_per_page_consumed(pf):
+    events = []
+    pf.hooks.append(events.append)
+
+    animals = pf.iter_animals(results_per_page=100)
+    assert endpoint_requests(events, 'animals') == []
+
+    for i, animal in enumerate(animals):
+        assert len(endpoint_requests(events, 'animals')) == i // 100 + 1
+        if i == 149:
+            break
+
+    animals.close()
+    assert [event.params['page'] for event in endpoint_requests(events, 'animals')] == [1, 2]
+
+    pages = pf.iter_animals(results_per_page=100, by_page=True)
+    assert [animal['id'] for animal in next(pages)] == list(range(999, 899, -1))
+    assert len(endpoint_requests(events, 'animals')) == 3
+    assert sum(len(page) for page in pages) == 900
+    assert len(endpoint_requests(events, 'animals')) == 12
+
+
+def test_iter_organizations_stops_early(server, pf):
+    events = []
+    pf.hooks.append(events.append)
+
+    wanted = server._organizations[60]['id']
+    organization = next(o for o in pf.iter_organizations(results_per_page=50) if o['id'] == wanted)
+
+    assert organization['id'] == wanted
+    assert [event.params['page'] for event in endpoint_requests(events, 'organizations')] == [1, 2]
+    assert sum(1 for _ in pf.iter_organizations(results_per_page=50, pages=3)) == 150
+    assert len(endpoint_requests(events, 'organizations')) == 5
+
+
+def test_lookup_animals(server, pf):
+    events = []
+    pf.hooks.append(events.append)
+    server.fail(403, endpoint='animals/7')
+
+    lookup = pf.lookup_animals([5, 999999, 7, 5, 3, 999999], max_workers=4)
+
+    assert [animal['id'] for animal in lookup['animals']] == [5, 5, 3]
+    assert lookup['missing'] == [999999, 999999]
+    assert lookup['failed'] == [{'id': 7, 'error': 'PetfinderInsufficientAccess', 'message': 'Insufficient Access',
+                                 'status': 403}]
+    # Duplicate IDs are requested once and share the result.
+    assert sorted(event.endpoint for event in endpoint_requests(events, 'animals/')) == \
+        ['animals/3', 'animals/5', 'animals/7', 'animals/999999']
+
+
+def test_organization_ids(server, pf):
+    events = []
+    pf.hooks.append(events.append)
+    server.fail(403, endpoint='organizations/WA7')
+
+    organization_ids = ['WA5', 'XX1', 'WA7', 'WA5', 'WA2']
+    organizations = pf.organizations(organization_id=organization_ids, max_workers=4)['organizations']
+
+    assert [(org['id'], org['response']) for org in organizations] == \
+        [('WA5', 200), ('XX1', 404), ('WA7', 403), ('WA5', 200), ('WA2', 200)]
+    assert organizations[2]['error'] == 'Insufficient Access'
+    assert organizations[0] == organizations[3] and organizations[0] is not organizations[3]
+    # Duplicate IDs are requested once and share the result.
+    assert sorted(event.endpoint for event in endpoint_requests(events, 'organizations/')) == \
+        ['organizations/WA2', 'organizations/WA5', 'organizations/WA7', 'organizations/XX1']
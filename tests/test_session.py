@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from petpy import Petfinder
+from petpy.testing import PetfinderServer
+
+
+@pytest.fixture
+def server():
+    with PetfinderServer(animals=500, organizations=30) as server:
+        yield server
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    return condition()
+
+
+def clients(server):
+    return {entry['client'] for entry in server.log}
+
+
+def test_requests_share_one_connection(server):
+    with Petfinder(key='key', secret='secret', host=server.url) as pf:
+        pf.animals(results_per_page=50, pages=3)
+        pf.organizations(organization_id=['WA1', 'WA2'])
+        pf.animal_types('dog')
+
+        # The token request and the 6 API requests are all sent on the same pooled connection.
+        assert len(server.log) == 7
+        assert len(clients(server)) == 1
+        assert server.connections == 1
+
+    # Leaving the context manager closes the session and its connection.
+    assert wait_for(lambda: server.connections == 0)
+
+
+def test_close_releases_connections(server):
+    pf = Petfinder(key='key', secret='secret', host=server.url, pool_maxsize=4)
+    server.latency = 0.02
+    pf.animals(pages=None, max_workers=4)
+    server.latency = 0
+
+    assert len(server.log) == 6
+    assert 1 < len(clients(server)) <= 4
+    assert server.connections == len(clients(server))
+
+    pf.close()
+    assert wait_for(lambda: server.connections == 0)
+
+
+def test_keep_alive_false_closes_each_connection(server):
+    with Petfinder(key='key', secret='secret', host=server.url, keep_alive=False) as pf:
+        pf.animals(results_per_page=50, pages=3)
+
+        assert len(clients(server)) == len(server.log) == 4
+        assert wait_for(lambda: server.connections == 0)
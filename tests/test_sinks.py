@@ -0,0 +1,113 @@
+import csv
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from petpy import Petfinder
+from petpy.flatten import MISSING, is_missing
+from petpy.sinks import CSVSink, NDJSONSink, ParquetSink, open_sink
+from petpy.testing import PetfinderServer, animal_record
+
+
+def test_ndjson_sink(tmp_path):
+    path = os.path.join(str(tmp_path), 'animals.ndjson')
+
+    with NDJSONSink(path) as sink:
+        sink.open('animals', fields=['id', 'breeds.primary'])
+        sink.write([animal_record(1), animal_record(2)])
+        sink.write(animal_record(3))
+
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+
+    assert sink.rows == 3
+    assert records[0] == {'id': 1, 'breeds': {'primary': 'Labrador Retriever'}}
+
+
+def test_csv_sink_columns_are_stable(tmp_path):
+    path = os.path.join(str(tmp_path), 'animals.csv')
+
+    with CSVSink(path) as sink:
+        sink.open('animals', fields=['id', 'name', 'tags', 'environment', '_links.self.href'])
+        sink.write([animal_record(1, environment=None)])
+        sink.write([animal_record(2)])
+
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+
+    assert rows[0] == ['id', 'tags', 'name', 'environment.children', 'environment.dogs', 'environment.cats',
+                       'animal_id']
+    assert rows[1] == ['1', '["Friendly", "Playful", "Smart"]', 'Pet 1', '', '', '', '1']
+    assert rows[2][3:6] == ['True', '', 'False']
+
+
+def test_parquet_sink(tmp_path):
+    pytest.importorskip('pyarrow')
+    path = os.path.join(str(tmp_path), 'animals.parquet')
+
+    with ParquetSink(path, row_group_size=2) as sink:
+        sink.open('animals')
+        sink.write([animal_record(1), animal_record(2, breeds=None)])
+        sink.write([animal_record(3, distance=1.5)])
+
+    animals = pd.read_parquet(path)
+
+    assert animals['id'].tolist() == [1, 2, 3]
+    assert animals['breeds.mixed'].tolist() == [True, None, True]
+    assert animals['distance'].isna().tolist() == [True, True, False]
+    assert animals['animal_id'].tolist() == ['1', '2', '3']
+    assert list(animals.columns).count('organization_id') == 1
+
+
+def test_sink_reuse():
+    sink = NDJSONSink(os.devnull)
+    sink.open('animals')
+    sink.open('animals')
+
+    with pytest.raises(ValueError):
+        sink.open('organizations')
+
+    sink.close()
+
+
+def test_open_sink():
+    assert isinstance(open_sink('animals.jsonl'), NDJSONSink)
+    assert isinstance(open_sink('animals.CSV'), CSVSink)
+
+    with pytest.raises(ValueError):
+        open_sink('animals.xlsx')
+
+
+def test_search_to_sink(tmp_path):
+    csv_path = os.path.join(str(tmp_path), 'animals.csv')
+    ndjson_path = os.path.join(str(tmp_path), 'search.ndjson')
+
+    with PetfinderServer(animals=250, organizations=30) as server, \
+            Petfinder(key='key', secret='secret', host=server.url) as pf:
+        # A path is opened with open_sink and closed once the search is written.
+        sink = pf.animals(pages=None, max_workers=3, sink=csv_path, fields=['id', 'name', 'environment'])
+
+        with open_sink(ndjson_path) as ndjson:
+            assert pf.animals(animal_type='dog', results_per_page=100, pages=2, sink=ndjson) is ndjson
+            pf.animals(sort='-recent', results_per_page=10, pages=1, sink=ndjson)
+
+    with open(csv_path, newline='') as f:
+        rows = list(csv.DictReader(f))
+
+    with open(ndjson_path) as f:
+        records = [json.loads(line) for line in f]
+
+    assert isinstance(sink, CSVSink) and sink.rows == 250
+    assert [int(row['id']) for row in rows] == list(range(249, -1, -1))
+    assert rows[0] == {'id': '249', 'name': 'Pet 249', 'environment.children': 'True', 'environment.dogs': '',
+                       'environment.cats': 'False'}
+    assert ndjson.rows == 210
+    assert records[:200] == [animal_record(i) for i in range(249, 49, -1)]
+    assert [record['id'] for record in records[200:]] == list(range(10))
+
+
+def test_is_missing():
+    assert is_missing(None) and is_missing(MISSING)
+    assert not is_missing(float('nan')) and not is_missing(0) and not is_missing('')
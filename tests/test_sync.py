@@ -0,0 +1,107 @@
+import os
+
+from petpy import Petfinder
+from petpy.sync import SyncState, advance, default_sync_key, epoch_seconds, is_changed, is_new, parse_timestamp
+from petpy.testing import PetfinderServer, animal_record
+
+
+def test_sync_state(tmp_path):
+    path = os.path.join(str(tmp_path), 'sync.json')
+
+    state = SyncState(path)
+    state.set('animals?type=cat', {'watermark': '2024-05-01T17:02:11+0000', 'ids': [1, 2],
+                                   'status_changed_at': '2024-05-02T08:00:00+0000'})
+
+    state = SyncState(path)
+    assert 'animals?type=cat' in state
+    assert state.get('animals?type=cat') == {'watermark': '2024-05-01T17:02:11+0000', 'ids': [1, 2],
+                                             'status_changed_at': '2024-05-02T08:00:00+0000'}
+
+    state.reset('animals?type=cat')
+    assert SyncState(path).get('animals?type=cat') is None
+
+
+def test_parse_timestamp():
+    expected = parse_timestamp('2024-05-01T17:02:11+0000')
+
+    assert parse_timestamp('2024-05-01T17:02:11Z') == expected
+    assert parse_timestamp('2024-05-01T17:02:11+00:00') == expected
+    assert parse_timestamp('2024-05-01T19:02:11+02:00') == expected
+    assert epoch_seconds('2024-05-01T09:02:11-08:00') == int(expected.timestamp())
+
+
+def test_is_new():
+    entry = {'watermark': '2024-05-01T17:02:11+0000', 'ids': [1]}
+
+    assert is_new(animal_record(3, published_at='2024-05-01T17:02:12+0000'), entry)
+    assert is_new(animal_record(2, published_at='2024-05-01T17:02:11+0000'), entry)
+    assert not is_new(animal_record(1, published_at='2024-05-01T17:02:11+0000'), entry)
+    assert not is_new(animal_record(4, published_at='2024-05-01T18:02:11+02:00'), entry)
+    assert is_new(animal_record(4), None)
+
+
+def test_is_changed():
+    entry = {'watermark': '2024-05-01T17:02:11+0000', 'ids': [1], 'status_changed_at': '2024-05-01T17:02:11+0000'}
+    changed = animal_record(1, status_changed_at='2024-05-03T10:00:00+0000')
+
+    assert is_changed(changed, entry)
+    assert not is_changed(animal_record(1, status_changed_at='2024-05-01T17:02:11+0000'), entry)
+    assert not is_changed(changed, None)
+    assert not is_changed(changed, {'watermark': '2024-05-01T17:02:11+0000', 'ids': [1]})
+
+
+def test_advance():
+    first, second, third = '2024-05-01T17:02:11+0000', '2024-05-02T09:00:00+0000', '2024-05-03T10:00:00+0000'
+    entry = {'watermark': first, 'ids': [1], 'status_changed_at': first}
+
+    assert advance(entry, []) == entry
+    assert advance(None, []) is None
+    assert advance(entry, [animal_record(2, published_at=first, status_changed_at=first)]) == dict(entry, ids=[1, 2])
+    assert advance(entry, [animal_record(3, published_at=second, status_changed_at=second),
+                           animal_record(4, published_at=second, status_changed_at=second),
+                           animal_record(2, published_at='2024-05-01T18:00:00+0000')]) == \
+        {'watermark': second, 'ids': [3, 4], 'status_changed_at': second}
+    # A status change of an animal that was already returned only moves the status watermark.
+    assert advance(entry, [animal_record(1, published_at=first, status_changed_at=third)]) == \
+        dict(entry, status_changed_at=third)
+
+
+def test_default_sync_key():
+    assert default_sync_key('animals', {'type': 'cat', 'sort': 'recent', 'after': 'x', 'limit': 100}) == \
+        default_sync_key('animals', {'limit': 20, 'type': 'cat'})
+
+
+def test_sync_animals(tmp_path):
+    path = os.path.join(str(tmp_path), 'sync.json')
+
+    with PetfinderServer(animals=250) as server, Petfinder(key='key', secret='secret', host=server.url) as pf:
+        first = pf.sync_animals(path)['animals']
+        second = pf.sync_animals(path)['animals']
+
+    assert [animal['id'] for animal in first] == list(range(249, -1, -1))
+    assert second == []
+    assert SyncState(path).get(SyncState(path).keys()[0]) == {'watermark': first[0]['published_at'], 'ids': [249],
+                                                              'status_changed_at': first[0]['status_changed_at']}
+
+
+def test_sync_animals_returns_status_changes():
+    state = SyncState()
+
+    with PetfinderServer(animals=250) as server, Petfinder(key='key', secret='secret', host=server.url) as pf:
+        first = pf.sync_animals(state)['animals']
+
+        for i in (249, 200, 120):
+            server.update_animal(i, status='adopted', status_changed_at='2024-02-01T00:00:00+0000')
+
+        second = pf.sync_animals(state)['animals']
+        third = pf.sync_animals(state)['animals']
+        # Without a change window, only animals published after the watermark are searched.
+        server.update_animal(248, status='found', status_changed_at='2024-02-02T00:00:00+0000')
+        fourth = pf.sync_animals(state, change_window=0)['animals']
+
+    assert len(first) == 250
+    assert [(animal['id'], animal['status']) for animal in second] == [(249, 'adopted'), (200, 'adopted'),
+                                                                       (120, 'adopted')]
+    assert third == []
+    assert fourth == []
+    assert state.get(state.keys()[0])['status_changed_at'] == '2024-02-01T00:00:00+0000'
@@ -0,0 +1,67 @@
+import pytest
+
+from petpy import Petfinder
+from petpy.exceptions import PetfinderInvalidCredentials, PetfinderRateLimitExceeded
+from petpy.hooks import RequestStats
+from petpy.retry import RetryPolicy
+from petpy.testing import PetfinderServer, animal_record
+
+
+@pytest.fixture(scope='module')
+def server():
+    with PetfinderServer(animals=250, organizations=30, key='key', secret='secret') as server:
+        yield server
+
+
+@pytest.fixture
+def pf(server):
+    with Petfinder(key='key', secret='secret', host=server.url, retry_policy=RetryPolicy(backoff=0.01)) as pf:
+        yield pf
+
+
+def test_search_pagination(pf):
+    animals = pf.animals(results_per_page=100, pages=None)['animals']
+    assert [animal['id'] for animal in animals] == list(range(249, -1, -1))
+
+    oldest = pf.animals(sort='-recent', results_per_page=10, pages=1)['animals']
+    assert [animal['id'] for animal in oldest] == list(range(10))
+
+    filtered = pf.animals(animal_type='dog', size='xlarge', organization_id='WA3', pages=None)['animals']
+    assert [animal['id'] for animal in filtered] == [3]
+
+    published = pf.animals(after_date='2024-01-01 01:00:00', before_date='2024-01-01 02:00:00', pages=None)['animals']
+    assert len(published) == 59
+
+    assert len(pf.organizations(results_per_page=100, pages=None)['organizations']) == 30
+    assert pf.animal_types('scales-fins-other')['type']['name'] == 'Scales, Fins & Other'
+
+
+def test_injected_failures(server, pf):
+    stats = RequestStats()
+    pf.hooks.append(stats)
+
+    server.fail(500, times=2, endpoint='animals')
+    assert len(pf.animals(pages=1)['animals']) == 20
+    assert stats.summary()['animals']['retries'] == 2
+
+    server.expire_tokens()
+    assert len(pf.animals(pages=1)['animals']) == 20
+    assert stats.summary()['oauth2']['token_refreshes'] == 1
+
+    server.fail(429, endpoint='animals')
+    with pytest.raises(PetfinderRateLimitExceeded):
+        pf.animals(pages=1)
+
+    with pytest.raises(PetfinderInvalidCredentials):
+        Petfinder(key='key', secret='wrong', host=server.url)
+
+
+def test_animal_record_fields():
+    record = animal_record(2, type='Cat', breeds__primary='Tabby', contact__address__city='Portland', tags=[])
+
+    assert (record['type'], record['breeds']['primary'], record['contact']['address']['city'], record['tags']) == \
+        ('Cat', 'Tabby', 'Portland', [])
+    assert record['breeds']['mixed'] is True
+    assert record['contact']['address']['state'] == 'WA'
+    assert dict(record, type='Dog', breeds=animal_record(2)['breeds'], contact=animal_record(2)['contact'],
+                tags=['Friendly', 'Playful', 'Smart']) == animal_record(2)
@@ -0,0 +1,40 @@
+import gzip
+
+import pytest
+
+from petpy import Petfinder
+from petpy.retry import RetryPolicy
+from petpy.testing import PetfinderServer
+from petpy.transport import RecordTransport, ReplayTransport
+
+
+def test_record_and_replay(tmpdir):
+    path = str(tmpdir.join('crawl.ndjson.gz'))
+
+    with PetfinderServer(animals=250) as server:
+        with Petfinder(key='key', secret='secret', host=server.url, retry_policy=RetryPolicy(backoff=0.01),
+                       transport=RecordTransport(path)) as pf:
+            server.fail(500, endpoint='animals')
+            recorded = pf.animals(results_per_page=100, pages=None)
+            breeds = pf.breeds('cat')
+
+        requests = server.requests
+
+    with gzip.open(path, 'rt') as f:
+        archive = f.read()
+
+    assert 'secret' not in archive
+    assert archive.count('\n') == requests == 6
+
+    transport = ReplayTransport(path)
+
+    with Petfinder(key='key', secret='secret', host=server.url, retry_policy=RetryPolicy(backoff=0.01),
+                   transport=transport) as pf:
+        assert pf.animals(results_per_page=100, pages=None) == recorded
+        assert pf.breeds('cat') == breeds
+
+        with pytest.raises(LookupError):
+            pf.breeds('dog')
+
+    # The recorded 500 response is replayed before the successful retry.
+    assert transport.responses == 6